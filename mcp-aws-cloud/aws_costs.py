@@ -0,0 +1,341 @@
+"""
+Cost Explorer cache for the AWS MCP server.
+
+Daily `ce.get_cost_and_usage` results are stored per month in a small
+columnar, dictionary-encoded JSON file (day offset / group code / amount
+columns). Months before the current one are immutable once Cost Explorer stops
+marking them as estimated, so they are fetched once; the current month is
+refetched after a short TTL. Trend, top-N and month-over-month questions are
+answered from the cache, since every Cost Explorer request costs $0.01 and
+takes seconds.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp-aws-cloud")
+METRIC = "UnblendedCost"
+# Cost Explorer keeps about 14 months of history; older requests only cost money
+MAX_HISTORY_MONTHS = 14
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def parse_group_by(group_by: str) -> Dict[str, str]:
+    """Translate "SERVICE", "REGION", "TAG:Environment" into a CE GroupBy entry"""
+    if group_by.upper().startswith("TAG:"):
+        return {"Type": "TAG", "Key": group_by[4:]}
+    return {"Type": "DIMENSION", "Key": group_by.upper()}
+
+
+class MonthPartition:
+    """One month of daily costs for one grouping, stored column-wise"""
+
+    __slots__ = ("month", "groups", "day", "group", "amount", "unit", "final", "fetched_at")
+
+    def __init__(self, month: date):
+        self.month = month
+        self.groups: List[str] = []
+        self.day = array('b')       # day of month - 1
+        self.group = array('l')     # index into groups
+        self.amount = array('d')
+        self.unit = "USD"
+        self.final = False
+        self.fetched_at = 0.0
+
+    def append(self, day: int, group: str, amount: float, codes: Dict[str, int]):
+        code = codes.get(group)
+        if code is None:
+            code = codes[group] = len(self.groups)
+            self.groups.append(group)
+        self.day.append(day)
+        self.group.append(code)
+        self.amount.append(amount)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "month": self.month.isoformat(),
+            "final": self.final,
+            "fetched_at": self.fetched_at,
+            "unit": self.unit,
+            "groups": self.groups,
+            "day": self.day.tolist(),
+            "group": self.group.tolist(),
+            "amount": self.amount.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "MonthPartition":
+        part = cls(date.fromisoformat(data["month"]))
+        part.final = data["final"]
+        part.fetched_at = data["fetched_at"]
+        part.unit = data.get("unit", "USD")
+        part.groups = data["groups"]
+        part.day = array('b', data["day"])
+        part.group = array('l', data["group"])
+        part.amount = array('d', data["amount"])
+        return part
+
+
+class CostCache:
+    """Month-partitioned cache of daily Cost Explorer aggregates"""
+
+    def __init__(self,
+                 session_getter: Callable[[], Any],
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 cache_key: Callable[[], str] = lambda: "default",
+                 current_month_ttl: float = 6 * 3600,
+                 today: Callable[[], date] = date.today):
+        self._session_getter = session_getter
+        self.cache_dir = cache_dir
+        self._cache_key = cache_key
+        self.current_month_ttl = current_month_ttl
+        self._today = today
+        self._lock = threading.Lock()
+        self._partitions: Dict[Tuple[str, date], MonthPartition] = {}
+        self.api_calls = 0
+
+    # -- partition management ---------------------------------------------
+
+    def _path(self, group_by: str, month: date) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        safe = group_by.replace(":", "_").replace("/", "_")
+        return os.path.join(self.cache_dir, f"costs-{self._cache_key() or 'default'}", safe, f"{month:%Y-%m}.json")
+
+    def _partition(self, group_by: str, month: date) -> MonthPartition:
+        key = (group_by, month)
+        with self._lock:
+            part = self._partitions.get(key)
+            if part is None:
+                part = self._load(group_by, month)
+            if part is None or self._stale(part):
+                part = self._fetch(group_by, month)
+                self._save(group_by, part)
+            self._partitions[key] = part
+            return part
+
+    def _stale(self, part: MonthPartition) -> bool:
+        if part.final:
+            return False
+        return time.time() - part.fetched_at >= self.current_month_ttl
+
+    def _load(self, group_by: str, month: date) -> Optional[MonthPartition]:
+        path = self._path(group_by, month)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return MonthPartition.from_json(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cost cache {path}: {e}")
+            return None
+
+    def _save(self, group_by: str, part: MonthPartition):
+        path = self._path(group_by, part.month)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(part.to_json(), f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write cost cache {path}: {e}")
+
+    def _fetch(self, group_by: str, month: date) -> MonthPartition:
+        session = self._session_getter()
+        if session is None:
+            raise RuntimeError("AWS session not available")
+        ce = session.client('ce', region_name='us-east-1')
+
+        today = self._today()
+        end = min(next_month(month), today + timedelta(days=1))
+        part = MonthPartition(month)
+        codes: Dict[str, int] = {}
+        estimated = False
+        kwargs = {
+            "TimePeriod": {"Start": month.isoformat(), "End": end.isoformat()},
+            "Granularity": "DAILY",
+            "Metrics": [METRIC],
+            "GroupBy": [parse_group_by(group_by)],
+        }
+        while True:
+            response = ce.get_cost_and_usage(**kwargs)
+            self.api_calls += 1
+            for result in response["ResultsByTime"]:
+                day = date.fromisoformat(result["TimePeriod"]["Start"]).day - 1
+                estimated = estimated or result.get("Estimated", False)
+                for group in result.get("Groups", []):
+                    metric = group["Metrics"][METRIC]
+                    part.unit = metric.get("Unit", part.unit)
+                    part.append(day, group["Keys"][0], float(metric["Amount"]), codes)
+            token = response.get("NextPageToken")
+            if not token:
+                break
+            kwargs["NextPageToken"] = token
+
+        # Past months never change once Cost Explorer has finalized them
+        part.final = next_month(month) <= month_start(today) and not estimated
+        part.fetched_at = time.time()
+        return part
+
+    # -- queries ----------------------------------------------------------
+
+    def daily(self, start: date, end: date, group_by: str = "SERVICE") -> Dict[str, Dict[date, float]]:
+        """Costs per group per day for start <= day < end"""
+        totals: Dict[str, Dict[date, float]] = {}
+        month = month_start(start)
+        while month < end:
+            part = self._partition(group_by, month)
+            for d, g, amount in zip(part.day, part.group, part.amount):
+                day = month + timedelta(days=d)
+                if start <= day < end:
+                    per_day = totals.setdefault(part.groups[g], {})
+                    per_day[day] = per_day.get(day, 0.0) + amount
+            month = next_month(month)
+        return totals
+
+    def totals(self, start: date, end: date, group_by: str = "SERVICE") -> Dict[str, float]:
+        """Total cost per group for start <= day < end"""
+        totals: Dict[str, float] = {}
+        month = month_start(start)
+        while month < end:
+            part = self._partition(group_by, month)
+            first = max(0, (start - month).days)
+            last = (end - month).days
+            sums = [0.0] * len(part.groups)
+            for d, g, amount in zip(part.day, part.group, part.amount):
+                if first <= d < last:
+                    sums[g] += amount
+            for name, amount in zip(part.groups, sums):
+                totals[name] = totals.get(name, 0.0) + amount
+            month = next_month(month)
+        return totals
+
+    def unit(self) -> str:
+        for part in self._partitions.values():
+            return part.unit
+        return "USD"
+
+    def trend(self, days: int, group_by: str = "SERVICE", group: str = "") -> Dict[str, Any]:
+        end = self._today() + timedelta(days=1)
+        start = end - timedelta(days=days)
+        per_group = self.daily(start, end, group_by)
+        if group:
+            per_group = {group: per_group.get(group, {})}
+        series = {}
+        for per_day in per_group.values():
+            for day, amount in per_day.items():
+                series[day] = series.get(day, 0.0) + amount
+        points = [{"date": (start + timedelta(days=i)).isoformat(),
+                   "amount": round(series.get(start + timedelta(days=i), 0.0), 2)}
+                  for i in range(days)]
+        half = days // 2
+        first_half = sum(p["amount"] for p in points[:half])
+        second_half = sum(p["amount"] for p in points[half:])
+        return {
+            "start": start.isoformat(),
+            "end": (end - timedelta(days=1)).isoformat(),
+            "group_by": group_by,
+            "group": group or "all",
+            "unit": self.unit(),
+            "total": round(sum(series.values()), 2),
+            "daily_average": round(sum(series.values()) / days, 2) if days else 0.0,
+            "change_vs_first_half_pct": round((second_half - first_half) / first_half * 100, 1) if first_half else None,
+            "daily": points,
+        }
+
+    def top_n(self, days: int, n: int = 10, group_by: str = "SERVICE") -> Dict[str, Any]:
+        end = self._today() + timedelta(days=1)
+        start = end - timedelta(days=days)
+        totals = self.totals(start, end, group_by)
+        grand_total = sum(totals.values())
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "start": start.isoformat(),
+            "end": (end - timedelta(days=1)).isoformat(),
+            "group_by": group_by,
+            "unit": self.unit(),
+            "total": round(grand_total, 2),
+            "top": [
+                {
+                    "name": name,
+                    "amount": round(amount, 2),
+                    "share_pct": round(amount / grand_total * 100, 1) if grand_total else 0.0,
+                }
+                for name, amount in ranked[:n]
+            ],
+            "other": round(sum(amount for _, amount in ranked[n:]), 2),
+        }
+
+    def month_over_month(self, months: int = 3, group_by: str = "SERVICE", n: int = 10) -> Dict[str, Any]:
+        today = self._today()
+        current = month_start(today)
+        starts = [current]
+        for _ in range(months - 1):
+            starts.insert(0, month_start(starts[0] - timedelta(days=1)))
+
+        # Compare the current partial month against the same number of days
+        # of each previous month so the numbers are like-for-like.
+        elapsed = (today - current).days + 1
+        per_month = []
+        for start in starts:
+            full_end = min(next_month(start), today + timedelta(days=1))
+            to_date_end = min(full_end, start + timedelta(days=elapsed))
+            per_month.append({
+                "month": f"{start:%Y-%m}",
+                "full": self.totals(start, full_end, group_by),
+                "to_date": self.totals(start, to_date_end, group_by),
+            })
+
+        previous = per_month[-2]["to_date"] if len(per_month) > 1 else {}
+        latest = per_month[-1]["to_date"]
+        changes = []
+        for name in set(previous) | set(latest):
+            before, after = previous.get(name, 0.0), latest.get(name, 0.0)
+            changes.append({
+                "name": name,
+                "previous_to_date": round(before, 2),
+                "current_to_date": round(after, 2),
+                "change": round(after - before, 2),
+                "change_pct": round((after - before) / before * 100, 1) if before else None,
+            })
+        changes.sort(key=lambda c: abs(c["change"]), reverse=True)
+
+        return {
+            "group_by": group_by,
+            "unit": self.unit(),
+            "days_compared": elapsed,
+            "months": [
+                {
+                    "month": m["month"],
+                    "total": round(sum(m["full"].values()), 2),
+                    "total_first_days": round(sum(m["to_date"].values()), 2),
+                }
+                for m in per_month
+            ],
+            "biggest_changes": changes[:n],
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "cached_partitions": sorted(f"{g}/{m:%Y-%m}{'' if p.final else ' (open)'}"
+                                        for (g, m), p in self._partitions.items()),
+            "api_calls": self.api_calls,
+            "current_month_ttl_seconds": self.current_month_ttl,
+        }
@@ -0,0 +1,234 @@
+"""
+AWS credential manager for the AWS MCP server.
+
+Resolves a boto3 session once (with a timeout), keeps temporary credentials
+fresh from a background thread and caches failures with exponential backoff,
+so tool calls only ever read the cached state.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# botocore refreshes temporary credentials on access once fewer than 15 minutes
+# remain (its "advisory" window), so waking up a little inside that window makes
+# the refresh happen on our thread instead of inside a tool call.
+ADVISORY_REFRESH_SECONDS = 15 * 60
+
+
+def _default_session_factory():
+    import boto3
+    return boto3.Session()
+
+
+class CredentialManager:
+    """Resolve and cache an AWS session off the request path"""
+
+    def __init__(self,
+                 session_factory: Callable[[], Any] = _default_session_factory,
+                 resolve_timeout: float = 5.0,
+                 refresh_lead: float = ADVISORY_REFRESH_SECONDS - 60,
+                 min_backoff: float = 5.0,
+                 max_backoff: float = 300.0):
+        self._session_factory = session_factory
+        self.resolve_timeout = resolve_timeout
+        self.refresh_lead = refresh_lead
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._resolved = threading.Event()
+        self._resolving = False
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._session = None
+        self._identity: Dict[str, Any] = {}
+        self._error: Optional[str] = None
+        self._permanent_error = False
+        self._failures = 0
+        self._next_retry = 0.0
+        self._expiry: Optional[datetime] = None
+
+        self._timings: Dict[str, Any] = {
+            "attempts": 0,
+            "last_resolve_ms": None,
+            "last_success": None,
+            "last_failure": None,
+            "refreshes": 0,
+            "last_refresh_ms": None,
+            "last_refresh": None,
+        }
+
+    # -- public API -------------------------------------------------------
+
+    def start(self):
+        """Begin resolving credentials in the background"""
+        self._maybe_resolve()
+
+    def get_session(self, wait: Optional[float] = None):
+        """Return the cached session, or None while credentials are unavailable.
+
+        Only the very first call waits (up to ``resolve_timeout``) for the
+        initial resolution; afterwards the cached result is returned at once and
+        retries after a failure happen in the background.
+        """
+        if self._session is not None:
+            return self._session
+
+        self._maybe_resolve()
+        if not self._resolved.is_set():
+            self._resolved.wait(self.resolve_timeout if wait is None else wait)
+        return self._session
+
+    @property
+    def available(self) -> bool:
+        """Whether a verified session is cached (waits only for the first resolution)"""
+        return self.get_session() is not None
+
+    @property
+    def identity(self) -> Dict[str, Any]:
+        return dict(self._identity)
+
+    def status(self) -> Dict[str, Any]:
+        """Credential state and resolution timings for status reporting"""
+        with self._lock:
+            status = {
+                "available": self._session is not None,
+                "resolving": self._resolving,
+                "account": self._identity.get("Account"),
+                "arn": self._identity.get("Arn"),
+                "error": self._error,
+                "consecutive_failures": self._failures,
+                "credentials_expiry": self._expiry.isoformat() if self._expiry else None,
+                "timings": dict(self._timings),
+            }
+            if self._session is None and not self._permanent_error and self._next_retry:
+                status["retry_in_seconds"] = round(max(0.0, self._next_retry - time.monotonic()), 1)
+        return status
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
+
+    # -- resolution -------------------------------------------------------
+
+    def _maybe_resolve(self):
+        """Start a background resolution unless one is running or backing off"""
+        with self._lock:
+            if self._session is not None or self._resolving or self._permanent_error:
+                return
+            if time.monotonic() < self._next_retry:
+                return
+            self._resolving = True
+        threading.Thread(target=self._resolve, name="aws-credentials", daemon=True).start()
+
+    def _resolve(self):
+        started = time.perf_counter()
+        self._timings["attempts"] += 1
+        try:
+            from botocore.config import Config
+
+            session = self._session_factory()
+            sts = session.client('sts', config=Config(
+                connect_timeout=self.resolve_timeout,
+                read_timeout=self.resolve_timeout,
+                retries={'max_attempts': 1}
+            ))
+            identity = sts.get_caller_identity()
+        except ImportError:
+            self._fail("boto3 not installed", started, permanent=True)
+            logger.warning("boto3 not available. AWS tools will be disabled.")
+            return
+        except Exception as e:
+            self._fail(str(e), started)
+            logger.warning(f"AWS credentials not available: {e}")
+            return
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self._session = session
+            self._identity = {k: identity.get(k) for k in ("Account", "Arn", "UserId")}
+            self._error = None
+            self._failures = 0
+            self._next_retry = 0.0
+            self._resolving = False
+            self._expiry = self._credentials_expiry(session)
+            self._timings["last_resolve_ms"] = elapsed_ms
+            self._timings["last_success"] = datetime.utcnow().isoformat()
+        self._resolved.set()
+        logger.info(f"AWS Session established for: {identity.get('Arn')} ({elapsed_ms} ms)")
+
+        if self._expiry is not None:
+            self._start_refresher()
+
+    def _fail(self, error: str, started: float, permanent: bool = False):
+        with self._lock:
+            self._error = error
+            self._failures += 1
+            self._permanent_error = permanent
+            backoff = min(self.max_backoff, self.min_backoff * (2 ** (self._failures - 1)))
+            self._next_retry = time.monotonic() + backoff
+            self._resolving = False
+            self._timings["last_resolve_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._timings["last_failure"] = datetime.utcnow().isoformat()
+        self._resolved.set()
+
+    # -- background refresh -----------------------------------------------
+
+    @staticmethod
+    def _credentials_expiry(session) -> Optional[datetime]:
+        """Expiry of temporary credentials, or None for static keys"""
+        credentials = session.get_credentials()
+        if credentials is None or not hasattr(credentials, 'refresh_needed'):
+            return None   # static keys never expire
+        # botocore has no public accessor for the expiry of RefreshableCredentials;
+        # without it we skip the background refresh and botocore refreshes on access.
+        expiry = getattr(credentials, '_expiry_time', None)
+        if not isinstance(expiry, datetime):
+            logger.warning("Cannot read the expiry of refreshable AWS credentials from this botocore "
+                           "version; background refresh is disabled")
+            return None
+        if expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return expiry
+
+    def _start_refresher(self):
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="aws-credentials-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            expiry = self._expiry
+            if expiry is None:
+                return
+            remaining = (expiry - datetime.now(timezone.utc)).total_seconds()
+            # Sleep until just inside botocore's advisory window, then touch the
+            # credentials so botocore refreshes them here.
+            if self._stop.wait(max(1.0, remaining - self.refresh_lead)):
+                return
+            started = time.perf_counter()
+            try:
+                credentials = self._session.get_credentials()
+                credentials.get_frozen_credentials()
+                new_expiry = self._credentials_expiry(self._session)
+            except Exception as e:
+                logger.warning(f"Background AWS credential refresh failed: {e}")
+                # Retry soon; botocore still refreshes synchronously if we never succeed.
+                if self._stop.wait(self.min_backoff):
+                    return
+                continue
+            with self._lock:
+                self._expiry = new_expiry
+                self._timings["refreshes"] += 1
+                self._timings["last_refresh_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                self._timings["last_refresh"] = datetime.utcnow().isoformat()
+            if new_expiry is not None and new_expiry <= expiry:
+                # Not refreshed yet (still outside botocore's window); back off briefly.
+                if self._stop.wait(self.min_backoff):
+                    return
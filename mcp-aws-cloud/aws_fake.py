@@ -0,0 +1,368 @@
+"""
+Offline stand-in for the AWS APIs used by aws_server.py.
+
+FakeSession mimics the small part of boto3.Session the server uses
+(`client()` and `get_credentials()`) and serves a synthetic, deterministic
+fleet of instances, buckets and functions, with injectable per-call latency
+and throttling errors. Select it with AWS_BACKEND=fake; the fleet is sized with
+the AWS_FAKE_* environment variables (see FakeFleet.from_env).
+"""
+import hashlib
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+DEFAULT_REGIONS = [
+    "us-east-1", "us-east-2", "us-west-1", "us-west-2",
+    "ca-central-1", "sa-east-1",
+    "eu-west-1", "eu-west-2", "eu-west-3", "eu-central-1", "eu-north-1",
+    "ap-south-1", "ap-southeast-1", "ap-southeast-2",
+    "ap-northeast-1", "ap-northeast-2", "ap-northeast-3",
+]
+# Exist but are not enabled for the fake account, like real opt-in regions
+OPT_IN_REGIONS = ["af-south-1", "me-south-1", "ap-east-1"]
+
+# Round-trip time from a us-east-1 client, used for latency injection and probing
+REGION_RTT_MS = {
+    "us-east-1": 2, "us-east-2": 12, "us-west-1": 62, "us-west-2": 70,
+    "ca-central-1": 18, "sa-east-1": 115,
+    "eu-west-1": 75, "eu-west-2": 78, "eu-west-3": 82, "eu-central-1": 90, "eu-north-1": 105,
+    "ap-south-1": 190, "ap-southeast-1": 220, "ap-southeast-2": 200,
+    "ap-northeast-1": 150, "ap-northeast-2": 175, "ap-northeast-3": 160,
+}
+
+THROTTLE_CODES = {"ec2": "RequestLimitExceeded", "s3": "SlowDown"}
+
+INSTANCE_TYPES = ["t3.micro", "t3.small", "t3.medium", "m5.large", "m5.xlarge", "c5.large", "r5.large"]
+INSTANCE_STATES = ["running"] * 6 + ["stopped"] * 3 + ["pending", "stopping", "terminated"]
+RUNTIMES = ["python3.12", "python3.11", "nodejs20.x", "java21", "go1.x"]
+SERVICES = [
+    "Amazon Elastic Compute Cloud - Compute", "Amazon Simple Storage Service", "AWS Lambda",
+    "Amazon Relational Database Service", "Amazon CloudWatch", "Amazon Virtual Private Cloud",
+    "Amazon DynamoDB", "AWS Key Management Service",
+]
+ENVIRONMENTS = ["prod", "staging", "dev"]
+
+
+def _client_error(code: str, message: str, operation: str):
+    from botocore.exceptions import ClientError
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+class FakeFleet:
+    """Synthetic, deterministic AWS inventory plus fault-injection settings"""
+
+    def __init__(self,
+                 instances: int = 200,
+                 buckets: int = 20,
+                 functions: int = 60,
+                 objects_per_bucket: int = 1000,
+                 regions: Optional[List[str]] = None,
+                 latency_ms: float = 0.0,
+                 region_latency: bool = False,
+                 throttle_rate: float = 0.0,
+                 seed: int = 42):
+        self.regions = regions or list(DEFAULT_REGIONS)
+        self.latency_ms = latency_ms
+        self.region_latency = region_latency
+        self.throttle_rate = throttle_rate
+        self.objects_per_bucket = objects_per_bucket
+        self.seed = seed
+
+        rng = random.Random(seed)
+        launched = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        self.instances: Dict[str, List[Dict[str, Any]]] = {r: [] for r in self.regions}
+        self.instance_region: Dict[str, str] = {}
+        for i in range(instances):
+            region = self.regions[rng.randrange(len(self.regions))]
+            instance_id = "i-" + hashlib.md5(f"{seed}-{i}".encode()).hexdigest()[:17]
+            state = rng.choice(INSTANCE_STATES)
+            az = f"{region}{rng.choice('abc')}"
+            instance = {
+                "InstanceId": instance_id,
+                "InstanceType": rng.choice(INSTANCE_TYPES),
+                "State": {"Code": 16 if state == "running" else 80, "Name": state},
+                "PrivateIpAddress": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                "PrivateDnsName": f"ip-10-{i // 65536 % 256}-{i // 256 % 256}-{i % 256}.ec2.internal",
+                "LaunchTime": launched + timedelta(minutes=i),
+                "Placement": {"AvailabilityZone": az},
+                "VpcId": f"vpc-{rng.getrandbits(32):08x}",
+                "SubnetId": f"subnet-{rng.getrandbits(32):08x}",
+                "SecurityGroups": [{"GroupId": f"sg-{rng.getrandbits(32):08x}", "GroupName": "default"}],
+                "KeyName": "fleet-key",
+                "Architecture": "x86_64",
+                "Monitoring": {"State": "disabled"},
+                "SourceDestCheck": True,
+                "Tags": [
+                    {"Key": "Name", "Value": f"fake-{region}-{i}"},
+                    {"Key": "Environment", "Value": rng.choice(ENVIRONMENTS)},
+                ],
+            }
+            if state == "running" and rng.random() < 0.5:
+                instance["PublicIpAddress"] = f"203.0.{i // 256 % 256}.{i % 256}"
+                instance["PublicDnsName"] = f"ec2-203-0-{i // 256 % 256}-{i % 256}.compute.amazonaws.com"
+            self.instances[region].append(instance)
+            self.instance_region[instance_id] = region
+
+        self.buckets = [
+            {
+                "Name": f"fake-bucket-{i:05d}",
+                "CreationDate": launched + timedelta(hours=i),
+                "Region": self.regions[rng.randrange(len(self.regions))],
+            }
+            for i in range(buckets)
+        ]
+        self.bucket_index = {b["Name"]: b for b in self.buckets}
+
+        self.functions: Dict[str, List[Dict[str, Any]]] = {r: [] for r in self.regions}
+        for i in range(functions):
+            region = self.regions[rng.randrange(len(self.regions))]
+            self.functions[region].append({
+                "FunctionName": f"fake-function-{i:05d}",
+                "Runtime": rng.choice(RUNTIMES),
+                "MemorySize": rng.choice([128, 256, 512, 1024]),
+                "Timeout": rng.choice([3, 30, 60, 300]),
+                "LastModified": (launched + timedelta(days=i % 365)).isoformat(),
+                "CodeSize": rng.randrange(1024, 50 * 1024 * 1024),
+            })
+
+    @classmethod
+    def from_env(cls) -> "FakeFleet":
+        """Build a fleet from AWS_FAKE_* environment variables"""
+        regions = os.getenv("AWS_FAKE_REGIONS")
+        return cls(
+            instances=int(os.getenv("AWS_FAKE_INSTANCES", "200")),
+            buckets=int(os.getenv("AWS_FAKE_BUCKETS", "20")),
+            functions=int(os.getenv("AWS_FAKE_FUNCTIONS", "60")),
+            objects_per_bucket=int(os.getenv("AWS_FAKE_OBJECTS_PER_BUCKET", "1000")),
+            regions=regions.split(",") if regions else None,
+            latency_ms=float(os.getenv("AWS_FAKE_LATENCY_MS", "0")),
+            region_latency=os.getenv("AWS_FAKE_REGION_LATENCY", "").lower() in ("1", "true", "yes"),
+            throttle_rate=float(os.getenv("AWS_FAKE_THROTTLE_RATE", "0")),
+            seed=int(os.getenv("AWS_FAKE_SEED", "42")),
+        )
+
+    def region_rtt_ms(self, region: str) -> float:
+        return float(REGION_RTT_MS.get(region, 120))
+
+
+class FakeClient:
+    """Dispatches `client.<operation>(**kwargs)` to FakeSession handlers"""
+
+    def __init__(self, session: "FakeSession", service: str, region: str):
+        self._session = session
+        self._service = service
+        self._region = region
+
+    def __getattr__(self, operation: str):
+        handler = getattr(self._session, f"_{self._service}_{operation}", None)
+        if handler is None:
+            raise AttributeError(f"Fake AWS backend does not implement {self._service}.{operation}")
+
+        def call(**kwargs):
+            self._session._before_call(self._service, operation, self._region)
+            return handler(self._region, **kwargs)
+        return call
+
+
+class FakeSession:
+    """Drop-in for the boto3.Session methods used by aws_server.py"""
+
+    ACCOUNT = "000000000000"
+
+    def __init__(self, fleet: Optional[FakeFleet] = None):
+        self.fleet = fleet or FakeFleet()
+        self.calls: Counter = Counter()
+        self.throttled: Counter = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.fleet.seed)
+
+    # -- boto3.Session surface -------------------------------------------
+
+    def client(self, service: str, region_name: Optional[str] = None, **kwargs) -> FakeClient:
+        return FakeClient(self, service, region_name or "us-east-1")
+
+    def get_credentials(self):
+        return None
+
+    # -- instrumentation --------------------------------------------------
+
+    def _before_call(self, service: str, operation: str, region: str):
+        fleet = self.fleet
+        with self._lock:
+            self.calls[f"{service}.{operation}"] += 1
+            # Credential checks are never throttled so the server always comes up
+            throttle = service != "sts" and fleet.throttle_rate and self._rng.random() < fleet.throttle_rate
+            if throttle:
+                self.throttled[f"{service}.{operation}"] += 1
+        delay = fleet.latency_ms + (fleet.region_rtt_ms(region) if fleet.region_latency else 0.0)
+        if delay:
+            time.sleep(delay / 1000)
+        if throttle:
+            code = THROTTLE_CODES.get(service, "ThrottlingException")
+            raise _client_error(code, "Rate exceeded", operation)
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+            self.throttled.clear()
+
+    def probe_endpoint(self, host: str) -> Optional[float]:
+        """Stand-in for aws_regions.probe_endpoint using the fleet's region RTTs"""
+        region = host.split(".")[1] if host.count(".") >= 2 else host
+        return self.fleet.region_rtt_ms(region)
+
+    # -- STS ----------------------------------------------------------------
+
+    def _sts_get_caller_identity(self, region, **kwargs):
+        return {
+            "UserId": "AIDAFAKEUSER",
+            "Account": self.ACCOUNT,
+            "Arn": f"arn:aws:iam::{self.ACCOUNT}:user/fake-benchmark",
+        }
+
+    # -- EC2 ----------------------------------------------------------------
+
+    def _ec2_describe_regions(self, region, AllRegions=False, **kwargs):
+        regions = [{"RegionName": r, "Endpoint": f"ec2.{r}.amazonaws.com", "OptInStatus": "opt-in-not-required"}
+                   for r in self.fleet.regions]
+        if AllRegions:
+            regions += [{"RegionName": r, "Endpoint": f"ec2.{r}.amazonaws.com", "OptInStatus": "not-opted-in"}
+                        for r in OPT_IN_REGIONS if r not in self.fleet.regions]
+        return {"Regions": regions}
+
+    def _ec2_describe_instances(self, region, InstanceIds=None, **kwargs):
+        instances = self.fleet.instances.get(region, [])
+        if InstanceIds:
+            wanted = set(InstanceIds)
+            instances = [i for i in instances if i["InstanceId"] in wanted]
+            if len(instances) < len(wanted):
+                missing = sorted(wanted - {i["InstanceId"] for i in instances})
+                raise _client_error("InvalidInstanceID.NotFound",
+                                    f"The instance IDs '{', '.join(missing)}' do not exist", "DescribeInstances")
+        # One reservation per 10 instances, like a fleet launched in batches
+        return {"Reservations": [{"Instances": instances[i:i + 10]} for i in range(0, len(instances), 10)]}
+
+    def _change_state(self, region, InstanceIds, target, operation):
+        changes = []
+        for instance_id in InstanceIds:
+            if self.fleet.instance_region.get(instance_id) != region:
+                raise _client_error("InvalidInstanceID.NotFound",
+                                    f"The instance ID '{instance_id}' does not exist", operation)
+            instance = next(i for i in self.fleet.instances[region] if i["InstanceId"] == instance_id)
+            previous = dict(instance["State"])
+            instance["State"] = {"Code": 0 if target == "pending" else 64, "Name": target}
+            changes.append({"InstanceId": instance_id, "CurrentState": dict(instance["State"]),
+                            "PreviousState": previous})
+        return changes
+
+    def _ec2_start_instances(self, region, InstanceIds, **kwargs):
+        return {"StartingInstances": self._change_state(region, InstanceIds, "pending", "StartInstances")}
+
+    def _ec2_stop_instances(self, region, InstanceIds, **kwargs):
+        return {"StoppingInstances": self._change_state(region, InstanceIds, "stopping", "StopInstances")}
+
+    # -- S3 -----------------------------------------------------------------
+
+    def _s3_list_buckets(self, region, **kwargs):
+        return {"Buckets": [{"Name": b["Name"], "CreationDate": b["CreationDate"]} for b in self.fleet.buckets],
+                "Owner": {"ID": "fake-owner"}}
+
+    def _bucket(self, name, operation):
+        bucket = self.fleet.bucket_index.get(name)
+        if bucket is None:
+            raise _client_error("NoSuchBucket", "The specified bucket does not exist", operation)
+        return bucket
+
+    def _s3_get_bucket_location(self, region, Bucket, **kwargs):
+        bucket = self._bucket(Bucket, "GetBucketLocation")
+        # us-east-1 buckets report a null LocationConstraint
+        return {"LocationConstraint": None if bucket["Region"] == "us-east-1" else bucket["Region"]}
+
+    def _s3_list_objects_v2(self, region, Bucket, Prefix="", MaxKeys=1000, ContinuationToken=None, **kwargs):
+        bucket = self._bucket(Bucket, "ListObjectsV2")
+        keys = [f"data/{i // 100:04d}/object-{i:07d}.json" for i in range(self.fleet.objects_per_bucket)]
+        keys = [k for k in keys if k.startswith(Prefix)]
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + min(MaxKeys, 1000)]
+        response = {
+            "Name": Bucket,
+            "Prefix": Prefix,
+            "KeyCount": len(page),
+            "MaxKeys": MaxKeys,
+            "IsTruncated": start + len(page) < len(keys),
+        }
+        if page:
+            response["Contents"] = [
+                {"Key": key, "Size": 1024 + zlib.crc32(key.encode()) % 65536, "LastModified": bucket["CreationDate"],
+                 "StorageClass": "STANDARD"}
+                for key in page
+            ]
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + len(page))
+        return response
+
+    # -- Lambda ---------------------------------------------------------------
+
+    def _lambda_list_functions(self, region, Marker=None, MaxItems=50, **kwargs):
+        functions = self.fleet.functions.get(region, [])
+        start = int(Marker or 0)
+        page = functions[start:start + MaxItems]
+        response = {"Functions": page}
+        if start + len(page) < len(functions):
+            response["NextMarker"] = str(start + len(page))
+        return response
+
+    # -- CloudWatch -----------------------------------------------------------
+
+    def _cloudwatch_get_metric_statistics(self, region, StartTime, EndTime, Period, Statistics, **kwargs):
+        rng = random.Random(f"{region}-{kwargs.get('MetricName')}")
+        points = []
+        t = StartTime
+        while t < EndTime:
+            value = rng.uniform(5, 80)
+            point = {"Timestamp": t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t, "Unit": "Percent"}
+            if "Average" in Statistics:
+                point["Average"] = value
+            if "Maximum" in Statistics:
+                point["Maximum"] = min(100.0, value * 1.3)
+            points.append(point)
+            t += timedelta(seconds=Period)
+        return {"Label": kwargs.get("MetricName"), "Datapoints": points}
+
+    # -- Cost Explorer ----------------------------------------------------------
+
+    def _ce_get_cost_and_usage(self, region, TimePeriod, Granularity, Metrics, GroupBy=None, **kwargs):
+        start = date.fromisoformat(TimePeriod["Start"])
+        end = date.fromisoformat(TimePeriod["End"])
+        group = (GroupBy or [{"Type": "DIMENSION", "Key": "SERVICE"}])[0]
+        if group["Type"] == "TAG":
+            keys = [f"{group['Key']}${env}" for env in ENVIRONMENTS] + [f"{group['Key']}$"]
+        elif group["Key"] == "REGION":
+            keys = list(self.fleet.regions)
+        else:
+            keys = SERVICES
+        scale = max(1, sum(len(v) for v in self.fleet.instances.values())) / 100
+        results = []
+        day = start
+        while day < end:
+            rng = random.Random(f"{day.isoformat()}-{group['Key']}")
+            groups = [
+                {"Keys": [key], "Metrics": {m: {"Amount": f"{rng.uniform(0.5, 40) * scale / (1 + n):.6f}", "Unit": "USD"}
+                                            for m in Metrics}}
+                for n, key in enumerate(keys)
+            ]
+            results.append({
+                "TimePeriod": {"Start": day.isoformat(), "End": (day + timedelta(days=1)).isoformat()},
+                "Total": {},
+                "Groups": groups,
+                "Estimated": day >= date.today().replace(day=1),
+            })
+            day += timedelta(days=1)
+        return {"ResultsByTime": results, "GroupDefinitions": [group]}
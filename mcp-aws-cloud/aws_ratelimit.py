@@ -0,0 +1,207 @@
+"""
+Throttling-aware rate limiting for AWS fan-out calls.
+
+Each (service, region) pair gets a token bucket whose rate adapts to what AWS
+allows: it grows while calls succeed and is cut by 30% whenever AWS answers
+with a throttling error (the same back-off factor botocore's adaptive mode uses). Throttled calls are retried with
+jittered exponential backoff instead of being dropped, and per-tool CallStats
+record how many calls were made, retried and throttled.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "RequestLimitExceeded",
+    "SlowDown",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "BandwidthLimitExceeded",
+}
+
+# Server-side errors worth retrying; they don't lower the rate
+TRANSIENT_ERROR_CODES = {
+    "InternalError",
+    "InternalFailure",
+    "ServiceUnavailable",
+    "Unavailable",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+# (initial requests/second, burst) per service; EC2 describe calls are the
+# most tightly throttled of the APIs used by the server
+DEFAULT_LIMITS = {
+    "ec2": (20.0, 50),
+    "s3": (50.0, 100),
+    "lambda": (10.0, 20),
+    "cloudwatch": (20.0, 40),
+    "ce": (5.0, 5),
+}
+FALLBACK_LIMIT = (10.0, 20)
+
+
+def error_code(error: Exception) -> Optional[str]:
+    """AWS error code of a botocore ClientError, if any"""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+def is_throttle(error: Exception) -> bool:
+    return error_code(error) in THROTTLE_ERROR_CODES
+
+
+class CallStats:
+    """Thread-safe counters for the AWS calls made by one tool invocation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retried = 0
+        self.throttled = 0
+        self.failed = 0
+        self.wait_ms = 0.0
+
+    def record(self, calls: int = 0, retried: int = 0, throttled: int = 0, failed: int = 0, wait_ms: float = 0.0):
+        with self._lock:
+            self.calls += calls
+            self.retried += retried
+            self.throttled += throttled
+            self.failed += failed
+            self.wait_ms += wait_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retried": self.retried,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "rate_limit_wait_ms": round(self.wait_ms, 1),
+        }
+
+
+class TokenBucket:
+    """Token bucket whose refill rate rises on success and drops on throttling"""
+
+    def __init__(self, rate: float, capacity: int, min_rate: Optional[float] = None, max_rate: Optional[float] = None,
+                 cooldown: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate or max(1.0, rate / 10)
+        self.max_rate = max_rate or rate * 4
+        self.cooldown = cooldown
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self):
+        with self._lock:
+            # Probe upwards by 5% (at least 0.5 req/s) per successful call
+            self.rate = min(self.max_rate, self.rate + max(0.5, self.rate * 0.05))
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            # Concurrent workers see the same throttling burst; only cut the
+            # rate once per cooldown so one burst doesn't collapse it to the floor
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * 0.7)
+            # Drain the burst so the lower rate takes effect immediately
+            self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    """Per-(service, region) adaptive token buckets with throttle retries"""
+
+    def __init__(self,
+                 limits: Dict[str, Tuple[float, int]] = None,
+                 max_attempts: int = 8,
+                 base_backoff: float = 0.1,
+                 max_backoff: float = 5.0):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, service: str, region: str) -> TokenBucket:
+        key = (service, region or "global")
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, capacity = self.limits.get(service, FALLBACK_LIMIT)
+                bucket = self._buckets[key] = TokenBucket(rate, capacity)
+            return bucket
+
+    def call(self, service: str, region: str, fn: Callable[..., Any], *args,
+             stats: Optional[CallStats] = None, **kwargs) -> Any:
+        """Call fn(*args, **kwargs) under the (service, region) limit.
+
+        Throttling and transient server errors are retried with full-jitter
+        exponential backoff up to max_attempts; any other error is raised
+        immediately. Callers' clients should have botocore retries disabled so
+        every attempt is counted here.
+        """
+        stats = stats or CallStats()
+        bucket = self.bucket(service, region)
+        for attempt in range(1, self.max_attempts + 1):
+            stats.record(wait_ms=bucket.acquire() * 1000)
+            stats.record(calls=1, retried=1 if attempt > 1 else 0)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttle(e)
+                if not throttled and error_code(e) not in TRANSIENT_ERROR_CODES:
+                    stats.record(failed=1)
+                    raise
+                if throttled:
+                    bucket.on_throttle()
+                    stats.record(throttled=1)
+                if attempt == self.max_attempts:
+                    stats.record(failed=1)
+                    logger.warning(f"{service} in {region} still failing after {attempt} attempts: {e}")
+                    raise
+                time.sleep(random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))))
+                continue
+            bucket.on_success()
+            return result
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"{service}/{region}": {"rate_per_second": round(b.rate, 2), "burst": b.capacity}
+                for (service, region), b in sorted(self._buckets.items())
+            }
@@ -0,0 +1,199 @@
+"""
+Region catalog and endpoint latency prober for the AWS MCP server.
+
+The catalog caches `describe_regions` (in memory and on disk) for a day so
+cross-region tools don't pay a us-east-1 round trip per call, and the prober
+measures TCP connect latency to each regional EC2 endpoint in the background
+so fan-out tools can start the slowest regions first.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp-aws-cloud")
+ENABLED_OPT_IN_STATUSES = ("opt-in-not-required", "opted-in")
+
+
+def probe_endpoint(host: str, port: int = 443, timeout: float = 2.0) -> Optional[float]:
+    """TCP connect latency to host:port in milliseconds, or None if unreachable"""
+    started = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except OSError:
+        return None
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+class RegionCatalog:
+    """Daily-refreshed list of enabled regions plus per-region endpoint latency"""
+
+    def __init__(self,
+                 session_getter: Callable[[], Any],
+                 ttl: float = 24 * 3600,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 cache_key: Callable[[], str] = lambda: "default",
+                 probe_interval: float = 300.0,
+                 probe: Callable[[str], Optional[float]] = probe_endpoint):
+        self._session_getter = session_getter
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._cache_key = cache_key
+        self.probe_interval = probe_interval
+        self._probe = probe
+
+        self._lock = threading.Lock()
+        self._regions: List[Dict[str, str]] = []
+        self._fetched_at = 0.0
+        self._latency_ms: Dict[str, Optional[float]] = {}
+        self._probed_at: Optional[str] = None
+        self._prober: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # -- catalog ----------------------------------------------------------
+
+    def regions(self) -> List[str]:
+        """Names of regions enabled for this account (opted-out regions skipped)"""
+        return [r["name"] for r in self._catalog() if r["opt_in_status"] in ENABLED_OPT_IN_STATUSES]
+
+    def skipped_regions(self) -> List[str]:
+        """Regions that exist but are not opted in for this account"""
+        return [r["name"] for r in self._catalog() if r["opt_in_status"] not in ENABLED_OPT_IN_STATUSES]
+
+    def refresh(self):
+        """Re-fetch the region list from EC2 and persist it"""
+        session = self._session_getter()
+        if session is None:
+            raise RuntimeError("AWS session not available")
+        ec2 = session.client('ec2', region_name='us-east-1')
+        response = ec2.describe_regions(AllRegions=True)
+        regions = [
+            {
+                "name": r["RegionName"],
+                "endpoint": r.get("Endpoint", f"ec2.{r['RegionName']}.amazonaws.com"),
+                "opt_in_status": r.get("OptInStatus", "opt-in-not-required"),
+            }
+            for r in response["Regions"]
+        ]
+        regions.sort(key=lambda r: r["name"])
+        with self._lock:
+            self._regions = regions
+            self._fetched_at = time.time()
+        self._save()
+        self._start_prober()
+
+    def _catalog(self) -> List[Dict[str, str]]:
+        if self._regions and time.time() - self._fetched_at < self.ttl:
+            return self._regions
+        if not self._regions:
+            self._load()
+        if not self._regions or time.time() - self._fetched_at >= self.ttl:
+            try:
+                self.refresh()
+            except Exception as e:
+                if not self._regions:
+                    raise
+                logger.warning(f"Region catalog refresh failed, using cached copy: {e}")
+        return self._regions
+
+    # -- disk cache -------------------------------------------------------
+
+    def _cache_file(self) -> Optional[str]:
+        # Opt-in status is per account, so each account gets its own file
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"regions-{self._cache_key() or 'default'}.json")
+
+    def _load(self):
+        path = self._cache_file()
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            with self._lock:
+                self._regions = data["regions"]
+                self._fetched_at = data["fetched_at"]
+                self._latency_ms = data.get("latency_ms", {})
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable region cache {path}: {e}")
+            return
+        self._start_prober()
+
+    def _save(self):
+        path = self._cache_file()
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({
+                    "regions": self._regions,
+                    "fetched_at": self._fetched_at,
+                    "latency_ms": self._latency_ms,
+                }, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write region cache {path}: {e}")
+
+    # -- latency probing --------------------------------------------------
+
+    def probe_once(self) -> Dict[str, Optional[float]]:
+        """Measure endpoint latency for every enabled region in parallel"""
+        endpoints = {r["name"]: r["endpoint"] for r in self._regions
+                     if r["opt_in_status"] in ENABLED_OPT_IN_STATUSES}
+        if not endpoints:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(16, len(endpoints))) as pool:
+            results = dict(zip(endpoints, pool.map(self._probe, endpoints.values())))
+        with self._lock:
+            self._latency_ms = results
+            self._probed_at = datetime.utcnow().isoformat()
+        self._save()
+        return results
+
+    def _start_prober(self):
+        if self.probe_interval <= 0 or (self._prober is not None and self._prober.is_alive()):
+            return
+        self._prober = threading.Thread(target=self._probe_loop, name="aws-region-prober", daemon=True)
+        self._prober.start()
+
+    def _probe_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.probe_once()
+            except Exception as e:
+                logger.warning(f"Region latency probe failed: {e}")
+            if self._stop.wait(self.probe_interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+
+    def fanout_order(self, regions: List[str]) -> List[str]:
+        """Order regions slowest-first so the long poles start earliest.
+
+        Unreachable and not-yet-probed regions are treated as slowest.
+        """
+        latency = self._latency_ms
+        return sorted(regions, key=lambda r: -(latency.get(r) if latency.get(r) is not None else float("inf")))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "region_count": len(self._regions),
+            "enabled_regions": [r["name"] for r in self._regions if r["opt_in_status"] in ENABLED_OPT_IN_STATUSES],
+            "skipped_regions": [r["name"] for r in self._regions if r["opt_in_status"] not in ENABLED_OPT_IN_STATUSES],
+            "fetched_at": datetime.utcfromtimestamp(self._fetched_at).isoformat() if self._fetched_at else None,
+            "ttl_seconds": self.ttl,
+            "probed_at": self._probed_at,
+            "latency_ms": dict(self._latency_ms),
+        }
@@ -3,9 +3,16 @@ import json
 import sys
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
+from aws_costs import CostCache, MAX_HISTORY_MONTHS
+from aws_credentials import CredentialManager
+from aws_ratelimit import CallStats, RateLimiter
+from aws_regions import DEFAULT_CACHE_DIR, RegionCatalog, probe_endpoint
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,42 +28,104 @@ mcp = FastMCP(
     version="1.0.0"
 )
 
-# Global AWS session variable
-_aws_session = None
-_aws_available = False
+# AWS_BACKEND=fake serves a synthetic fleet from aws_fake instead of real AWS
+AWS_BACKEND = os.getenv("AWS_BACKEND", "boto3").lower()
+fake_session = None
+
+def create_session():
+    """Create the session for the configured backend"""
+    global fake_session
+    if AWS_BACKEND == "fake":
+        from aws_fake import FakeFleet, FakeSession
+        if fake_session is None:
+            fake_session = FakeSession(FakeFleet.from_env())
+            logger.info("Using offline fake AWS backend")
+        return fake_session
+    import boto3
+    return boto3.Session()
+
+# AWS credentials are resolved once and kept fresh off the request path
+credential_manager = CredentialManager(
+    session_factory=create_session,
+    resolve_timeout=float(os.getenv("AWS_CREDENTIAL_TIMEOUT", "5"))
+)
 
 # AWS Configuration
 def get_aws_session():
-    """Get AWS session with proper error handling"""
-    global _aws_session, _aws_available
-    
-    if _aws_session is not None:
-        return _aws_session
-    
-    try:
-        import boto3
-        # Try to use environment variables or IAM roles
-        session = boto3.Session()
-        # Test the session
-        sts = session.client('sts')
-        identity = sts.get_caller_identity()
-        logger.info(f"AWS Session established for: {identity.get('Arn')}")
-        _aws_session = session
-        _aws_available = True
-        return session
-    except ImportError:
-        logger.warning("boto3 not available. AWS tools will be disabled.")
-        _aws_available = False
-        return None
-    except Exception as e:
-        logger.warning(f"AWS credentials not available: {e}")
-        logger.info("MCP server will start in demo mode without AWS connectivity")
-        _aws_available = False
-        return None
+    """Get the cached AWS session (None while credentials are unavailable)"""
+    return credential_manager.get_session()
 
 def check_aws_available():
     """Check if AWS is available"""
-    return _aws_available and get_aws_session() is not None
+    return credential_manager.available
+
+# boto3 sessions are not thread-safe, but the clients they create are, so
+# clients are created under a lock once and shared by the fan-out workers
+_client_lock = threading.Lock()
+_clients = {}
+
+def get_client(service: str, region: str = None):
+    """Get a cached boto3 client for the current AWS session
+    
+    botocore's own retries are disabled; fan-out calls go through rate_limiter,
+    which retries throttled calls itself and counts them.
+    """
+    from botocore.config import Config
+    
+    session = get_aws_session()
+    key = (id(session), service, region)
+    with _client_lock:
+        client = _clients.get(key)
+        if client is None:
+            config = Config(retries={'max_attempts': 1})
+            if region:
+                client = session.client(service, region_name=region, config=config)
+            else:
+                client = session.client(service, config=config)
+            _clients[key] = client
+    return client
+
+# Adaptive token bucket per (service, region) shared by all fan-out tools
+rate_limiter = RateLimiter()
+
+# Enabled regions are cached for a day; endpoint latency is probed in the background
+region_catalog = RegionCatalog(
+    get_aws_session,
+    cache_key=lambda: credential_manager.identity.get('Account') or 'default',
+    cache_dir=None if AWS_BACKEND == "fake" else DEFAULT_CACHE_DIR,
+    probe=(lambda host: fake_session.probe_endpoint(host)) if AWS_BACKEND == "fake" else probe_endpoint
+)
+
+# Daily Cost Explorer aggregates, cached per month (closed months never refetched)
+cost_cache = CostCache(
+    get_aws_session,
+    cache_key=lambda: credential_manager.identity.get('Account') or 'default',
+    cache_dir=None if AWS_BACKEND == "fake" else DEFAULT_CACHE_DIR
+)
+
+FANOUT_WORKERS = int(os.getenv("AWS_FANOUT_WORKERS", "16"))
+
+def fan_out_regions(fn, regions: List[str]):
+    """Run fn(region) for every region in parallel, slowest endpoints first
+    
+    Returns (results, failures), both keyed by region. Throttled calls are
+    retried by rate_limiter inside fn, so a region only fails once retries
+    are exhausted or AWS returns a non-retryable error.
+    """
+    results, failures = {}, {}
+    if not regions:
+        return results, failures
+    ordered = region_catalog.fanout_order(regions)
+    with ThreadPoolExecutor(max_workers=min(FANOUT_WORKERS, len(ordered))) as pool:
+        futures = {pool.submit(fn, region): region for region in ordered}
+        for future in as_completed(futures):
+            region = futures[future]
+            try:
+                results[region] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to query region {region}: {str(e)}")
+                failures[region] = str(e)
+    return results, failures
 
 # Health check tool
 @mcp.tool()
@@ -71,6 +140,7 @@ def health_check() -> Dict[str, Any]:
         "version": "1.0.0",
         "aws_available": check_aws_available(),
         "aws_session": aws_session is not None,
+        "credentials": credential_manager.status(),
         "capabilities": [
             "EC2 Management" if check_aws_available() else "EC2 Management (offline)",
             "S3 Management" if check_aws_available() else "S3 Management (offline)",
@@ -157,59 +227,59 @@ def list_all_ec2_instances() -> Dict[str, Any]:
         }
     
     try:
-        session = get_aws_session()
-        ec2_client = session.client('ec2', region_name='us-east-1')
+        regions = region_catalog.regions()
+        stats = CallStats()
         
-        # Get all available regions
-        regions_response = ec2_client.describe_regions()
-        regions = [region['RegionName'] for region in regions_response['Regions']]
+        def describe_region(region):
+            ec2 = get_client('ec2', region)
+            return rate_limiter.call('ec2', region, ec2.describe_instances, stats=stats)
+        
+        responses, failures = fan_out_regions(describe_region, regions)
         
         all_instances = []
         region_summary = {}
         
         for region in regions:
-            try:
-                ec2 = session.client('ec2', region_name=region)
-                response = ec2.describe_instances()
-                
-                region_instances = []
-                for reservation in response['Reservations']:
-                    for instance in reservation['Instances']:
-                        instance_info = {
-                            "instance_id": instance['InstanceId'],
-                            "name": next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'N/A'),
-                            "instance_type": instance['InstanceType'],
-                            "state": instance['State']['Name'],
-                            "public_ip": instance.get('PublicIpAddress', 'N/A'),
-                            "private_ip": instance.get('PrivateIpAddress', 'N/A'),
-                            "launch_time": instance['LaunchTime'].isoformat(),
-                            "availability_zone": instance.get('Placement', {}).get('AvailabilityZone', 'N/A'),
-                            "region": region,
-                            "tags": {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                        }
-                        region_instances.append(instance_info)
-                        all_instances.append(instance_info)
-                
-                if region_instances:
-                    region_summary[region] = {
-                        "count": len(region_instances),
-                        "states": {}
-                    }
-                    
-                    # Count instances by state
-                    for instance in region_instances:
-                        state = instance['state']
-                        region_summary[region]['states'][state] = region_summary[region]['states'].get(state, 0) + 1
-                        
-            except Exception as e:
-                logger.warning(f"Failed to query region {region}: {str(e)}")
+            if region not in responses:
                 continue
+            
+            region_instances = []
+            for reservation in responses[region]['Reservations']:
+                for instance in reservation['Instances']:
+                    instance_info = {
+                        "instance_id": instance['InstanceId'],
+                        "name": next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'N/A'),
+                        "instance_type": instance['InstanceType'],
+                        "state": instance['State']['Name'],
+                        "public_ip": instance.get('PublicIpAddress', 'N/A'),
+                        "private_ip": instance.get('PrivateIpAddress', 'N/A'),
+                        "launch_time": instance['LaunchTime'].isoformat(),
+                        "availability_zone": instance.get('Placement', {}).get('AvailabilityZone', 'N/A'),
+                        "region": region,
+                        "tags": {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+                    }
+                    region_instances.append(instance_info)
+                    all_instances.append(instance_info)
+            
+            if region_instances:
+                region_summary[region] = {
+                    "count": len(region_instances),
+                    "states": {}
+                }
+                
+                # Count instances by state
+                for instance in region_instances:
+                    state = instance['state']
+                    region_summary[region]['states'][state] = region_summary[region]['states'].get(state, 0) + 1
         
         return {
             "total_instances": len(all_instances),
             "regions_checked": len(regions),
+            "regions_skipped": region_catalog.skipped_regions(),
+            "regions_failed": failures,
             "region_summary": region_summary,
-            "instances": all_instances
+            "instances": all_instances,
+            "api_stats": stats.to_dict()
         }
         
     except Exception as e:
@@ -225,62 +295,86 @@ def get_ec2_instances_by_region() -> Dict[str, Any]:
         }
     
     try:
-        session = get_aws_session()
-        ec2_client = session.client('ec2', region_name='us-east-1')
+        regions = region_catalog.regions()
+        stats = CallStats()
+        
+        def describe_region(region):
+            ec2 = get_client('ec2', region)
+            return rate_limiter.call('ec2', region, ec2.describe_instances, stats=stats)
         
-        # Get all available regions
-        regions_response = ec2_client.describe_regions()
-        regions = [region['RegionName'] for region in regions_response['Regions']]
+        responses, failures = fan_out_regions(describe_region, regions)
         
         regional_data = {}
         total_instances = 0
         
         for region in regions:
-            try:
-                ec2 = session.client('ec2', region_name=region)
-                response = ec2.describe_instances()
-                
-                instances = []
-                state_counts = {}
-                
-                for reservation in response['Reservations']:
-                    for instance in reservation['Instances']:
-                        state = instance['State']['Name']
-                        state_counts[state] = state_counts.get(state, 0) + 1
-                        
-                        # Only include running/stopped instances in details
-                        if state in ['running', 'stopped', 'pending', 'stopping']:
-                            instance_info = {
-                                "instance_id": instance['InstanceId'],
-                                "name": next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'N/A'),
-                                "instance_type": instance['InstanceType'],
-                                "state": state,
-                                "public_ip": instance.get('PublicIpAddress', 'N/A'),
-                                "availability_zone": instance.get('Placement', {}).get('AvailabilityZone', 'N/A')
-                            }
-                            instances.append(instance_info)
-                
-                if instances or state_counts:
-                    regional_data[region] = {
-                        "instance_count": len(instances),
-                        "state_summary": state_counts,
-                        "instances": instances
-                    }
-                    total_instances += len(instances)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to query region {region}: {str(e)}")
+            if region not in responses:
                 continue
+            
+            instances = []
+            state_counts = {}
+            
+            for reservation in responses[region]['Reservations']:
+                for instance in reservation['Instances']:
+                    state = instance['State']['Name']
+                    state_counts[state] = state_counts.get(state, 0) + 1
+                    
+                    # Only include running/stopped instances in details
+                    if state in ['running', 'stopped', 'pending', 'stopping']:
+                        instance_info = {
+                            "instance_id": instance['InstanceId'],
+                            "name": next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'N/A'),
+                            "instance_type": instance['InstanceType'],
+                            "state": state,
+                            "public_ip": instance.get('PublicIpAddress', 'N/A'),
+                            "availability_zone": instance.get('Placement', {}).get('AvailabilityZone', 'N/A')
+                        }
+                        instances.append(instance_info)
+            
+            if instances or state_counts:
+                regional_data[region] = {
+                    "instance_count": len(instances),
+                    "state_summary": state_counts,
+                    "instances": instances
+                }
+                total_instances += len(instances)
         
         return {
             "total_instances_across_all_regions": total_instances,
             "regions_with_instances": len(regional_data),
-            "regional_breakdown": regional_data
+            "regions_failed": failures,
+            "regional_breakdown": regional_data,
+            "api_stats": stats.to_dict()
         }
         
     except Exception as e:
         return {"error": f"Failed to get regional EC2 summary: {str(e)}"}
 
+def _instance_details(instance: Dict[str, Any], region: str) -> Dict[str, Any]:
+    """Format a describe_instances entry for get_instance_details"""
+    return {
+        "instance_id": instance['InstanceId'],
+        "name": next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'N/A'),
+        "instance_type": instance['InstanceType'],
+        "state": instance['State']['Name'],
+        "public_ip": instance.get('PublicIpAddress', 'N/A'),
+        "private_ip": instance.get('PrivateIpAddress', 'N/A'),
+        "public_dns": instance.get('PublicDnsName', 'N/A'),
+        "private_dns": instance.get('PrivateDnsName', 'N/A'),
+        "launch_time": instance['LaunchTime'].isoformat(),
+        "availability_zone": instance.get('Placement', {}).get('AvailabilityZone', 'N/A'),
+        "region": region,
+        "vpc_id": instance.get('VpcId', 'N/A'),
+        "subnet_id": instance.get('SubnetId', 'N/A'),
+        "security_groups": [sg['GroupName'] for sg in instance.get('SecurityGroups', [])],
+        "key_name": instance.get('KeyName', 'N/A'),
+        "tags": {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])},
+        "architecture": instance.get('Architecture', 'N/A'),
+        "platform": instance.get('Platform', 'Linux/UNIX'),
+        "monitoring": instance.get('Monitoring', {}).get('State', 'N/A'),
+        "source_dest_check": instance.get('SourceDestCheck', False)
+    }
+
 @mcp.tool()
 def get_instance_details(instance_id: str, region: str = None) -> Dict[str, Any]:
     """Get detailed information about a specific EC2 instance
@@ -296,56 +390,51 @@ def get_instance_details(instance_id: str, region: str = None) -> Dict[str, Any]
         }
     
     try:
-        session = get_aws_session()
-        
         # If region is provided, search only in that region
-        if region:
-            regions_to_search = [region]
-        else:
-            # Search across all regions
-            ec2_client = session.client('ec2', region_name='us-east-1')
-            regions_response = ec2_client.describe_regions()
-            regions_to_search = [r['RegionName'] for r in regions_response['Regions']]
-        
-        for search_region in regions_to_search:
+        regions_to_search = [region] if region else region_catalog.regions()
+        found = threading.Event()
+        stats = CallStats()
+        failures = {}
+        
+        def search_region(search_region):
+            if found.is_set():
+                return None
             try:
-                ec2 = session.client('ec2', region_name=search_region)
-                response = ec2.describe_instances(InstanceIds=[instance_id])
-                
-                for reservation in response['Reservations']:
-                    for instance in reservation['Instances']:
-                        # Found the instance
-                        return {
-                            "instance_id": instance['InstanceId'],
-                            "name": next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'N/A'),
-                            "instance_type": instance['InstanceType'],
-                            "state": instance['State']['Name'],
-                            "public_ip": instance.get('PublicIpAddress', 'N/A'),
-                            "private_ip": instance.get('PrivateIpAddress', 'N/A'),
-                            "public_dns": instance.get('PublicDnsName', 'N/A'),
-                            "private_dns": instance.get('PrivateDnsName', 'N/A'),
-                            "launch_time": instance['LaunchTime'].isoformat(),
-                            "availability_zone": instance.get('Placement', {}).get('AvailabilityZone', 'N/A'),
-                            "region": search_region,
-                            "vpc_id": instance.get('VpcId', 'N/A'),
-                            "subnet_id": instance.get('SubnetId', 'N/A'),
-                            "security_groups": [sg['GroupName'] for sg in instance.get('SecurityGroups', [])],
-                            "key_name": instance.get('KeyName', 'N/A'),
-                            "tags": {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])},
-                            "architecture": instance.get('Architecture', 'N/A'),
-                            "platform": instance.get('Platform', 'Linux/UNIX'),
-                            "monitoring": instance.get('Monitoring', {}).get('State', 'N/A'),
-                            "source_dest_check": instance.get('SourceDestCheck', False)
-                        }
-                        
+                ec2 = get_client('ec2', search_region)
+                response = rate_limiter.call('ec2', search_region, ec2.describe_instances,
+                                             InstanceIds=[instance_id], stats=stats)
             except Exception as e:
                 if "InvalidInstanceID.NotFound" in str(e):
-                    continue  # Instance not in this region, try next
-                else:
-                    logger.warning(f"Error searching region {search_region}: {str(e)}")
-                    continue
-        
-        return {"error": f"Instance {instance_id} not found in any region"}
+                    return None  # Instance not in this region
+                logger.warning(f"Error searching region {search_region}: {str(e)}")
+                failures[search_region] = str(e)
+                return None
+            for reservation in response['Reservations']:
+                for instance in reservation['Instances']:
+                    found.set()
+                    return _instance_details(instance, search_region)
+            return None
+        
+        # Search regions in parallel and stop as soon as one finds the instance;
+        # requests already in flight finish in the background and are ignored.
+        ordered = region_catalog.fanout_order(regions_to_search)
+        pool = ThreadPoolExecutor(max_workers=max(1, min(FANOUT_WORKERS, len(ordered))))
+        try:
+            futures = [pool.submit(search_region, r) for r in ordered]
+            for future in as_completed(futures):
+                details = future.result()
+                if details is not None:
+                    details["api_stats"] = stats.to_dict()
+                    return details
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        # A region that could not be searched may still hold the instance
+        return {
+            "error": f"Instance {instance_id} not found in any region",
+            "regions_failed": failures,
+            "api_stats": stats.to_dict()
+        }
         
     except Exception as e:
         return {"error": f"Failed to get instance details: {str(e)}"}
@@ -449,29 +538,39 @@ def list_s3_buckets() -> Dict[str, Any]:
         }
     
     try:
-        session = get_aws_session()
-        s3 = session.client('s3')
-        response = s3.list_buckets()
+        s3 = get_client('s3')
+        stats = CallStats()
+        response = rate_limiter.call('s3', None, s3.list_buckets, stats=stats)
         
-        buckets = []
-        for bucket in response['Buckets']:
+        def bucket_region(bucket):
             # Get bucket region
             try:
-                location = s3.get_bucket_location(Bucket=bucket['Name'])
-                region = location['LocationConstraint'] or 'us-east-1'
-            except:
-                region = 'unknown'
-            
+                location = rate_limiter.call('s3', None, s3.get_bucket_location, Bucket=bucket['Name'], stats=stats)
+                return location['LocationConstraint'] or 'us-east-1', None
+            except Exception as e:
+                return 'unknown', str(e)
+        
+        workers = max(1, min(FANOUT_WORKERS, len(response['Buckets'])))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            locations = list(pool.map(bucket_region, response['Buckets']))
+        
+        buckets = []
+        failures = {}
+        for bucket, (region, error) in zip(response['Buckets'], locations):
             bucket_info = {
                 "name": bucket['Name'],
                 "creation_date": bucket['CreationDate'].isoformat(),
                 "region": region
             }
             buckets.append(bucket_info)
+            if error:
+                failures[bucket['Name']] = error
         
         return {
             "bucket_count": len(buckets),
-            "buckets": buckets
+            "buckets": buckets,
+            "location_failures": failures,
+            "api_stats": stats.to_dict()
         }
     except Exception as e:
         return {"error": f"Failed to list S3 buckets: {str(e)}"}
@@ -633,6 +732,79 @@ def list_lambda_functions(region: str = "us-east-1") -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Failed to list Lambda functions: {str(e)}"}
 
+# Cost Analysis Tools
+@mcp.tool()
+def get_cost_trend(days: int = 30, group_by: str = "SERVICE", group: str = "") -> Dict[str, Any]:
+    """Get daily AWS cost trend from the local Cost Explorer cache
+    
+    Args:
+        days: Number of days to look back (default: 30)
+        group_by: SERVICE, REGION, LINKED_ACCOUNT, USAGE_TYPE or TAG:<key>
+        group: Only include this group (e.g. "Amazon Elastic Compute Cloud - Compute")
+    """
+    if days < 1:
+        return {"error": "days must be at least 1"}
+    if not check_aws_available():
+        return {
+            "error": "AWS not available",
+            "message": "AWS credentials not configured or boto3 not installed"
+        }
+    
+    try:
+        return cost_cache.trend(days, group_by, group)
+    except Exception as e:
+        return {"error": f"Failed to get cost trend: {str(e)}"}
+
+@mcp.tool()
+def get_top_costs(days: int = 30, top_n: int = 10, group_by: str = "SERVICE") -> Dict[str, Any]:
+    """Get the most expensive services (or tags, regions, ...) over a period
+    
+    Args:
+        days: Number of days to look back (default: 30)
+        top_n: Number of entries to return (default: 10)
+        group_by: SERVICE, REGION, LINKED_ACCOUNT, USAGE_TYPE or TAG:<key>
+    """
+    if days < 1:
+        return {"error": "days must be at least 1"}
+    if top_n < 1:
+        return {"error": "top_n must be at least 1"}
+    if not check_aws_available():
+        return {
+            "error": "AWS not available",
+            "message": "AWS credentials not configured or boto3 not installed"
+        }
+    
+    try:
+        return cost_cache.top_n(days, top_n, group_by)
+    except Exception as e:
+        return {"error": f"Failed to get top costs: {str(e)}"}
+
+@mcp.tool()
+def get_cost_month_over_month(months: int = 3, group_by: str = "SERVICE", top_n: int = 10) -> Dict[str, Any]:
+    """Compare AWS costs month over month
+    
+    The current month is compared with the same number of days of previous months.
+    
+    Args:
+        months: Number of months to include, including the current one (1-14, default: 3)
+        group_by: SERVICE, REGION, LINKED_ACCOUNT, USAGE_TYPE or TAG:<key>
+        top_n: Number of biggest changes to return (default: 10)
+    """
+    if not 1 <= months <= MAX_HISTORY_MONTHS:
+        return {"error": f"months must be between 1 and {MAX_HISTORY_MONTHS} (the history Cost Explorer keeps)"}
+    if top_n < 1:
+        return {"error": "top_n must be at least 1"}
+    if not check_aws_available():
+        return {
+            "error": "AWS not available",
+            "message": "AWS credentials not configured or boto3 not installed"
+        }
+    
+    try:
+        return cost_cache.month_over_month(months, group_by, top_n)
+    except Exception as e:
+        return {"error": f"Failed to compare monthly costs: {str(e)}"}
+
 # Help and Information Tools
 @mcp.tool()
 def get_aws_help() -> str:
@@ -663,6 +835,12 @@ def get_aws_help() -> str:
 • "List Lambda functions in us-east-1"
 • "Invoke function my-lambda with payload {{}}"
 
+💰 COST ANALYSIS:
+• "What did I spend per day over the last 30 days?"
+• "Top 5 services by cost this month"
+• "Compare costs with last month"
+• "Costs grouped by tag Environment"
+
 🎯 EXAMPLE QUERIES:
 • "What EC2 instances are running in us-west-2?"
 • "Show me all my EC2 instances across all regions"
@@ -696,21 +874,37 @@ def get_server_status() -> str:
     }
     
     if check_aws_available():
-        try:
-            session = get_aws_session()
-            sts = session.client('sts')
-            identity = sts.get_caller_identity()
-            status["aws_account"] = identity.get('Account')
-            status["aws_user"] = identity.get('Arn')
-        except:
-            pass
+        identity = credential_manager.identity
+        status["aws_account"] = identity.get('Account')
+        status["aws_user"] = identity.get('Arn')
     
     return json.dumps(status, indent=2)
 
+@mcp.resource("aws://regions")
+def get_region_catalog() -> str:
+    """Get the cached region catalog and measured endpoint latencies"""
+    return json.dumps(region_catalog.status(), indent=2)
+
+@mcp.resource("aws://costs/cache")
+def get_cost_cache_status() -> str:
+    """Get cached Cost Explorer partitions and API call count"""
+    return json.dumps(cost_cache.status(), indent=2)
+
+@mcp.resource("aws://server/rate-limits")
+def get_rate_limits() -> str:
+    """Get the current adaptive request rate per service and region"""
+    return json.dumps(rate_limiter.status(), indent=2)
+
+@mcp.resource("aws://server/credentials")
+def get_credentials_status() -> str:
+    """Get AWS credential resolution state and timings"""
+    return json.dumps(credential_manager.status(), indent=2)
+
 if __name__ == "__main__":
     logger.info("Starting AWS Cloud Management MCP Server...")
     
     # Check AWS credentials (but don't fail if not available)
+    credential_manager.start()
     session = get_aws_session()
     if session:
         logger.info("✅ AWS credentials available - full functionality enabled")
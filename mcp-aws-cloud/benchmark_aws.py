@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the AWS MCP server tools against the offline fake backend.
+
+Runs each tool function from aws_server.py through its real code path against
+a synthetic fleet (see aws_fake.py) and reports latency and AWS API calls per
+tool call. No AWS account or network access is needed.
+
+Examples:
+    python3 benchmark_aws.py
+    python3 benchmark_aws.py --instances 5000 --buckets 500 --latency-ms 20 --region-latency
+    python3 benchmark_aws.py --throttle-rate 0.05 --tools list_all_ec2_instances,list_s3_buckets
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark AWS MCP tools against a synthetic fleet")
+    parser.add_argument("--instances", type=int, default=2000, help="EC2 instances in the fleet")
+    parser.add_argument("--buckets", type=int, default=200, help="S3 buckets in the fleet")
+    parser.add_argument("--functions", type=int, default=500, help="Lambda functions in the fleet")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Injected latency per API call")
+    parser.add_argument("--region-latency", action="store_true",
+                        help="Add a realistic per-region round-trip time to each call")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of API calls that fail with a throttling error")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed calls per tool")
+    parser.add_argument("--tools", default="", help="Comma-separated subset of tools to run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    args = parse_args()
+
+    # The backend is chosen when aws_server is imported
+    os.environ.update({
+        "AWS_BACKEND": "fake",
+        "AWS_FAKE_INSTANCES": str(args.instances),
+        "AWS_FAKE_BUCKETS": str(args.buckets),
+        "AWS_FAKE_FUNCTIONS": str(args.functions),
+        "AWS_FAKE_LATENCY_MS": str(args.latency_ms),
+        "AWS_FAKE_REGION_LATENCY": "1" if args.region_latency else "0",
+        "AWS_FAKE_THROTTLE_RATE": str(args.throttle_rate),
+    })
+    import logging
+    logging.disable(logging.WARNING)
+    import aws_server
+
+    if not aws_server.check_aws_available():
+        print("❌ Fake backend did not come up")
+        sys.exit(1)
+    session = aws_server.fake_session
+    fleet = session.fleet
+
+    # Pick arguments that exist in the generated fleet
+    busiest_region = max(fleet.instances, key=lambda r: len(fleet.instances[r]))
+    far_region = max((r for r in fleet.instances if fleet.instances[r]), key=fleet.region_rtt_ms)
+    far_instance = fleet.instances[far_region][0]["InstanceId"]
+    first_bucket = fleet.buckets[0]["Name"] if fleet.buckets else "missing-bucket"
+
+    tools = [
+        ("list_ec2_instances", lambda: aws_server.list_ec2_instances(region=busiest_region)),
+        ("list_all_ec2_instances", aws_server.list_all_ec2_instances),
+        ("get_ec2_instances_by_region", aws_server.get_ec2_instances_by_region),
+        ("get_instance_details", lambda: aws_server.get_instance_details(far_instance)),
+        ("list_s3_buckets", aws_server.list_s3_buckets),
+        ("get_s3_bucket_objects", lambda: aws_server.get_s3_bucket_objects(first_bucket, max_keys=100)),
+        ("list_lambda_functions", lambda: aws_server.list_lambda_functions(region=busiest_region)),
+        ("get_cloudwatch_metrics", lambda: aws_server.get_cloudwatch_metrics("CPUUtilization", "AWS/EC2", hours=24)),
+        ("get_top_costs", lambda: aws_server.get_top_costs(days=90)),
+        ("health_check", aws_server.health_check),
+    ]
+    if args.tools:
+        wanted = set(args.tools.split(","))
+        tools = [t for t in tools if t[0] in wanted]
+
+    results = []
+    for name, call in tools:
+        session.reset_counters()
+        started = time.perf_counter()
+        response = call()
+        cold_ms = (time.perf_counter() - started) * 1000
+        cold_calls = sum(session.calls.values())
+
+        session.reset_counters()
+        latencies = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            response = call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        results.append({
+            "tool": name,
+            "cold_ms": round(cold_ms, 1),
+            "cold_api_calls": cold_calls,
+            "p50_ms": round(statistics.median(latencies), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "max_ms": round(max(latencies), 1),
+            "api_calls_per_call": round(sum(session.calls.values()) / args.iterations, 1),
+            "throttled_per_call": round(sum(session.throttled.values()) / args.iterations, 1),
+            "response_bytes": len(json.dumps(response, default=str)),
+            "error": response.get("error") if isinstance(response, dict) else None,
+        })
+
+    if args.json:
+        print(json.dumps({"fleet": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"🧪 AWS MCP benchmark: {args.instances} instances, {args.buckets} buckets, "
+          f"{args.functions} functions across {len(fleet.regions)} regions")
+    print(f"   latency {args.latency_ms} ms/call{' + region RTT' if args.region_latency else ''}, "
+          f"throttle rate {args.throttle_rate}, {args.iterations} iterations\n")
+    header = f"{'tool':<30}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'calls':>8}{'throttled':>11}{'bytes':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['tool']:<30}{r['cold_ms']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['max_ms']:>10}"
+              f"{r['api_calls_per_call']:>8}{r['throttled_per_call']:>11}{r['response_bytes']:>10}")
+        if r["error"]:
+            print(f"  ⚠️ {r['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark the calculator's result cache (calc_cache.py).
+
+Calls tool functions from mcp_server.py directly, the way FastMCP does
+(keyword arguments with defaults filled in), and reports the median time
+per call (best of --repeats runs, which filters out scheduler noise) for:
+
+  plain     the undecorated tool function
+  disabled  the memoized wrapper with the cache off (the default)
+  miss      cache on, a new argument every call (key, lookup, store, evict)
+  hit       cache on, the same arguments every call
+
+"overhead" is miss minus plain, i.e. what the cache costs when it doesn't
+help. The last case has more numbers than the key limit and shows the
+bypass path.
+
+Examples:
+    python3 benchmark_cache.py
+    python3 benchmark_cache.py --iterations 20000 --cache-size 256 --json
+"""
+import argparse
+import json
+import time
+
+import calc_cache
+import mcp_server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure result-cache overhead per tool call")
+    parser.add_argument("--iterations", type=int, default=5000, help="Calls per measurement")
+    parser.add_argument("--repeats", type=int, default=5, help="Measurements per case (the fastest is reported)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cache entries (misses evict once full)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def _data(n):
+    return [float(j % 97) for j in range(n)]
+
+
+def _matrix(n):
+    """Diagonally dominant, so never singular"""
+    return [10.0 * n if r == c else float((r * n + c) % 7) for r in range(n) for c in range(n)]
+
+
+# name -> (tool function, arguments for call i)
+CASES = {
+    "add": (mcp_server.add, lambda i: {"a": float(i), "b": 1.5, "precision": 0}),
+    "sin": (mcp_server.sin, lambda i: {"a": float(i), "precision": 0}),
+    "evaluate": (mcp_server.evaluate,
+                 lambda i: {"expression": "x^2 + 2*x + 1", "variables": {"x": float(i)}}),
+    "statistics[1k]": (mcp_server.statistics,
+                       lambda i, data=_data(1000): {"data": data + [float(i)], "quantiles": None, "bins": 0}),
+    "linear_algebra[10x10]": (mcp_server.linear_algebra,
+                              lambda i, a=_matrix(10): {"operation": "solve", "a": [a[0] + i] + a[1:],
+                                                       "a_shape": [10, 10], "b": [1.0] * 10, "b_shape": None}),
+    "statistics[20k, bypass]": (mcp_server.statistics,
+                                lambda i, data=_data(20000): {"data": data + [float(i)], "quantiles": None,
+                                                              "bins": 0}),
+}
+
+
+def time_calls(fn, make_args, iterations, repeats, vary):
+    # Build the arguments up front so only the call is timed
+    calls = [make_args(i if vary else 0) for i in range(iterations)]
+    samples = []
+    for r in range(repeats):
+        if vary:
+            # new values in every repeat so the cache never sees them twice
+            calls = [make_args(r * iterations + i) for i in range(iterations)]
+        start = time.perf_counter()
+        for kwargs in calls:
+            fn(**kwargs)
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return min(samples)
+
+
+def run_case(name, tool, make_args, args):
+    plain = tool.__wrapped__
+    iterations = args.iterations if not name.startswith(("statistics", "linear")) else max(1, args.iterations // 10)
+    result = {"case": name, "iterations": iterations}
+
+    off = calc_cache.ResultCache(0)
+    result["plain_us"] = time_calls(plain, make_args, iterations, args.repeats, vary=True)
+    result["disabled_us"] = time_calls(off.memoize(plain), make_args, iterations, args.repeats, vary=True)
+
+    on = calc_cache.ResultCache(args.cache_size)
+    result["miss_us"] = time_calls(on.memoize(plain), make_args, iterations, args.repeats, vary=True)
+    hit_cache = calc_cache.ResultCache(args.cache_size)
+    result["hit_us"] = time_calls(hit_cache.memoize(plain), make_args, iterations, args.repeats, vary=False)
+
+    result["overhead_us"] = result["miss_us"] - result["plain_us"]
+    result["overhead_pct"] = 100 * result["overhead_us"] / result["plain_us"]
+    status = on.status()["tools"].get(plain.__name__, {})
+    result["bypassed"] = status.get("bypassed", 0) > 0
+    return result
+
+
+def main():
+    args = parse_args()
+    results = [run_case(name, tool, make_args, args) for name, (tool, make_args) in CASES.items()]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'case':<26}{'plain µs':>10}{'disabled':>10}{'miss':>10}{'hit':>10}{'overhead':>11}")
+    for r in results:
+        note = "  (not cached: too large)" if r["bypassed"] else ""
+        print(f"{r['case']:<26}{r['plain_us']:>10.2f}{r['disabled_us']:>10.2f}{r['miss_us']:>10.2f}"
+              f"{r['hit_us']:>10.2f}{r['overhead_us']:>+8.2f} ({r['overhead_pct']:+.0f}%){note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Load test for the calculator MCP server over stdio and SSE.
+
+Starts mcp_server.py, opens N concurrent MCP client sessions, and has each
+session issue a weighted mix of tool calls (scalar arithmetic, expressions,
+batches, statistics, unit conversion, linear algebra, integration) back to
+back for a fixed time. Reports per transport and session count:
+
+  throughput    completed calls per second over all sessions
+  p50/p99       call latency as seen by the client, in ms
+  server CPU    CPU time of the server process(es) / wall time
+  RSS           resident memory of the server process(es) at the end, and peak
+
+With stdio a server process serves exactly one client, so N sessions means N
+server processes and CPU/RSS are summed over them. With SSE one server
+process (`mcp_server.py --sse PORT`) serves all N sessions. CPU and RSS are
+read from /proc and left empty on systems without it. The client runs in
+this process on the same machine; its CPU share is reported too, since on a
+small box it competes with the server.
+
+Examples:
+    python3 benchmark_load.py
+    python3 benchmark_load.py --transports sse --sessions 1,8,32,64 --duration 10
+    python3 benchmark_load.py --cache-size 1024 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SERVER = os.path.join(HERE, "mcp_server.py")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# (tool, weight, arguments from a random generator)
+MIX = [
+    ("add", 30, lambda rng: {"a": rng.uniform(-1e3, 1e3), "b": rng.uniform(-1e3, 1e3)}),
+    ("sin", 15, lambda rng: {"a": rng.uniform(0, 360)}),
+    ("evaluate", 15, lambda rng: {"expression": "sqrt(x^2 + 1) * sin(x) + log(x + 1)",
+                                  "variables": {"x": rng.uniform(0, 100)}}),
+    ("batch_eval", 10, lambda rng: {"operation": "log", "a": [rng.uniform(1, 1e6) for _ in range(100)]}),
+    ("statistics", 10, lambda rng: {"data": [rng.gauss(0, 1) for _ in range(1000)]}),
+    ("convert_units", 10, lambda rng: {"expression": f"{rng.randint(1, 400)} Gbit/s", "to": "GiB/s"}),
+    ("linear_algebra", 5, lambda rng: {"operation": "solve",
+                                       "a": [rng.uniform(-1, 1) + (8.0 if i % 9 == 0 else 0.0) for i in range(64)],
+                                       "a_shape": [8, 8], "b": [1.0] * 8}),
+    ("integrate", 5, lambda rng: {"expression": "x^2 * sqrt(x)", "lower": 0, "upper": rng.uniform(1, 10)}),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test the calculator MCP server over stdio and SSE")
+    parser.add_argument("--transports", default="stdio,sse", help="Comma-separated transports: stdio, sse")
+    parser.add_argument("--sessions", default="1,4,16", help="Comma-separated numbers of concurrent sessions")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per run")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed calls per session before each run")
+    parser.add_argument("--port", type=int, default=3101, help="Port for the SSE server")
+    parser.add_argument("--cache-size", type=int, default=0, help="CALC_CACHE_SIZE for the server (0: off)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the call mix")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the server to start")
+    parser.add_argument("--per-tool", action="store_true", help="Also print p50 latency per tool")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# -- server process stats (Linux /proc) -----------------------------------
+
+def cpu_seconds(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS   # utime + stime
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def rss_mb(pid):
+    """(current, peak) resident set size in MB"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def server_children():
+    """PIDs of mcp_server.py processes started by this process (the stdio servers)"""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == os.getpid() and b"mcp_server.py" in cmdline:
+            pids.append(int(entry))
+    return pids
+
+
+def total(values):
+    values = [v for v in values if v is not None]
+    return sum(values) if values else None
+
+
+# -- load -----------------------------------------------------------------
+
+def server_env(args):
+    return {**os.environ, "CALC_CACHE_SIZE": str(args.cache_size)}
+
+
+async def call(session, tool, arguments):
+    """Whether the call succeeded; a failed call is counted, not raised"""
+    try:
+        result = await session.call_tool(tool, arguments)
+        return not result.isError
+    except Exception:
+        return False
+
+
+async def drive(session, rng, tools, weights, deadline, samples):
+    """Issue calls back to back until the deadline; samples get (tool, seconds, ok)"""
+    while time.perf_counter() < deadline:
+        tool, make_args = rng.choices(tools, weights)[0]
+        arguments = make_args(rng)
+        started = time.perf_counter()
+        ok = await call(session, tool, arguments)
+        samples.append((tool, time.perf_counter() - started, ok))
+
+
+async def measure(sessions, pids, args):
+    tools = [(name, make_args) for name, _, make_args in MIX]
+    weights = [weight for _, weight, _ in MIX]
+    rngs = [random.Random(args.seed * 1000 + i) for i in range(len(sessions))]
+
+    warmup_errors = 0
+    for session, rng in zip(sessions, rngs):
+        for _ in range(args.warmup):
+            tool, make_args = rng.choices(tools, weights)[0]
+            if not await call(session, tool, make_args(rng)):
+                warmup_errors += 1
+
+    samples = []
+    cpu_before = total(cpu_seconds(pid) for pid in pids)
+    client_before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(drive(s, rng, tools, weights, deadline, samples) for s, rng in zip(sessions, rngs)))
+    elapsed = time.perf_counter() - started
+    cpu_after = total(cpu_seconds(pid) for pid in pids)
+    client_after = resource.getrusage(resource.RUSAGE_SELF)
+    memory = [rss_mb(pid) for pid in pids]
+
+    latencies = [seconds * 1000 for _, seconds, _ in samples]
+    result = {
+        "sessions": len(sessions),
+        "server_processes": len(pids),
+        "calls": len(samples),
+        "errors": sum(1 for _, _, ok in samples if not ok),
+        "warmup_errors": warmup_errors,
+        "duration_s": round(elapsed, 2),
+        "throughput": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        "server_cpu_pct": None,
+        "server_rss_mb": None,
+        "server_peak_rss_mb": None,
+        "client_cpu_pct": round(100 * ((client_after.ru_utime + client_after.ru_stime)
+                                       - (client_before.ru_utime + client_before.ru_stime)) / elapsed, 1),
+    }
+    if cpu_before is not None and cpu_after is not None:
+        result["server_cpu_pct"] = round(100 * (cpu_after - cpu_before) / elapsed, 1)
+    if memory and all(m is not None for m in memory):
+        result["server_rss_mb"] = round(sum(m[0] for m in memory), 1)
+        result["server_peak_rss_mb"] = round(sum(m[1] for m in memory), 1)
+    by_tool = {}
+    for tool, seconds, _ in samples:
+        by_tool.setdefault(tool, []).append(seconds * 1000)
+    result["tools"] = {tool: {"calls": len(values), "p50_ms": round(percentile(values, 50), 2)}
+                       for tool, values in sorted(by_tool.items())}
+    return result
+
+
+async def run_stdio(count, args):
+    params = StdioServerParameters(command=sys.executable, args=[SERVER], env=server_env(args), cwd=HERE)
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(count):
+            read, write = await stack.enter_async_context(stdio_client(params))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await asyncio.wait_for(session.initialize(), args.timeout)
+            sessions.append(session)
+        return await measure(sessions, server_children(), args)
+
+
+def wait_for_port(port, process, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"SSE server exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"SSE server did not listen on port {port} within {timeout:g}s")
+
+
+async def run_sse(count, args):
+    process = subprocess.Popen([sys.executable, SERVER, "--sse", str(args.port)], cwd=HERE, env=server_env(args),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.port, process, args.timeout)
+        async with AsyncExitStack() as stack:
+            sessions = []
+            for _ in range(count):
+                read, write = await stack.enter_async_context(sse_client(f"http://127.0.0.1:{args.port}/sse"))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await asyncio.wait_for(session.initialize(), args.timeout)
+                sessions.append(session)
+            return await measure(sessions, [process.pid], args)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+RUNNERS = {"stdio": run_stdio, "sse": run_sse}
+
+
+def main():
+    args = parse_args()
+    transports = [t.strip() for t in args.transports.split(",") if t.strip()]
+    unknown = [t for t in transports if t not in RUNNERS]
+    if unknown:
+        sys.exit(f"Unknown transport(s): {', '.join(unknown)}. Choose from: {', '.join(RUNNERS)}")
+
+    results = []
+    for transport in transports:
+        for count in (int(n) for n in args.sessions.split(",")):
+            try:
+                result = asyncio.run(RUNNERS[transport](count, args))
+            except Exception as e:   # report and go on with the other runs
+                result = {"sessions": count, "error": f"{type(e).__name__}: {e}"}
+            results.append({"transport": transport, **result})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"🚀 Calculator MCP server load test, {args.duration:g}s per run, mixed tool calls\n")
+    header = (f"{'transport':<10}{'sessions':>9}{'calls':>8}{'calls/s':>10}{'p50 ms':>9}{'p99 ms':>9}"
+              f"{'errors':>8}{'srv CPU%':>10}{'RSS MB':>9}{'peak MB':>9}{'cli CPU%':>10}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['transport']:<10}{r['sessions']:>9}  ⚠️ {r['error']}")
+            continue
+        print(f"{r['transport']:<10}{r['sessions']:>9}{r['calls']:>8}{r['throughput']:>10}{str(r['p50_ms']):>9}"
+              f"{str(r['p99_ms']):>9}{r['errors']:>8}{str(r['server_cpu_pct']):>10}{str(r['server_rss_mb']):>9}"
+              f"{str(r['server_peak_rss_mb']):>9}{str(r['client_cpu_pct']):>10}")
+        if r["warmup_errors"]:
+            print(f"{'':<10}{'':>9}  ⚠️ {r['warmup_errors']} warmup call(s) failed")
+        if args.per_tool:
+            for tool, stats in r["tools"].items():
+                print(f"{'':<10}{tool:>22}: {stats['calls']} calls, p50 {stats['p50_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Vectorized batch evaluation for the Scientific Calculator server.
+
+Every scalar tool has an element-wise NumPy counterpart here with the same
+semantics (trig in degrees, the same domain errors). A whole column of
+operands is evaluated in one call; elements that hit a domain error (log of
+a non-positive number, division by zero, ...) or overflow are masked out and
+reported by index instead of failing the batch.
+"""
+import math
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+MAX_BATCH = 1_000_000
+
+# n! for every n whose factorial fits in a float64 (170! ~ 7.3e306)
+_FACTORIALS = np.array([float(math.factorial(n)) for n in range(171)])
+
+
+def _tan_degrees(a: np.ndarray) -> np.ndarray:
+    # tan is undefined at odd multiples of 90 degrees, where np.tan(np.radians(a))
+    # returns a huge finite number instead; handled by the domain check
+    return np.tan(np.radians(a))
+
+
+def _factorial(a: np.ndarray) -> np.ndarray:
+    a = np.asarray(a, dtype=np.float64)
+    out = np.full(a.shape, np.inf)
+    ok = (a >= 0) & (a == np.floor(a)) & (a <= 170)
+    out[ok] = _FACTORIALS[a[ok].astype(np.int64)]
+    return out
+
+
+def _not_integer(a: np.ndarray) -> np.ndarray:
+    return (a < 0) | (a != np.floor(a))
+
+
+# name -> (arity, element-wise function, [(error mask, message)])
+# Trig takes degrees, like the scalar tools
+OPERATIONS: Dict[str, tuple] = {
+    "add": (2, np.add, []),
+    "subtract": (2, np.subtract, []),
+    "multiply": (2, np.multiply, []),
+    "divide": (2, np.divide, [(lambda a, b: b == 0, "Cannot divide by zero")]),
+    "power": (2, np.power, [(lambda a, b: (a < 0) & (b != np.floor(b)), "Negative base with fractional exponent"),
+                            (lambda a, b: (a == 0) & (b < 0), "Cannot raise zero to a negative power")]),
+    "remainder": (2, np.mod, [(lambda a, b: b == 0, "Cannot calculate remainder with zero divisor")]),
+    "sqrt": (1, np.sqrt, [(lambda a: a < 0, "Cannot calculate square root of negative number")]),
+    "cbrt": (1, np.cbrt, []),
+    "factorial": (1, _factorial, [(_not_integer, "Factorial requires a non-negative integer")]),
+    "log": (1, np.log, [(lambda a: a <= 0, "Cannot calculate logarithm of non-positive number")]),
+    "sin": (1, lambda a: np.sin(np.radians(a)), []),
+    "cos": (1, lambda a: np.cos(np.radians(a)), []),
+    "tan": (1, _tan_degrees, [(lambda a: np.mod(a - 90, 180) == 0, "Tangent undefined at this angle")]),
+}
+
+
+class ErrorTracker:
+    """First domain error per element, stored as a code into a list of messages"""
+
+    def __init__(self, size: int):
+        self.codes = np.zeros(size, dtype=np.int16)
+        self.messages: List[str] = []
+
+    def flag(self, failed: np.ndarray, message: str):
+        if not failed.any():
+            return
+        failed = np.broadcast_to(failed, self.codes.shape) & (self.codes == 0)
+        if failed.any():
+            if message not in self.messages:
+                self.messages.append(message)
+            self.codes[failed] = self.messages.index(message) + 1
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self.codes != 0
+
+    def first_error(self) -> Optional[str]:
+        failed = np.flatnonzero(self.codes)
+        return self.messages[self.codes[failed[0]] - 1] if failed.size else None
+
+    def errors(self) -> Dict[str, List[int]]:
+        return {message: np.flatnonzero(self.codes == i + 1).tolist() for i, message in enumerate(self.messages)}
+
+
+def apply(operation: str, operands: Sequence[Any], tracker: ErrorTracker) -> np.ndarray:
+    """Element-wise operation; failing elements are flagged on the tracker.
+
+    Call inside np.errstate(all="ignore"): masked elements may divide by zero
+    or overflow.
+    """
+    _, fn, checks = OPERATIONS[operation]
+    result = fn(*operands)
+    for check, message in checks:
+        tracker.flag(np.asarray(check(*operands)), message)
+    # Whatever else is non-finite came from overflow or an undefined result
+    tracker.flag(np.isinf(result), "Result too large")
+    tracker.flag(np.isnan(result), "Result undefined")
+    return result
+
+
+def report(result: np.ndarray, tracker: ErrorTracker) -> Dict[str, Any]:
+    """Results with masked elements as None, the error mask and failing indices by message"""
+    mask = tracker.mask
+    values = np.broadcast_to(np.asarray(result, dtype=np.float64), mask.shape).tolist()
+    if mask.any():
+        for i in np.flatnonzero(mask).tolist():
+            values[i] = None
+    return {
+        "count": len(values),
+        "results": values,
+        "error_mask": mask.tolist(),
+        "error_count": int(mask.sum()),
+        "errors": tracker.errors(),
+    }
+
+
+def _as_array(name: str, values: Union[float, Sequence[float]]) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim > 1:
+        raise ValueError(f"{name} must be a number or a flat list of numbers")
+    return array
+
+
+def evaluate(operation: str, a: Union[float, Sequence[float]],
+             b: Optional[Union[float, Sequence[float]]] = None) -> Dict[str, Any]:
+    """Apply `operation` element-wise; a scalar or length-1 operand is broadcast.
+
+    Returns the results (None where masked), a boolean error mask, and the
+    failing indices grouped by error message.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'. Choose from: {', '.join(OPERATIONS)}")
+    arity = OPERATIONS[operation][0]
+
+    operands = [_as_array("a", a)]
+    if arity == 2:
+        if b is None:
+            raise ValueError(f"{operation} needs a second operand list b")
+        operands.append(_as_array("b", b))
+    elif b is not None:
+        raise ValueError(f"{operation} takes a single operand list a")
+    try:
+        operands = [np.atleast_1d(x) for x in np.broadcast_arrays(*operands)]
+    except ValueError:
+        raise ValueError(f"Operand lengths differ: a has {operands[0].size}, b has {operands[1].size}")
+    size = operands[0].size
+    if size > MAX_BATCH:
+        raise ValueError(f"Batch of {size} elements exceeds the limit of {MAX_BATCH}")
+
+    tracker = ErrorTracker(size)
+    with np.errstate(all="ignore"):
+        result = apply(operation, operands, tracker)
+    return {"operation": operation, **report(result, tracker)}
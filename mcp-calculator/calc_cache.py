@@ -0,0 +1,149 @@
+"""
+Result memoization for the Scientific Calculator server.
+
+The calculator tools are pure: the same arguments always give the same
+result, and agents often ask for the same value again a few turns later.
+`ResultCache.memoize` wraps a tool function with a bounded LRU keyed by
+(tool name, normalized arguments). Arguments are bound to the function
+signature with defaults applied, so add(1, 2) and add(a=1, b=2, precision=0)
+share an entry, and lists / dicts are turned into hashable tuples.
+
+The cache is opt-in: with maxsize 0 (the default) the wrapper calls straight
+through. Calls whose arguments hold more than `max_key_elements` numbers are
+never cached, since hashing and keeping them would cost more than most
+recomputations. Errors are not cached. A dict result served from the cache
+is a copy marked `cached: true`, without the `timing_ms` of the original
+computation.
+"""
+import functools
+import inspect
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+MAX_KEY_ELEMENTS = 10_000
+_SCALARS = (float, int, str, bool)
+
+
+class _TooLarge(Exception):
+    pass
+
+
+def _as_hit(result: Any) -> Any:
+    """A cached result as returned on a hit; timings of the original call would be stale"""
+    if not isinstance(result, dict):
+        return result
+    hit = {k: v for k, v in result.items() if k != "timing_ms"}
+    hit["cached"] = True
+    return hit
+
+
+class ResultCache:
+    """Bounded LRU of tool results with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 0, max_key_elements: int = MAX_KEY_ELEMENTS):
+        self.maxsize = max(0, maxsize)
+        self.max_key_elements = max_key_elements
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        # tool name -> {"hits", "misses", "bypassed"}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _normalize(self, value: Any, budget: list) -> Any:
+        if isinstance(value, (list, tuple)):
+            budget[0] -= len(value)
+            if budget[0] < 0:
+                raise _TooLarge
+            try:
+                # a flat list of numbers packs into bytes in one C call, keeping -0.0 distinct
+                return struct.pack(f"{len(value)}d", *value)
+            except (struct.error, OverflowError):
+                return tuple(self._normalize(v, budget) for v in value)
+        if isinstance(value, dict):
+            budget[0] -= len(value)
+            if budget[0] < 0:
+                raise _TooLarge
+            return tuple(sorted((k, self._normalize(v, budget)) for k, v in value.items()))
+        if type(value) is float and value == 0:
+            return repr(value)   # 0.0 == -0.0, but sin/cbrt/divide keep the sign
+        return value
+
+    def key(self, name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[Tuple]:
+        """(tool, normalized arguments), or None if the arguments are too large to cache"""
+        if args or len(kwargs) != len(signature.parameters):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            kwargs = bound.arguments
+        budget = [self.max_key_elements]
+        parts = [name]
+        try:
+            for parameter in signature.parameters:
+                value = kwargs[parameter]
+                if type(value) in _SCALARS and value:
+                    parts.append(value)
+                else:
+                    parts.append(self._normalize(value, budget))
+        except _TooLarge:
+            return None
+        except KeyError:
+            signature.bind(**kwargs)   # raises the TypeError a direct call would
+            raise
+        return tuple(parts)
+
+    def memoize(self, fn: Callable) -> Callable:
+        """Decorator for a pure tool function; a no-op while the cache is disabled"""
+        name = fn.__name__
+        signature = inspect.signature(fn)
+        counters = self._counters.setdefault(name, {"hits": 0, "misses": 0, "bypassed": 0})
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not self.maxsize:
+                return fn(*args, **kwargs)
+            key = self.key(name, signature, args, kwargs)
+            if key is None:
+                with self._lock:
+                    counters["bypassed"] += 1
+                return fn(*args, **kwargs)
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    counters["hits"] += 1
+                    return _as_hit(self._entries[key])
+                counters["misses"] += 1
+            result = fn(*args, **kwargs)
+            with self._lock:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            return result
+
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = sum(c["hits"] for c in self._counters.values())
+            misses = sum(c["misses"] for c in self._counters.values())
+            return {
+                "enabled": self.enabled,
+                "max_size": self.maxsize,
+                "size": len(self._entries),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+                "evictions": self.evictions,
+                "tools": {name: dict(c) for name, c in self._counters.items()
+                          if c["hits"] or c["misses"] or c["bypassed"]},
+            }
@@ -0,0 +1,336 @@
+"""
+Numerical calculus for the Scientific Calculator server.
+
+Integrals, roots and minima of an expression in one variable, computed
+server-side instead of through dozens of point evaluations as tool calls.
+The expression is compiled once by calc_expr and evaluated on whole NumPy
+arrays of points, so trig functions take degrees here too.
+
+* integrate: adaptive Gauss-Kronrod (7/15-point). All intervals that still
+  need refining are evaluated together, 15 points each, in one vectorized
+  call per round. Infinite bounds are mapped onto a finite interval.
+* find_root: the interval is scanned at `samples` points in one call to
+  find every sign change, then each bracket is refined with Brent's method.
+* minimize: a vectorized scan picks the best grid cell, then Brent's
+  bounded minimization (golden section + parabolic steps) refines it.
+
+Every result reports how many function evaluations it took.
+"""
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from calc_expr import compile_expression
+
+MAX_EVALUATIONS = 1_000_000
+MAX_ITERATIONS = 200
+MAX_SAMPLES = 100_000
+EPS = np.finfo(np.float64).eps
+
+# Gauss-Kronrod 7/15 nodes and weights on [-1, 1]
+_XGK = np.array([0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+                 0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+                 0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+                 0.207784955007898467600689403773245, 0.0])
+_WGK = np.array([0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                 0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                 0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                 0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+_WG = np.array([0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+                0.381830050505118944950369775488975, 0.417959183673469387755102040816327])
+NODES = np.concatenate((-_XGK[:-1], _XGK[::-1]))
+KRONROD_WEIGHTS = np.concatenate((_WGK[:-1], _WGK[::-1]))
+GAUSS_WEIGHTS = np.zeros(15)
+GAUSS_WEIGHTS[1::2] = np.concatenate((_WG[:-1], _WG[::-1]))
+
+
+class Function:
+    """A compiled expression in one variable, evaluated on arrays and counting points"""
+
+    def __init__(self, expression: str, variable: str = "x", parameters: Optional[Dict[str, float]] = None):
+        self.compiled = compile_expression(expression)
+        self.variable = variable
+        self.parameters = {name: np.float64(value) for name, value in (parameters or {}).items()}
+        unknown = [v for v in self.compiled.variables if v != variable and v not in self.parameters]
+        if unknown:
+            raise ValueError(f"No value given for {', '.join(unknown)}; the variable is {variable}")
+        self.evaluations = 0
+
+    def values(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(f(x), error mask, messages) for an array of points"""
+        x = np.asarray(x, dtype=np.float64)
+        if self.evaluations + x.size > MAX_EVALUATIONS:
+            raise ValueError(f"Gave up after {self.evaluations} function evaluations")
+        self.evaluations += x.size
+        result, tracker = self.compiled.run({**self.parameters, self.variable: x.ravel()}, x.size)
+        return result.reshape(x.shape), tracker.mask.reshape(x.shape), tracker.messages
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """f(x), raising ValueError on a domain error"""
+        result, mask, messages = self.values(x)
+        if mask.any():
+            at = np.asarray(x).ravel()[np.flatnonzero(mask)[0]]
+            raise ValueError(f"{messages[0]} at {self.variable} = {at:g}")
+        return result
+
+    def scalar(self, x: float) -> float:
+        return float(self(np.array([x]))[0])
+
+
+# -- integration ----------------------------------------------------------
+
+def _mapped(f: Function, lower: float, upper: float) -> Tuple[Callable[[np.ndarray], np.ndarray], float, float]:
+    """Integrand and finite bounds, substituting x(t) for infinite bounds"""
+    if math.isfinite(lower) and math.isfinite(upper):
+        return f, lower, upper
+    if math.isinf(lower) and math.isinf(upper):
+        # x = t / (1 - t^2), t in (-1, 1)
+        return lambda t: f(t / (1 - t * t)) * (1 + t * t) / (1 - t * t) ** 2, -1.0, 1.0
+    if math.isinf(upper):
+        # x = lower + t / (1 - t), t in [0, 1)
+        return lambda t: f(lower + t / (1 - t)) / (1 - t) ** 2, 0.0, 1.0
+    # x = upper - (1 - t) / t, t in (0, 1]
+    return lambda t: f(upper - (1 - t) / t) / (t * t), 0.0, 1.0
+
+
+def integrate(expression: str, lower: float, upper: float, variable: str = "x",
+              tolerance: float = 1e-10, parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Definite integral by vectorized adaptive Gauss-Kronrod quadrature"""
+    if math.isnan(lower) or math.isnan(upper):
+        raise ValueError("Bounds must be numbers")
+    f = Function(expression, variable, parameters)
+    sign = 1.0
+    if lower > upper:
+        lower, upper, sign = upper, lower, -1.0
+    # JSON has no infinity, so infinite bounds are echoed as "inf" / "-inf"
+    bounds = [b if math.isfinite(b) else str(b) for b in ((lower, upper) if sign > 0 else (upper, lower))]
+    result: Dict[str, Any] = {"expression": expression, "lower": bounds[0], "upper": bounds[1]}
+    if lower == upper:
+        return {**result, "result": 0.0, "error_estimate": 0.0, "evaluations": 0, "intervals": 0, "converged": True}
+
+    g, a, b = _mapped(f, lower, upper)
+    edges = np.linspace(a, b, 9)
+    intervals = np.column_stack((edges[:-1], edges[1:]))
+    total = error = 0.0
+    accepted = rounds = 0
+    converged = True
+    with np.errstate(all="ignore"):
+        while intervals.size:
+            rounds += 1
+            centre = (intervals[:, 0] + intervals[:, 1]) / 2
+            half = (intervals[:, 1] - intervals[:, 0]) / 2
+            values = g(centre[:, None] + half[:, None] * NODES)
+            if not np.isfinite(values).all():
+                raise ValueError("The integrand is not finite on the interval")
+            kronrod = half * (values @ KRONROD_WEIGHTS)
+            estimate = np.abs(kronrod - half * (values @ GAUSS_WEIGHTS))
+            # each interval may use its share of the overall tolerance
+            allowed = max(tolerance, tolerance * abs(total + kronrod.sum())) * (2 * half) / (b - a)
+            # intervals too narrow to split further are accepted as they are
+            done = (estimate <= allowed) | (half <= 4 * EPS * np.maximum(np.abs(centre), 1.0))
+            if f.evaluations + 30 * int((~done).sum()) > MAX_EVALUATIONS:
+                done[:] = True
+                converged = False
+            total += kronrod[done].sum()
+            error += estimate[done].sum()
+            accepted += int(done.sum())
+            rest = intervals[~done]
+            middle = (rest[:, 0] + rest[:, 1]) / 2
+            intervals = np.concatenate((np.column_stack((rest[:, 0], middle)), np.column_stack((middle, rest[:, 1]))))
+    total, error = float(total), float(error)
+    if not math.isfinite(total):
+        raise ValueError("The integral does not converge")
+    converged = converged and error <= 10 * max(tolerance, tolerance * abs(total))
+    result.update({"result": sign * total, "error_estimate": error, "evaluations": f.evaluations,
+                   "intervals": accepted, "rounds": rounds, "converged": converged})
+    if not converged:
+        result["note"] = "Tolerance not reached; the integral may diverge or have a singularity in the interval"
+    return result
+
+
+# -- scalar Brent methods -------------------------------------------------
+
+def _brent_root(f: Callable[[float], float], a: float, b: float, fa: float, fb: float,
+                xtol: float) -> Tuple[float, int, bool]:
+    """Brent's method on a bracket with f(a), f(b) of opposite sign: (root, iterations, converged)"""
+    c, fc = b, fb
+    d = e = b - a
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * EPS * abs(b) + 0.5 * xtol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0:
+            return b, iteration, True
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # inverse quadratic interpolation, or secant when only two points differ
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, m)
+        fb = f(b)
+    return b, MAX_ITERATIONS, False
+
+
+def _brent_minimize(f: Callable[[float], float], a: float, b: float,
+                    xtol: float) -> Tuple[float, float, int, bool]:
+    """Brent's bounded minimization on [a, b]: (x, f(x), iterations, converged)"""
+    golden = 0.5 * (3 - math.sqrt(5))
+    x = w = v = a + golden * (b - a)
+    fx = fw = fv = f(x)
+    d = e = 0.0
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        m = 0.5 * (a + b)
+        tol = math.sqrt(EPS) * abs(x) + xtol / 3
+        if abs(x - m) <= 2 * tol - 0.5 * (b - a):
+            return x, fx, iteration, True
+        parabolic = False
+        if abs(e) > tol:
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            r, e = e, d
+            if abs(p) < abs(0.5 * q * r) and q * (a - x) < p < q * (b - x):
+                d = p / q
+                u = x + d
+                if u - a < 2 * tol or b - u < 2 * tol:
+                    d = tol if x < m else -tol
+                parabolic = True
+        if not parabolic:
+            e = (b - x) if x < m else (a - x)
+            d = golden * e
+        u = x + (d if abs(d) >= tol else math.copysign(tol, d))
+        fu = f(u)
+        if fu <= fx:
+            if u < x:
+                b = x
+            else:
+                a = x
+            v, fv, w, fw, x, fx = w, fw, x, fx, u, fu
+        else:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if fu <= fw or w == x:
+                v, fv, w, fw = w, fw, u, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+    return x, fx, MAX_ITERATIONS, False
+
+
+# -- roots and minima -----------------------------------------------------
+
+def _check_interval(lower: float, upper: float, samples: int):
+    if not (math.isfinite(lower) and math.isfinite(upper)):
+        raise ValueError("Bounds must be finite numbers")
+    if lower >= upper:
+        raise ValueError("lower must be less than upper")
+    if samples < 2 or samples > MAX_SAMPLES:
+        raise ValueError(f"samples must be between 2 and {MAX_SAMPLES}")
+
+
+def find_root(expression: str, lower: float, upper: float, variable: str = "x", tolerance: float = 1e-12,
+              samples: int = 100, parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Every root in [lower, upper] where f changes sign; `a = b` is solved as a - b = 0"""
+    _check_interval(lower, upper, samples)
+    if expression.count("=") == 1:
+        left, right = expression.split("=")
+        f = Function(f"({left}) - ({right})", variable, parameters)
+    else:
+        f = Function(expression, variable, parameters)
+
+    with np.errstate(all="ignore"):
+        x = np.linspace(lower, upper, samples + 1)
+        y, mask, _ = f.values(x)
+        y = np.where(mask, np.nan, y)
+    roots = x[y == 0].tolist()
+    # brackets between neighbouring defined samples of opposite sign (NaN compares false)
+    brackets = np.flatnonzero(np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+    x, y = x.tolist(), y.tolist()
+    iterations = 0
+    converged = True
+    poles: List[float] = []
+    last = [lower]
+
+    def probe(t: float) -> float:
+        last[0] = t
+        return f.scalar(t)
+
+    for i in brackets.tolist():
+        try:
+            root, steps, ok = _brent_root(probe, x[i], x[i + 1], y[i], y[i + 1], tolerance)
+            value = probe(root)
+        except ValueError:   # landed exactly on a point where f is undefined
+            poles.append(last[0])
+            continue
+        iterations += steps
+        converged &= ok
+        # a sign change across a pole (tan, 1/x) converges to the pole, where |f| blows up
+        if abs(value) > max(abs(y[i]), abs(y[i + 1])):
+            poles.append(root)
+        else:
+            roots.append(root)
+    if not roots:
+        note = f" (only across poles near {', '.join(f'{p:g}' for p in poles)})" if poles else ""
+        raise ValueError(f"No root found in [{lower:g}, {upper:g}]: f changes sign nowhere{note} "
+                         f"between {samples + 1} sample points. "
+                         f"Try other bounds or more samples (a root where f only touches zero is not found)")
+    roots.sort()
+    result = {"expression": expression, "root": roots[0], "roots": roots, "evaluations": f.evaluations,
+              "iterations": iterations, "converged": converged}
+    if poles:
+        result["discontinuities"] = poles
+    return result
+
+
+def minimize(expression: str, lower: float, upper: float, variable: str = "x", tolerance: float = 1e-10,
+             samples: int = 100, maximize: bool = False,
+             parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Minimum (or maximum) of f on [lower, upper]"""
+    _check_interval(lower, upper, samples)
+    f = Function(expression, variable, parameters)
+    sign = -1.0 if maximize else 1.0
+
+    with np.errstate(all="ignore"):
+        x = np.linspace(lower, upper, samples + 1)
+        y, mask, _ = f.values(x)
+        y = np.where(mask | ~np.isfinite(y), np.nan, sign * y)
+    if np.isnan(y).all():
+        raise ValueError(f"f is undefined at every sample point in [{lower:g}, {upper:g}]")
+    best = int(np.nanargmin(y))
+    x, y = x.tolist(), y.tolist()
+    a, b = x[max(best - 1, 0)], x[min(best + 1, samples)]
+    # the refinement may wander into points where f is undefined; treat them as +inf
+    def objective(t: float) -> float:
+        value, bad, _ = f.values(np.array([t]))
+        return math.inf if bad[0] else sign * float(value[0])
+    xmin, fmin, iterations, converged = _brent_minimize(objective, a, b, tolerance)
+    if y[best] < fmin:   # the scan hit an endpoint (or the exact optimum)
+        xmin, fmin = x[best], y[best]
+    return {"expression": expression, "x": xmin, "value": sign * fmin, "maximize": maximize,
+            "at_bound": xmin in (lower, upper), "evaluations": f.evaluations,
+            "iterations": iterations, "converged": converged}
@@ -0,0 +1,278 @@
+"""
+Combinatorics for the Scientific Calculator server.
+
+Factorials, binomial coefficients (nCr) and permutations (nPr) grow far
+past what is useful to serialize: 100000! has 456,574 digits. Results are
+therefore returned exactly only up to a digit budget, and summarized above
+it without computing the full integer:
+
+* log10, digit count and leading digits come from a high-precision
+  Stirling series for ln(n!) evaluated with `decimal`;
+* trailing digits and `mod` results come from the prime factorization of
+  the result (Legendre's formula over a cached prime sieve), so only
+  modular products are ever formed.
+
+Exact factorials use the prime-swing algorithm with a binary-splitting
+product; factorials, sieves and log-factorials are memoized.
+"""
+import math
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from calc_precision import pi
+
+MAX_EXACT_DIGITS = 4000      # Python refuses int -> str beyond 4300 digits by default
+MAX_SIEVE = 20_000_000       # primes below this are enumerable (~20 MB sieve)
+MAX_LEADING_DIGITS = 50
+STIRLING_MIN_N = 1000        # below this ln(n!) is taken from the exact value
+FUNCTIONS = ("factorial", "comb", "perm", "gamma", "lgamma")
+OUTPUTS = ("auto", "exact", "summary", "mod")
+
+# B2, B4, ..., B20 for the Stirling series
+_BERNOULLI = [Fraction(1, 6), Fraction(-1, 30), Fraction(1, 42), Fraction(-1, 30), Fraction(5, 66),
+              Fraction(-691, 2730), Fraction(7, 6), Fraction(-3617, 510), Fraction(43867, 798),
+              Fraction(-174611, 330)]
+
+
+# -- primes ---------------------------------------------------------------
+
+_sieve = np.zeros(0, dtype=np.int64)
+
+
+def primes_up_to(n: int) -> np.ndarray:
+    """Primes <= n, sliced from the largest sieve computed so far"""
+    global _sieve
+    if n > MAX_SIEVE:
+        raise ValueError(f"n above {MAX_SIEVE} is too large for a prime factorization")
+    if _sieve.size == 0 or _sieve[-1] < n:
+        limit = max(n, 2 * int(_sieve[-1]) if _sieve.size else 1024)
+        limit = min(limit, MAX_SIEVE)
+        is_prime = np.ones(limit + 1, dtype=bool)
+        is_prime[:2] = False
+        for i in range(2, math.isqrt(limit) + 1):
+            if is_prime[i]:
+                is_prime[i * i::i] = False
+        _sieve = np.flatnonzero(is_prime)
+    return _sieve[:np.searchsorted(_sieve, n, side="right")]
+
+
+def legendre(n: int, primes: np.ndarray) -> np.ndarray:
+    """Exponent of each prime in n! (Legendre's formula)"""
+    exponents = np.zeros(primes.shape, dtype=np.int64)
+    q = n // primes
+    while q.any():
+        exponents += q
+        q //= primes
+    return exponents
+
+
+def factor_exponents(function: str, n: int, k: int = 0):
+    """(primes, exponents) of n!, C(n, k) or P(n, k)"""
+    primes = primes_up_to(n)
+    exponents = legendre(n, primes)
+    if function == "comb":
+        exponents -= legendre(k, primes) + legendre(n - k, primes)
+    elif function == "perm":
+        exponents -= legendre(n - k, primes)
+    return primes, exponents
+
+
+def _trailing_zeros(function: str, n: int, k: int) -> int:
+    def e(m: int, p: int) -> int:
+        total = 0
+        while m:
+            m //= p
+            total += m
+        return total
+    sub = {"factorial": [], "comb": [k, n - k], "perm": [n - k]}[function]
+    return min(e(n, p) - sum(e(m, p) for m in sub) for p in (2, 5))
+
+
+def modular(function: str, n: int, k: int, modulus: int) -> int:
+    """Result mod `modulus`, from its prime factorization"""
+    if modulus < 1:
+        raise ValueError("modulus must be a positive integer")
+    if modulus == 1 or (function == "factorial" and n >= modulus):
+        return 0
+    primes, exponents = factor_exponents(function, n, k)
+    result = 1
+    for p, e in zip(primes[exponents > 0].tolist(), exponents[exponents > 0].tolist()):
+        result = result * pow(p, e, modulus) % modulus
+        if result == 0:
+            break
+    return result
+
+
+# -- exact values ---------------------------------------------------------
+
+def _product(values: List[int], lo: int, hi: int) -> int:
+    """Binary-splitting product, so big multiplications pair similar sizes"""
+    if hi - lo <= 8:
+        result = 1
+        for v in values[lo:hi]:
+            result *= v
+        return result
+    mid = (lo + hi) // 2
+    return _product(values, lo, mid) * _product(values, mid, hi)
+
+
+def _swing(n: int) -> int:
+    """Swinging factorial n! / ((n//2)!)^2 from its prime factorization"""
+    factors = []
+    for p in primes_up_to(n).tolist():
+        q, f = n, 1
+        while q:
+            q //= p
+            if q & 1:
+                f *= p
+        if f > 1:
+            factors.append(f)
+    return _product(factors, 0, len(factors))
+
+
+@lru_cache(maxsize=128)
+def factorial(n: int) -> int:
+    """Exact n! by prime swing: n! = ((n//2)!)^2 * swing(n)"""
+    if n < 20:
+        return math.factorial(n)
+    half = factorial(n // 2)
+    return half * half * _swing(n)
+
+
+def exact(function: str, n: int, k: int = 0) -> int:
+    if function == "factorial":
+        return factorial(n)
+    if function == "comb":
+        return math.comb(n, k)
+    return math.perm(n, k)
+
+
+# -- logarithms -----------------------------------------------------------
+
+@lru_cache(maxsize=1024)
+def ln_factorial(n: int, prec: int) -> Decimal:
+    """ln(n!) to about prec significant digits"""
+    with localcontext() as ctx:
+        ctx.prec = prec + 10
+        if n < STIRLING_MIN_N:
+            return Decimal(factorial(n)).ln() if n > 1 else Decimal(0)
+        N = Decimal(n)
+        total = N * N.ln() - N + (2 * pi(prec + 10) * N).ln() / 2
+        power = N
+        for i, b in enumerate(_BERNOULLI, 1):
+            total += Decimal(b.numerator) / (Decimal(b.denominator) * (2 * i) * (2 * i - 1) * power)
+            power *= N * N
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return +total
+
+
+def log10_value(function: str, n: int, k: int, digits: int) -> Decimal:
+    """log10 of the result with `digits` correct digits after the decimal point"""
+    magnitude = math.lgamma(n + 1) / math.log(10)
+    prec = len(str(int(magnitude))) + digits + 10
+    terms = {"factorial": [n], "comb": [n, -k, -(n - k)], "perm": [n, -(n - k)]}[function]
+    with localcontext() as ctx:
+        ctx.prec = prec
+        ln = sum((ln_factorial(abs(t), prec) * (1 if t >= 0 else -1) for t in terms), Decimal(0))
+        return ln / Decimal(10).ln()
+
+
+# -- entry point ----------------------------------------------------------
+
+def _check_integers(function: str, n: float, k: Optional[float]) -> tuple:
+    if n != int(n) or n < 0:
+        raise ValueError(f"{function} requires a non-negative integer n")
+    n = int(n)
+    if function == "factorial":
+        return n, 0
+    if k is None or k != int(k) or k < 0:
+        raise ValueError(f"{function} requires a non-negative integer k")
+    if k > n:
+        raise ValueError(f"{function} requires k <= n")
+    return n, int(k)
+
+
+def _gamma(function: str, x: float) -> Dict[str, Any]:
+    if x <= 0 and x == int(x):
+        raise ValueError("Gamma is undefined at zero and negative integers")
+    log_abs = math.lgamma(x)
+    if function == "lgamma":
+        return {"function": function, "x": x, "result": log_abs}
+    sign = 1 if x > 0 or math.floor(-x) % 2 == 1 else -1
+    try:
+        return {"function": function, "x": x, "result": math.gamma(x)}
+    except OverflowError:
+        log10 = log_abs / math.log(10)
+        exponent = math.floor(log10)
+        mantissa = sign * 10 ** (log10 - exponent)
+        return {"function": function, "x": x, "result": None, "log10_abs": log10, "sign": sign,
+                "scientific": f"{mantissa:.10f}e+{exponent}"}
+
+
+def compute(function: str, n: float, k: Optional[float] = None, output: str = "auto",
+            modulus: Optional[int] = None, max_digits: int = 100, digits: int = 20) -> Dict[str, Any]:
+    """factorial / comb / perm / gamma / lgamma with bounded output.
+
+    output: "auto" (exact up to max_digits digits, summary above), "exact",
+    "summary" (digit count, log10, leading and trailing digits) or "mod".
+    """
+    if function not in FUNCTIONS:
+        raise ValueError(f"Unknown function '{function}'. Choose from: {', '.join(FUNCTIONS)}")
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output '{output}'. Choose from: {', '.join(OUTPUTS)}")
+    if function in ("gamma", "lgamma"):
+        return _gamma(function, float(n))
+
+    n, k = _check_integers(function, n, k)
+    result: Dict[str, Any] = {"function": function, "n": n}
+    if function != "factorial":
+        result["k"] = k
+
+    if output == "mod":
+        if modulus is None:
+            raise ValueError("output='mod' needs a modulus")
+        return {**result, "modulus": modulus, "result": modular(function, n, k, modulus)}
+
+    max_digits = min(max(1, max_digits), MAX_EXACT_DIGITS)
+    digits = min(max(1, digits), MAX_LEADING_DIGITS)
+    # float estimate of the size decides whether the exact value is cheap enough
+    estimate = {"factorial": math.lgamma(n + 1),
+                "comb": math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1),
+                "perm": math.lgamma(n + 1) - math.lgamma(n - k + 1)}[function] / math.log(10)
+    if output == "exact" and estimate >= MAX_EXACT_DIGITS:
+        raise ValueError(f"Result has about {int(estimate) + 1} digits, more than the {MAX_EXACT_DIGITS} "
+                         f"returned exactly; use output='summary' or 'mod'")
+
+    if estimate < MAX_EXACT_DIGITS:
+        value = str(exact(function, n, k))
+        if output == "exact" or (output == "auto" and len(value) <= max_digits):
+            return {**result, "result": value, "digit_count": len(value)}
+        stripped = value.rstrip("0")
+        return {**result, "result": None, "digit_count": len(value),
+                "log10": float(Decimal(value).log10()),
+                "leading_digits": value[:digits], "trailing_digits": value[-digits:],
+                "trailing_zeros": len(value) - len(stripped),
+                "scientific": f"{value[0]}.{value[1:digits] or '0'}e+{len(value) - 1}"}
+
+    log10 = log10_value(function, n, k, digits)
+    exponent = int(log10)
+    with localcontext() as ctx:
+        ctx.prec = digits + 10
+        mantissa = Decimal(10) ** (log10 - exponent)
+    leading = f"{mantissa:.{digits + 5}f}".replace(".", "")[:digits]
+    zeros = _trailing_zeros(function, n, k)
+    if zeros >= digits:
+        trailing = "0" * digits
+    else:
+        try:
+            trailing = str(modular(function, n, k, 10 ** digits)).zfill(digits)
+        except ValueError:
+            trailing = None   # n too large to factorize
+    return {**result, "result": None, "digit_count": exponent + 1, "log10": float(log10),
+            "leading_digits": leading, "trailing_digits": trailing, "trailing_zeros": zeros,
+            "scientific": f"{leading[0]}.{leading[1:] or '0'}e+{exponent}"}
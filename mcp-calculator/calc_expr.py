@@ -0,0 +1,168 @@
+"""
+Expression evaluator for the Scientific Calculator server.
+
+Expressions such as `sqrt(3^2+4^2)*sin(30)` are parsed with Python's `ast`
+module and only a whitelist of nodes is accepted: numbers, variables, the
+constants pi / e / tau, + - * / % ^ ** and calls to the calculator
+functions. The tree is compiled once into nested closures over the
+element-wise operations in calc_batch, and compiled expressions are kept in
+an LRU keyed by the expression string. The same compiled form evaluates a
+single binding or whole lists of bindings, with per-element error masks.
+"""
+import ast
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from calc_batch import MAX_BATCH, OPERATIONS, ErrorTracker, apply, report
+
+MAX_EXPRESSION_LENGTH = 2000
+MAX_NODES = 500
+COMPILE_CACHE_SIZE = 512
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+BINARY_OPERATORS = {
+    ast.Add: "add",
+    ast.Sub: "subtract",
+    ast.Mult: "multiply",
+    ast.Div: "divide",
+    ast.Mod: "remainder",
+    ast.Pow: "power",
+}
+
+# env (variable name -> array), tracker -> array or float
+Node = Callable[[Dict[str, np.ndarray], ErrorTracker], Any]
+
+
+class CompiledExpression:
+    """A validated expression compiled to closures, reusable for any bindings"""
+
+    def __init__(self, expression: str, fn: Node, variables: List[str]):
+        self.expression = expression
+        self.variables = variables
+        self._fn = fn
+
+    def run(self, env: Dict[str, np.ndarray], size: int) -> Tuple[np.ndarray, ErrorTracker]:
+        """Evaluate over `size` elements; every env value has length 1 or size"""
+        tracker = ErrorTracker(size)
+        with np.errstate(all="ignore"):
+            result = self._fn(env, tracker)
+        result = np.broadcast_to(np.asarray(result, dtype=np.float64), (size,))
+        return result, tracker
+
+    def __call__(self, **variables: float) -> float:
+        """Evaluate at one point, raising ValueError on a domain error"""
+        result, tracker = self.run({name: np.float64(value) for name, value in variables.items()}, 1)
+        error = tracker.first_error()
+        if error:
+            raise ValueError(error)
+        return float(result[0])
+
+
+def _compile(node: ast.AST, variables: set) -> Node:
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant {node.value!r}")
+        value = float(node.value)
+        return lambda env, tracker: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env, tracker: value
+        if name in OPERATIONS:
+            raise ValueError(f"'{name}' is a function; call it as {name}(...)")
+        variables.add(name)
+        return lambda env, tracker: env[name]
+
+    if isinstance(node, ast.BinOp):
+        operation = BINARY_OPERATORS.get(type(node.op))
+        if operation is None:
+            raise ValueError(f"Unsupported operator {type(node.op).__name__}")
+        left, right = _compile(node.left, variables), _compile(node.right, variables)
+        return lambda env, tracker: apply(operation, (left(env, tracker), right(env, tracker)), tracker)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile(node.operand, variables)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return lambda env, tracker: np.negative(operand(env, tracker))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in OPERATIONS:
+            raise ValueError(f"Unknown function {ast.unparse(node.func)}. Available: {', '.join(OPERATIONS)}")
+        operation = node.func.id
+        arity = OPERATIONS[operation][0]
+        if node.keywords or len(node.args) != arity:
+            raise ValueError(f"{operation}() takes {arity} argument{'s' if arity > 1 else ''}")
+        args = [_compile(arg, variables) for arg in node.args]
+        return lambda env, tracker: apply(operation, [arg(env, tracker) for arg in args], tracker)
+
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Parse, validate and compile an expression; cached by expression string"""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    # ^ is power, as on a calculator (Python parses it as xor with lower precedence)
+    source = expression.replace("^", "**").strip()
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise ValueError(f"Expression has more than {MAX_NODES} terms")
+    variables: set = set()
+    fn = _compile(tree.body, variables)
+    return CompiledExpression(expression, fn, sorted(variables))
+
+
+def bind(compiled: CompiledExpression,
+         variables: Optional[Dict[str, Union[float, Sequence[float]]]]) -> Tuple[Dict[str, np.ndarray], int, bool]:
+    """(env, size, vectorized) for a variables mapping of numbers or equal-length lists"""
+    variables = variables or {}
+    missing = [name for name in compiled.variables if name not in variables]
+    if missing:
+        raise ValueError(f"No value given for {', '.join(missing)}")
+    env: Dict[str, np.ndarray] = {}
+    sizes = set()
+    vectorized = False
+    for name in compiled.variables:
+        value = np.asarray(variables[name], dtype=np.float64)
+        if value.ndim > 1:
+            raise ValueError(f"Variable {name} must be a number or a flat list of numbers")
+        if value.ndim == 1:
+            vectorized = True
+            if value.size != 1:
+                sizes.add(value.size)
+        env[name] = value
+    if len(sizes) > 1:
+        raise ValueError(f"Variable lists have different lengths: {sorted(sizes)}")
+    size = sizes.pop() if sizes else 1
+    if size > MAX_BATCH:
+        raise ValueError(f"{size} bindings exceed the limit of {MAX_BATCH}")
+    return env, size, vectorized
+
+
+def evaluate(expression: str, variables: Optional[Dict[str, Union[float, Sequence[float]]]] = None) -> Dict[str, Any]:
+    """Evaluate an expression for one binding, or element-wise over lists of bindings"""
+    compiled = compile_expression(expression)
+    env, size, vectorized = bind(compiled, variables)
+    result, tracker = compiled.run(env, size)
+    if not vectorized:
+        error = tracker.first_error()
+        if error:
+            raise ValueError(error)
+        return {"expression": expression, "result": float(result[0])}
+    return {"expression": expression, "variables": compiled.variables, **report(result, tracker)}
+
+
+def cache_info() -> Dict[str, int]:
+    info = compile_expression.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
@@ -0,0 +1,138 @@
+"""
+Linear algebra for the Scientific Calculator server.
+
+Matrices are passed row-major as a flat list of numbers plus a shape,
+e.g. data=[1, 2, 3, 4], shape=[2, 2]. That is the compact form clients
+already hold and the layout NumPy reshapes without copying. Each operation
+is one NumPy/LAPACK call (BLAS for matmul). Sizes are capped so one tool
+call can't tie up the server, and every result reports how long parsing
+and computing took.
+"""
+import math
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+MAX_ELEMENTS = 4_000_000     # per input or result matrix
+MAX_FACTORIZE_DIM = 2000     # n for O(n^3) solve / inverse / determinant / least squares
+MAX_EIGEN_DIM = 1000
+OPERATIONS = ("matmul", "solve", "inverse", "determinant", "eigenvalues", "lstsq")
+
+
+def to_matrix(name: str, data: Sequence[float], shape: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Row-major data + shape -> 1-D or 2-D array; a missing shape means a vector,
+    or a square matrix when `name` must be square"""
+    array = np.asarray(data, dtype=np.float64)
+    if array.ndim != 1:
+        raise ValueError(f"{name} must be a flat row-major list of numbers with a separate shape")
+    if array.size == 0:
+        raise ValueError(f"{name} is empty")
+    if array.size > MAX_ELEMENTS:
+        raise ValueError(f"{name} has {array.size} elements, more than the limit of {MAX_ELEMENTS}")
+    if not np.isfinite(array).all():
+        raise ValueError(f"{name} contains NaN or infinite values")
+    if shape is None:
+        return array
+    shape = [int(s) for s in shape]
+    if len(shape) not in (1, 2) or any(s < 1 for s in shape):
+        raise ValueError(f"{name}_shape must be [n] or [rows, columns]")
+    if math.prod(shape) != array.size:
+        raise ValueError(f"{name} has {array.size} elements but {name}_shape {shape} needs {math.prod(shape)}")
+    return array.reshape(shape)
+
+
+def _square(name: str, a: np.ndarray, limit: int) -> np.ndarray:
+    if a.ndim == 1:
+        n = math.isqrt(a.size)
+        if n * n != a.size:
+            raise ValueError(f"{name} must be square; give {name}_shape")
+        a = a.reshape(n, n)
+    if a.shape[0] != a.shape[1]:
+        raise ValueError(f"{name} must be square, got {a.shape[0]}x{a.shape[1]}")
+    if a.shape[0] > limit:
+        raise ValueError(f"{name} is {a.shape[0]}x{a.shape[0]}; the limit for this operation is {limit}x{limit}")
+    return a
+
+
+def _matrix_result(array: np.ndarray) -> Dict[str, Any]:
+    return {"shape": list(array.shape), "data": array.ravel().tolist()}
+
+
+def _needs_b(operation: str, b: Optional[np.ndarray]) -> np.ndarray:
+    if b is None:
+        raise ValueError(f"{operation} needs b")
+    return b
+
+
+def compute(operation: str, a: Sequence[float], a_shape: Optional[Sequence[int]] = None,
+            b: Optional[Sequence[float]] = None, b_shape: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """Run one linear-algebra operation; results are row-major with their shape"""
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'. Choose from: {', '.join(OPERATIONS)}")
+    started = time.perf_counter()
+    A = to_matrix("a", a, a_shape)
+    B = to_matrix("b", b, b_shape) if b is not None else None
+    parsed = time.perf_counter()
+
+    result: Dict[str, Any] = {"operation": operation}
+    try:
+        if operation == "matmul":
+            B = _needs_b(operation, B)
+            if A.ndim == 1 and a_shape is None:
+                A = _square("a", A, MAX_FACTORIZE_DIM)
+            if A.shape[-1] != B.shape[0]:
+                raise ValueError(f"Cannot multiply {list(A.shape)} by {list(B.shape)}: inner dimensions differ")
+            # an outer product of two small inputs can still be huge
+            cells = (A.shape[0] if A.ndim == 2 else 1) * (B.shape[-1] if B.ndim == 2 else 1)
+            if cells > MAX_ELEMENTS:
+                raise ValueError(f"The product would have {cells} elements, more than the limit of {MAX_ELEMENTS}")
+            result.update(_matrix_result(A @ B))
+        elif operation == "solve":
+            A = _square("a", A, MAX_FACTORIZE_DIM)
+            B = _needs_b(operation, B)
+            if B.shape[0] != A.shape[0]:
+                raise ValueError(f"b has {B.shape[0]} rows but a is {A.shape[0]}x{A.shape[0]}")
+            result.update(_matrix_result(np.linalg.solve(A, B)))
+        elif operation == "inverse":
+            A = _square("a", A, MAX_FACTORIZE_DIM)
+            result.update(_matrix_result(np.linalg.inv(A)))
+        elif operation == "determinant":
+            A = _square("a", A, MAX_FACTORIZE_DIM)
+            sign, log_abs = np.linalg.slogdet(A)
+            # slogdet keeps huge/tiny determinants representable; the plain value may overflow
+            with np.errstate(over="ignore"):
+                det = float(sign * np.exp(log_abs))
+            result.update({"determinant": det if math.isfinite(det) else None,
+                           "sign": float(sign), "log_abs_determinant": float(log_abs)})
+        elif operation == "eigenvalues":
+            A = _square("a", A, MAX_EIGEN_DIM)
+            if np.array_equal(A, A.T):
+                result.update({"symmetric": True, "eigenvalues": np.linalg.eigvalsh(A).tolist()})
+            else:
+                values = np.linalg.eigvals(A)
+                order = np.lexsort((values.imag, values.real))
+                values = values[order]
+                result.update({"symmetric": False, "eigenvalues": values.real.tolist()})
+                if np.any(values.imag):
+                    result["eigenvalues_imag"] = values.imag.tolist()
+        elif operation == "lstsq":
+            B = _needs_b(operation, B)
+            if A.ndim == 1:
+                A = A.reshape(-1, 1)
+            if min(A.shape) > MAX_FACTORIZE_DIM:
+                raise ValueError(f"a is {A.shape[0]}x{A.shape[1]}; the limit for least squares is "
+                                 f"{MAX_FACTORIZE_DIM} columns (or rows)")
+            if B.shape[0] != A.shape[0]:
+                raise ValueError(f"b has {B.shape[0]} rows but a has {A.shape[0]}")
+            solution, residuals, rank, singular_values = np.linalg.lstsq(A, B, rcond=None)
+            result.update(_matrix_result(solution))
+            result.update({"residuals": residuals.tolist(), "rank": int(rank),
+                           "singular_values": singular_values.tolist()})
+    except np.linalg.LinAlgError as e:
+        raise ValueError(f"{operation} failed: {e}")
+
+    finished = time.perf_counter()
+    result["timing_ms"] = {"parse": round((parsed - started) * 1000, 3),
+                           "compute": round((finished - parsed) * 1000, 3)}
+    return result
@@ -0,0 +1,248 @@
+"""
+Arbitrary-precision arithmetic for the Scientific Calculator server.
+
+Tools called with `precision=N` are evaluated with `decimal` to N
+significant digits instead of float. Operands are taken at their decimal
+value (0.1 is 1/10, not the nearest binary float), the exponent range is
+unbounded so `power` returns huge values instead of overflowing, and
+integer powers are computed exactly. Every operation runs with guard
+digits and is rounded once at the end, to N significant digits.
+
+pi, e, ln 2 and ln 10 are cached at the highest precision requested so
+far; a request for the same or fewer digits rounds the cached value
+instead of recomputing it.
+"""
+import math
+import threading
+from decimal import Decimal, DecimalException, localcontext, MAX_EMAX, MIN_EMIN, Overflow
+from typing import Any, Callable, Dict, Optional
+
+MAX_PRECISION = 1000
+MAX_EXACT_DIGITS = 4000
+GUARD_DIGITS = 10
+
+
+def _chudnovsky_pi(prec: int) -> Decimal:
+    """pi by the Chudnovsky series, summed by binary splitting"""
+    c3_over_24 = 640320 ** 3 // 24
+
+    def split(a: int, b: int):
+        if b - a == 1:
+            if a == 0:
+                p = q = 1
+            else:
+                p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+                q = a * a * a * c3_over_24
+            t = p * (13591409 + 545140134 * a)
+            return p, q, -t if a & 1 else t
+        mid = (a + b) // 2
+        p1, q1, t1 = split(a, mid)
+        p2, q2, t2 = split(mid, b)
+        return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+    # each term adds ~14.18 digits
+    _, q, t = split(0, prec // 14 + 2)
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return Decimal(q) * 426880 * Decimal(10005).sqrt() / Decimal(t)
+
+
+class CachedConstant:
+    """A constant kept at the highest precision computed so far"""
+
+    def __init__(self, name: str, compute: Callable[[int], Decimal]):
+        self.name = name
+        self._compute = compute
+        self._lock = threading.Lock()
+        self._value: Optional[Decimal] = None
+        self.digits = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, prec: int) -> Decimal:
+        with self._lock:
+            if prec > self.digits:
+                self._value = self._compute(prec + GUARD_DIGITS)
+                self.digits = prec
+                self.misses += 1
+            else:
+                self.hits += 1
+            value = self._value
+        with localcontext() as ctx:
+            ctx.prec = prec
+            return +value
+
+
+def _at(prec: int, fn: Callable[[], Decimal]) -> Decimal:
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return fn()
+
+
+pi = CachedConstant("pi", _chudnovsky_pi)
+e = CachedConstant("e", lambda prec: _at(prec, lambda: Decimal(1).exp()))
+ln2 = CachedConstant("ln2", lambda prec: _at(prec, lambda: Decimal(2).ln()))
+ln10 = CachedConstant("ln10", lambda prec: _at(prec, lambda: Decimal(10).ln()))
+CONSTANTS = {c.name: c for c in (pi, e, ln2, ln10)}
+
+
+def constants_status() -> Dict[str, Any]:
+    return {name: {"digits": c.digits, "hits": c.hits, "misses": c.misses} for name, c in CONSTANTS.items()}
+
+
+# -- functions ------------------------------------------------------------
+
+def _sin_small(x: Decimal) -> Decimal:
+    """Taylor series for |x| <= pi/4, at the current context precision"""
+    x2, term, total, i = x * x, x, x, 1
+    while True:
+        term = -term * x2 / ((i + 1) * (i + 2))
+        i += 2
+        new = total + term
+        if new == total:
+            return total
+        total = new
+
+
+def _cos_small(x: Decimal) -> Decimal:
+    x2, term, total, i = x * x, Decimal(1), Decimal(1), 0
+    while True:
+        term = -term * x2 / ((i + 1) * (i + 2))
+        i += 2
+        new = total + term
+        if new == total:
+            return total
+        total = new
+
+
+def _mod(a: Decimal, b: Decimal) -> Decimal:
+    """Exact a mod b with the divisor's sign, like Python's float %"""
+    # Decimal % fails with DivisionImpossible once the integer quotient has
+    # more digits than the context precision, so widen it for large a / b
+    with localcontext() as ctx:
+        ctx.prec = max(ctx.prec, a.adjusted() - b.adjusted() + GUARD_DIGITS)
+        r = a % b
+        if r != 0 and (r < 0) != (b < 0):
+            r += b
+    return r
+
+
+def sin_degrees(a: Decimal, prec: int) -> Decimal:
+    """sin of an angle in degrees, reduced exactly in degrees to [0, 45]"""
+    d = _mod(a, Decimal(360))
+    sign = 1
+    if d >= 180:
+        sign, d = -1, d - 180
+    if d > 90:
+        d = 180 - d
+    to_radians = pi(prec) / 180
+    value = _sin_small(d * to_radians) if d <= 45 else _cos_small((90 - d) * to_radians)
+    return sign * value
+
+
+def cos_degrees(a: Decimal, prec: int) -> Decimal:
+    # reduce before shifting, so a + 90 can't round away digits of a huge a
+    return sin_degrees(_mod(a, Decimal(360)) + 90, prec)
+
+
+def _integral(x: Decimal) -> bool:
+    return x == x.to_integral_value()
+
+
+def _power(a: Decimal, b: Decimal) -> Decimal:
+    if a == 0 and b < 0:
+        raise ValueError("Cannot raise zero to a negative power")
+    if a < 0 and not _integral(b):
+        raise ValueError("Negative base with fractional exponent")
+    if _integral(a) and _integral(b) and b >= 0:
+        base, exponent = int(a), int(b)
+        digits = exponent * math.log10(abs(base)) if abs(base) > 1 else 0
+        if digits < MAX_EXACT_DIGITS:
+            return Decimal(base ** exponent)   # exact; rounded once by the caller
+    return a ** b
+
+
+def _cbrt(a: Decimal) -> Decimal:
+    if a == 0:
+        return Decimal(0)
+    root = (abs(a).ln() / 3).exp()
+    return root if a > 0 else -root
+
+
+def _remainder(a: Decimal, b: Decimal) -> Decimal:
+    if b == 0:
+        raise ValueError("Cannot calculate remainder with zero divisor")
+    return _mod(a, b)
+
+
+def _divide(a: Decimal, b: Decimal) -> Decimal:
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+
+def _sqrt(a: Decimal) -> Decimal:
+    if a < 0:
+        raise ValueError("Cannot calculate square root of negative number")
+    return a.sqrt()
+
+
+def _log(a: Decimal) -> Decimal:
+    if a <= 0:
+        raise ValueError("Cannot calculate logarithm of non-positive number")
+    return a.ln()
+
+
+def _tan(a: Decimal, prec: int) -> Decimal:
+    if _mod(a, Decimal(180)) == 90:
+        raise ValueError("Tangent undefined at this angle")
+    return sin_degrees(a, prec) / cos_degrees(a, prec)
+
+
+# name -> function of (a, b, working precision)
+OPERATIONS: Dict[str, Callable[[Decimal, Optional[Decimal], int], Any]] = {
+    "add": lambda a, b, prec: a + b,
+    "subtract": lambda a, b, prec: a - b,
+    "multiply": lambda a, b, prec: a * b,
+    "divide": lambda a, b, prec: _divide(a, b),
+    "power": lambda a, b, prec: _power(a, b),
+    "remainder": lambda a, b, prec: _remainder(a, b),
+    "sqrt": lambda a, b, prec: _sqrt(a),
+    "cbrt": lambda a, b, prec: _cbrt(a),
+    "log": lambda a, b, prec: _log(a),
+    "sin": lambda a, b, prec: sin_degrees(a, prec),
+    "cos": lambda a, b, prec: cos_degrees(a, prec),
+    "tan": lambda a, b, prec: _tan(a, prec),
+}
+
+
+def to_string(value: Decimal, prec: int) -> str:
+    """Plain notation for moderate exponents, scientific beyond"""
+    value = value.normalize()
+    if value == 0:
+        return "0"
+    if -20 < value.adjusted() < prec:
+        return format(value, "f")
+    return str(value)
+
+
+def compute(operation: str, a: float, b: Optional[float] = None, precision: int = 50) -> str:
+    """Evaluate a calculator operation to `precision` significant digits"""
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'")
+    if precision < 1 or precision > MAX_PRECISION:
+        raise ValueError(f"precision must be between 1 and {MAX_PRECISION} digits")
+    # str() gives the shortest repr, i.e. the decimal value the caller wrote
+    a = Decimal(str(a))
+    b = Decimal(str(b)) if b is not None else None
+    with localcontext() as ctx:
+        ctx.prec = precision + GUARD_DIGITS
+        ctx.Emax, ctx.Emin = MAX_EMAX, MIN_EMIN
+        try:
+            result = OPERATIONS[operation](a, b, ctx.prec)
+        except Overflow:
+            raise ValueError("Result too large: its exponent exceeds the decimal range")
+        except DecimalException as e:
+            raise ValueError(f"Invalid operation: {e}")
+        ctx.prec = precision
+        return to_string(+result, precision)
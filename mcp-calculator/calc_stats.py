@@ -0,0 +1,262 @@
+"""
+Statistics over numeric datasets for the Scientific Calculator server.
+
+Whole arrays are summarized with NumPy: sums and means use NumPy's pairwise
+summation, and variances and co-moments are taken about the mean, so
+values like 1e9 + small noise keep their precision. Data too large for one
+tool call is sent in chunks to a named stream. Each chunk is reduced to
+(count, mean, M2, co-moment) and merged into the running totals with the
+parallel form of Welford's algorithm (Chan et al.). Only the moments are
+needed for the mean, variance, regression and correlation; raw values are
+retained up to a limit for medians and quantiles.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+MAX_VALUES = 10_000_000
+MAX_STREAM_RETAINED = 5_000_000
+MAX_STREAMS = 64
+MAX_BINS = 10_000
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _array(name: str, data: Sequence[float], min_size: int = 1) -> np.ndarray:
+    array = np.asarray(data, dtype=np.float64)
+    if array.ndim != 1:
+        raise ValueError(f"{name} must be a flat list of numbers")
+    if array.size < min_size:
+        raise ValueError(f"{name} needs at least {min_size} value{'s' if min_size > 1 else ''}")
+    if array.size > MAX_VALUES:
+        raise ValueError(f"{name} has {array.size} values, more than the limit of {MAX_VALUES}")
+    if not np.isfinite(array).all():
+        raise ValueError(f"{name} contains NaN or infinite values")
+    return array
+
+
+def _pair(x: Sequence[float], y: Sequence[float], min_size: int = 2):
+    x, y = _array("x", x, min_size), _array("y", y, min_size)
+    if x.size != y.size:
+        raise ValueError(f"x and y differ in length ({x.size} vs {y.size})")
+    return x, y
+
+
+class Moments:
+    """Count, mean, M2, min/max (and co-moments for paired data), mergeable across chunks"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.paired = False
+        self.mean_y = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    @classmethod
+    def from_chunk(cls, x: np.ndarray, y: Optional[np.ndarray] = None) -> "Moments":
+        """Moments of one chunk in a vectorized pass about the chunk mean"""
+        m = cls()
+        m.n = x.size
+        m.mean = float(np.sum(x) / x.size)
+        dx = x - m.mean
+        m.m2 = float(np.dot(dx, dx))
+        m.min, m.max = float(x.min()), float(x.max())
+        if y is not None:
+            m.paired = True
+            m.mean_y = float(np.sum(y) / y.size)
+            dy = y - m.mean_y
+            m.m2_y = float(np.dot(dy, dy))
+            m.c_xy = float(np.dot(dx, dy))
+        return m
+
+    def merge(self, other: "Moments"):
+        """Chan et al. pairwise update of the running moments"""
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return
+        if self.paired != other.paired:
+            raise ValueError("Cannot mix paired (x, y) and unpaired chunks in one stream")
+        n = self.n + other.n
+        factor = self.n * other.n / n
+        dx = other.mean - self.mean
+        self.m2 += other.m2 + dx * dx * factor
+        self.mean += dx * other.n / n
+        if self.paired:
+            dy = other.mean_y - self.mean_y
+            self.m2_y += other.m2_y + dy * dy * factor
+            self.c_xy += other.c_xy + dx * dy * factor
+            self.mean_y += dy * other.n / n
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self.n = n
+
+    def summary(self) -> Dict[str, Any]:
+        variance = self.m2 / (self.n - 1) if self.n > 1 else None
+        return {
+            "count": self.n,
+            "sum": self.mean * self.n,
+            "mean": self.mean,
+            "variance": variance,
+            "std": variance ** 0.5 if variance is not None else None,
+            "population_variance": self.m2 / self.n if self.n else None,
+            "min": self.min,
+            "max": self.max,
+            "range": self.max - self.min,
+        }
+
+    def regression(self) -> Dict[str, Any]:
+        """Least-squares line y = slope * x + intercept and Pearson correlation"""
+        if self.n < 2:
+            raise ValueError("Regression needs at least 2 points")
+        if self.m2 == 0:
+            raise ValueError("Regression is undefined when all x values are equal")
+        slope = self.c_xy / self.m2
+        intercept = self.mean_y - slope * self.mean
+        r = self.c_xy / (self.m2 * self.m2_y) ** 0.5 if self.m2_y > 0 else None
+        result = {
+            "count": self.n,
+            "slope": slope,
+            "intercept": intercept,
+            "r": r,
+            "r_squared": r * r if r is not None else None,
+        }
+        if self.n > 2:
+            residual_variance = max(self.m2_y - slope * self.c_xy, 0.0) / (self.n - 2)
+            result["slope_stderr"] = (residual_variance / self.m2) ** 0.5
+            result["intercept_stderr"] = (residual_variance * (1 / self.n + self.mean ** 2 / self.m2)) ** 0.5
+        return result
+
+
+def _quantiles(x: np.ndarray, quantiles: Optional[Sequence[float]]) -> Dict[str, float]:
+    qs = list(quantiles) if quantiles else list(DEFAULT_QUANTILES)
+    if any(q < 0 or q > 1 for q in qs):
+        raise ValueError("Quantiles must be between 0 and 1")
+    values = np.quantile(x, qs)
+    return {str(q): float(v) for q, v in zip(qs, values)}
+
+
+def describe(data: Sequence[float], quantiles: Optional[Sequence[float]] = None, bins: int = 0) -> Dict[str, Any]:
+    """Descriptive statistics, quantiles and an optional histogram"""
+    x = _array("data", data)
+    result = Moments.from_chunk(x).summary()
+    result["median"] = float(np.median(x))
+    result["quantiles"] = _quantiles(x, quantiles)
+    if bins:
+        if bins < 1 or bins > MAX_BINS:
+            raise ValueError(f"bins must be between 1 and {MAX_BINS}")
+        counts, edges = np.histogram(x, bins=bins)
+        result["histogram"] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    return result
+
+
+def regression(x: Sequence[float], y: Sequence[float]) -> Dict[str, Any]:
+    x, y = _pair(x, y)
+    return Moments.from_chunk(x, y).regression()
+
+
+def _ranks(a: np.ndarray) -> np.ndarray:
+    """1-based ranks with ties averaged"""
+    order = np.argsort(a, kind="mergesort")
+    ordered = a[order]
+    first = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+    group = np.cumsum(first) - 1
+    starts = np.concatenate((np.flatnonzero(first), [a.size]))
+    ranks = np.empty(a.size)
+    ranks[order] = 0.5 * (starts[group] + starts[group + 1] + 1)
+    return ranks
+
+
+def correlation(x: Sequence[float], y: Sequence[float], method: str = "pearson") -> Dict[str, Any]:
+    x, y = _pair(x, y)
+    if method == "spearman":
+        x, y = _ranks(x), _ranks(y)
+    elif method != "pearson":
+        raise ValueError("method must be pearson or spearman")
+    m = Moments.from_chunk(x, y)
+    if m.m2 == 0 or m.m2_y == 0:
+        raise ValueError("Correlation is undefined when x or y is constant")
+    result = {"method": method, "count": m.n, "r": m.c_xy / (m.m2 * m.m2_y) ** 0.5}
+    if method == "pearson":
+        result["covariance"] = m.c_xy / (m.n - 1)
+    return result
+
+
+class StreamRegistry:
+    """Named running statistics fed chunk by chunk"""
+
+    def __init__(self, max_streams: int = MAX_STREAMS, max_retained: int = MAX_STREAM_RETAINED):
+        self.max_streams = max_streams
+        self.max_retained = max_retained
+        self._lock = threading.Lock()
+        # stream id -> {"moments", "chunks", "retained", "complete", "updated"}
+        self._streams: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, stream_id: str, data: Sequence[float], y: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        if y is not None:
+            x, y = _pair(data, y, min_size=1)
+        else:
+            x = _array("data", data)
+        chunk = Moments.from_chunk(x, y)
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                if len(self._streams) >= self.max_streams:
+                    # Evict the stream that has been idle longest
+                    idle = min(self._streams, key=lambda s: self._streams[s]["updated"])
+                    del self._streams[idle]
+                stream = {"moments": Moments(), "chunks": [], "retained": 0, "complete": True}
+                self._streams[stream_id] = stream
+            stream["moments"].merge(chunk)
+            if stream["complete"] and stream["retained"] + x.size <= self.max_retained:
+                stream["chunks"].append(x)
+                stream["retained"] += x.size
+            else:
+                stream["complete"], stream["chunks"] = False, []
+            stream["updated"] = time.monotonic()
+            return self._report(stream_id, stream)
+
+    def finish(self, stream_id: str, quantiles: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        with self._lock:
+            stream = self._streams.pop(stream_id, None)
+        if stream is None:
+            raise ValueError(f"No open stream '{stream_id}'")
+        result = self._report(stream_id, stream)
+        if stream["complete"]:
+            x = np.concatenate(stream["chunks"])
+            result["median"] = float(np.median(x))
+            result["quantiles"] = _quantiles(x, quantiles)
+        else:
+            result["quantiles"] = None
+            result["note"] = f"Quantiles need the raw values; more than {self.max_retained} were streamed"
+        result["finished"] = True
+        return result
+
+    @staticmethod
+    def _report(stream_id: str, stream: Dict[str, Any]) -> Dict[str, Any]:
+        moments = stream["moments"]
+        result = {"stream_id": stream_id, **moments.summary()}
+        if moments.paired and moments.n >= 2 and moments.m2 > 0:
+            result["regression"] = moments.regression()
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "max_streams": self.max_streams,
+                "streams": {
+                    stream_id: {
+                        "count": stream["moments"].n,
+                        "paired": stream["moments"].paired,
+                        "quantiles_available": stream["complete"],
+                        "idle_seconds": round(now - stream["updated"], 1),
+                    }
+                    for stream_id, stream in self._streams.items()
+                },
+            }
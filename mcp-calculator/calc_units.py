@@ -0,0 +1,502 @@
+"""
+Units and dimensional analysis for the Scientific Calculator server.
+
+A quantity is an exact magnitude (Fraction) in SI base units and a
+dimension vector of integer exponents over m, kg, s, A, K, mol, cd and bit.
+Every unit is defined in terms of earlier ones ("h" is "60 min", "GiB" is
+a prefix on "B", which is "8 bit"); the table is resolved to base units
+once at import, so looking a unit up never walks the graph again.
+Conversion factors are exact rationals, cached per (from, to) pair.
+
+Expressions follow calculator rules with units as factors:
+`40 Gbit/s * 3 h` is 40 × Gbit ÷ s × 3 × h. Juxtaposition multiplies
+left to right like `*`, so write `J/(kg*K)` rather than `J/kg K`.
+Celsius and Fahrenheit have an offset and are only accepted as a single
+value ("100 degC"); use K or delta_degC inside compound units.
+"""
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_UNITS = ("m", "kg", "s", "A", "K", "mol", "cd", "bit")
+MAX_EXPRESSION_LENGTH = 500
+MAX_EXPONENT = 100
+# Exact magnitudes grow without bound through nested powers and products,
+# so numerator and denominator are capped (4096 bits is about 1233 digits)
+MAX_MAGNITUDE_BITS = 4096
+MAX_LITERAL_EXPONENT = 1000
+CACHE_SIZE = 1024
+
+Dims = Tuple[int, ...]
+DIMENSIONLESS: Dims = (0,) * len(BASE_UNITS)
+
+
+def _bits(magnitude: Fraction) -> int:
+    return max(magnitude.numerator.bit_length(), magnitude.denominator.bit_length())
+
+
+def _too_large() -> ValueError:
+    return ValueError(f"Magnitude too large: numerator and denominator are limited to "
+                      f"{MAX_MAGNITUDE_BITS} bits (about {int(MAX_MAGNITUDE_BITS * 0.30103)} digits)")
+
+
+def _checked(magnitude: Fraction) -> Fraction:
+    if _bits(magnitude) > MAX_MAGNITUDE_BITS:
+        raise _too_large()
+    return magnitude
+
+
+def _number(text: str) -> Fraction:
+    """Exact value of a number literal, refusing huge exponents before expanding them"""
+    mantissa, _, exponent = text.lower().partition("e")
+    if exponent and abs(int(exponent)) > MAX_LITERAL_EXPONENT:
+        raise ValueError(f"Number {text!r} is out of range; exponents are limited to ±{MAX_LITERAL_EXPONENT}")
+    return _checked(Fraction(text))
+
+
+class Quantity:
+    """Exact magnitude in base units with a dimension vector"""
+    __slots__ = ("magnitude", "dims")
+
+    def __init__(self, magnitude: Fraction, dims: Dims = DIMENSIONLESS):
+        self.magnitude = magnitude
+        self.dims = dims
+
+    def __mul__(self, other: "Quantity") -> "Quantity":
+        return Quantity(_checked(self.magnitude * other.magnitude), tuple(a + b for a, b in zip(self.dims, other.dims)))
+
+    def __truediv__(self, other: "Quantity") -> "Quantity":
+        if other.magnitude == 0:
+            raise ValueError("Cannot divide by zero")
+        return Quantity(_checked(self.magnitude / other.magnitude), tuple(a - b for a, b in zip(self.dims, other.dims)))
+
+    def __pow__(self, exponent: int) -> "Quantity":
+        if self.magnitude == 0 and exponent < 0:
+            raise ValueError("Cannot raise zero to a negative power")
+        # the result has about |exponent| times the bits; refuse before computing it
+        if (_bits(self.magnitude) - 1) * abs(exponent) > MAX_MAGNITUDE_BITS:
+            raise _too_large()
+        return Quantity(_checked(self.magnitude ** exponent), tuple(a * exponent for a in self.dims))
+
+    def __add__(self, other: "Quantity") -> "Quantity":
+        if self.dims != other.dims:
+            raise ValueError(f"Cannot add {describe(self.dims)} and {describe(other.dims)}")
+        return Quantity(_checked(self.magnitude + other.magnitude), self.dims)
+
+    def __neg__(self) -> "Quantity":
+        return Quantity(-self.magnitude, self.dims)
+
+
+def _base(index: int) -> Quantity:
+    dims = [0] * len(BASE_UNITS)
+    dims[index] = 1
+    return Quantity(Fraction(1), tuple(dims))
+
+
+# -- unit table -----------------------------------------------------------
+
+SI_PREFIXES = {
+    "Q": 10 ** 30, "R": 10 ** 27, "Y": 10 ** 24, "Z": 10 ** 21, "E": 10 ** 18, "P": 10 ** 15,
+    "T": 10 ** 12, "G": 10 ** 9, "M": 10 ** 6, "k": 10 ** 3, "h": 10 ** 2, "da": 10,
+    "d": Fraction(1, 10), "c": Fraction(1, 10 ** 2), "m": Fraction(1, 10 ** 3), "u": Fraction(1, 10 ** 6),
+    "µ": Fraction(1, 10 ** 6), "n": Fraction(1, 10 ** 9), "p": Fraction(1, 10 ** 12),
+    "f": Fraction(1, 10 ** 15), "a": Fraction(1, 10 ** 18), "z": Fraction(1, 10 ** 21),
+    "y": Fraction(1, 10 ** 24), "r": Fraction(1, 10 ** 27), "q": Fraction(1, 10 ** 30),
+}
+IEC_PREFIXES = {p: 2 ** (10 * i) for i, p in enumerate(("Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi", "Yi"), 1)}
+
+# (names, definition, prefixes) in dependency order; None defines a base unit.
+# Prefixes: "si", "data" (SI and IEC) or "" (none).
+DEFINITIONS: List[Tuple[Tuple[str, ...], Optional[str], str]] = [
+    (("m", "meter", "metre"), None, "si"),
+    (("g", "gram"), "0.001 kg", "si"),   # kg is the base unit, g is defined from it
+    (("s", "sec", "second"), None, "si"),
+    (("A", "ampere"), None, "si"),
+    (("K", "kelvin", "delta_degC"), None, "si"),
+    (("mol",), None, "si"),
+    (("cd", "candela"), None, "si"),
+    (("bit", "b"), None, "data"),
+    # time
+    (("min", "minute"), "60 s", ""),
+    (("h", "hr", "hour"), "60 min", ""),
+    (("d", "day"), "24 h", ""),
+    (("week",), "7 day", ""),
+    (("year", "yr"), "365.25 day", ""),   # Julian year
+    # SI derived
+    (("Hz", "hertz"), "1/s", "si"),
+    (("N", "newton"), "kg*m/s^2", "si"),
+    (("Pa", "pascal"), "N/m^2", "si"),
+    (("J", "joule"), "N*m", "si"),
+    (("W", "watt"), "J/s", "si"),
+    (("C", "coulomb"), "A*s", "si"),
+    (("V", "volt"), "W/A", "si"),
+    (("ohm", "Ohm", "Ω"), "V/A", "si"),
+    (("F", "farad"), "C/V", "si"),
+    (("L", "l", "liter", "litre"), "0.001 m^3", "si"),
+    (("t", "tonne"), "1000 kg", ""),
+    (("Wh",), "W*h", "si"),
+    (("eV",), "1.602176634e-19 J", "si"),
+    (("cal",), "4.184 J", "si"),
+    (("bar",), "100000 Pa", "si"),
+    (("atm",), "101325 Pa", ""),
+    # data
+    (("B", "byte", "o", "octet"), "8 bit", "data"),
+    (("bps",), "bit/s", "data"),
+    (("Bps",), "B/s", "data"),
+    # temperature intervals; degC/degF values are handled as offsets
+    (("delta_degF",), "5/9 K", ""),
+    # common non-SI lengths and masses (exact by definition)
+    (("in", "inch"), "0.0254 m", ""),
+    (("ft", "foot", "feet"), "12 in", ""),
+    (("yd", "yard"), "3 ft", ""),
+    (("mi", "mile"), "5280 ft", ""),
+    (("nmi",), "1852 m", ""),
+    (("mph",), "mi/h", ""),
+    (("kn", "knot"), "nmi/h", ""),
+    (("lb", "pound"), "0.45359237 kg", ""),
+    (("oz", "ounce"), "1/16 lb", ""),
+]
+
+# value in K = (value + offset) * scale
+AFFINE_UNITS = {
+    "degC": (Fraction(27315, 100), Fraction(1)), "°C": (Fraction(27315, 100), Fraction(1)),
+    "celsius": (Fraction(27315, 100), Fraction(1)),
+    "degF": (Fraction(45967, 100), Fraction(5, 9)), "°F": (Fraction(45967, 100), Fraction(5, 9)),
+    "fahrenheit": (Fraction(45967, 100), Fraction(5, 9)),
+}
+
+UNITS: Dict[str, Quantity] = {"kg": _base(1)}
+PREFIXABLE: Dict[str, str] = {}
+
+DIMENSION_NAMES = {
+    DIMENSIONLESS: "dimensionless",
+    (1, 0, 0, 0, 0, 0, 0, 0): "length",
+    (0, 1, 0, 0, 0, 0, 0, 0): "mass",
+    (0, 0, 1, 0, 0, 0, 0, 0): "time",
+    (0, 0, 0, 1, 0, 0, 0, 0): "current",
+    (0, 0, 0, 0, 1, 0, 0, 0): "temperature",
+    (0, 0, 0, 0, 0, 1, 0, 0): "amount of substance",
+    (0, 0, 0, 0, 0, 0, 1, 0): "luminous intensity",
+    (0, 0, 0, 0, 0, 0, 0, 1): "information",
+    (0, 0, -1, 0, 0, 0, 0, 1): "data rate",
+    (0, 0, -1, 0, 0, 0, 0, 0): "frequency",
+    (2, 0, 0, 0, 0, 0, 0, 0): "area",
+    (3, 0, 0, 0, 0, 0, 0, 0): "volume",
+    (1, 0, -1, 0, 0, 0, 0, 0): "speed",
+    (1, 0, -2, 0, 0, 0, 0, 0): "acceleration",
+    (1, 1, -2, 0, 0, 0, 0, 0): "force",
+    (-1, 1, -2, 0, 0, 0, 0, 0): "pressure",
+    (2, 1, -2, 0, 0, 0, 0, 0): "energy",
+    (2, 1, -3, 0, 0, 0, 0, 0): "power",
+    (0, 0, 1, 1, 0, 0, 0, 0): "charge",
+    (2, 1, -3, -1, 0, 0, 0, 0): "voltage",
+    (2, 1, -3, -2, 0, 0, 0, 0): "resistance",
+}
+
+
+def describe(dims: Dims) -> str:
+    """Dimension name, e.g. "data rate (bit/s)" """
+    formula = base_formula(dims)
+    name = DIMENSION_NAMES.get(dims)
+    return f"{name} ({formula})" if name and formula != "1" else name or formula
+
+
+def base_formula(dims: Dims) -> str:
+    """Base-unit expression for a dimension vector, e.g. kg*m^2/s^3"""
+    def part(unit: str, exponent: int) -> str:
+        return unit if exponent == 1 else f"{unit}^{exponent}"
+    num = [part(u, e) for u, e in zip(BASE_UNITS, dims) if e > 0]
+    den = [part(u, -e) for u, e in zip(BASE_UNITS, dims) if e < 0]
+    text = "*".join(num) or "1"
+    if den:
+        text += "/" + ("*".join(den) if len(den) == 1 else f"({'*'.join(den)})")
+    return text
+
+
+# -- parser ---------------------------------------------------------------
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_°µΩ][A-Za-z_°µΩ]*)"
+                    r"|(\*\*|[-+*/^()·]))")
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected character {text[position:].strip()[:1]!r} in {text!r}")
+        number, name, operator = match.groups()
+        if number is not None:
+            tokens.append(("number", number))
+        elif name is not None:
+            if match.end() < len(text) and text[match.end()].isdigit():
+                raise ValueError(f"Write powers with ^, e.g. {name}^{text[match.end()]}")
+            tokens.append(("name", name))
+        else:
+            tokens.append(("op", {"**": "^", "·": "*"}.get(operator, operator)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent: sum := product (+|- product)*; product := power ((*|/)? power)*;
+    power := unary (^ unary)?; unary := -unary | atom; atom := number | unit | (sum)"""
+
+    def __init__(self, text: str, units: Dict[str, Quantity]):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.units = units
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValueError(f"Incomplete expression {self.text!r}")
+        self.position += 1
+        return token
+
+    def parse(self) -> Quantity:
+        if not self.tokens:
+            raise ValueError("Empty expression")
+        result = self.sum()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.peek()[1]!r} in {self.text!r}")
+        return result
+
+    def sum(self) -> Quantity:
+        result = self.product()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            operator = self.take()[1]
+            other = self.product()
+            result = result + (other if operator == "+" else -other)
+        return result
+
+    def product(self) -> Quantity:
+        result = self.power()
+        while True:
+            token = self.peek()
+            if token in (("op", "*"), ("op", "/")):
+                self.take()
+                other = self.power()
+                result = result * other if token[1] == "*" else result / other
+            elif token is not None and (token[0] != "op" or token[1] == "("):
+                result = result * self.power()   # juxtaposition: "40 Gbit", "3 h"
+            else:
+                return result
+
+    def power(self) -> Quantity:
+        base = self.unary()
+        if self.peek() != ("op", "^"):
+            return base
+        self.take()
+        exponent = self.unary()
+        if exponent.dims != DIMENSIONLESS or exponent.magnitude.denominator != 1:
+            raise ValueError("Exponents must be plain integers")
+        if abs(exponent.magnitude) > MAX_EXPONENT:
+            raise ValueError(f"Exponents are limited to ±{MAX_EXPONENT}")
+        return base ** int(exponent.magnitude)
+
+    def unary(self) -> Quantity:
+        if self.peek() == ("op", "-"):
+            self.take()
+            return -self.unary()
+        if self.peek() == ("op", "+"):
+            self.take()
+            return self.unary()
+        return self.atom()
+
+    def atom(self) -> Quantity:
+        kind, value = self.take()
+        if kind == "number":
+            return Quantity(_number(value))
+        if kind == "name":
+            return lookup(value, self.units)
+        if value == "(":
+            result = self.sum()
+            if self.take() != ("op", ")"):
+                raise ValueError(f"Missing ')' in {self.text!r}")
+            return result
+        raise ValueError(f"Unexpected {value!r} in {self.text!r}")
+
+
+def lookup(name: str, units: Dict[str, Quantity]) -> Quantity:
+    """A unit by name, or a prefix + prefixable unit (exact names win: "min", "Pa", "cd")"""
+    if name in units:
+        return units[name]
+    if name in AFFINE_UNITS:
+        raise ValueError(f"{name} has an offset and can only be converted on its own, e.g. '100 {name}'; "
+                         f"use K or delta_degC in compound units")
+    for prefixes in (IEC_PREFIXES, SI_PREFIXES):
+        for prefix, factor in prefixes.items():
+            unit = name[len(prefix):]
+            if name.startswith(prefix) and unit in PREFIXABLE:
+                if prefixes is IEC_PREFIXES and PREFIXABLE[unit] != "data":
+                    continue
+                return Quantity(Fraction(factor)) * units[unit]
+    raise ValueError(f"Unknown unit '{name}'")
+
+
+def _build():
+    """Resolve every definition to base units (the precomputed conversion graph)"""
+    for names, definition, prefixes in DEFINITIONS:
+        if definition is None:
+            quantity = _base(BASE_UNITS.index(names[0]))
+        else:
+            quantity = _Parser(definition, UNITS).parse()
+        for name in names:
+            UNITS[name] = quantity
+            if prefixes:
+                PREFIXABLE[name] = prefixes
+    del UNITS["kg"]   # "kg" is k + g like every other prefixed unit
+
+
+_build()
+
+
+# -- conversion -----------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse(text: str) -> Quantity:
+    """Evaluate a quantity or unit expression to base units; cached by string"""
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    return _Parser(text, UNITS).parse()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def conversion_factor(source: str, target: str) -> Fraction:
+    """Exact factor from one unit expression to another, after a dimension check"""
+    a, b = parse(source), parse(target)
+    if a.dims != b.dims:
+        raise ValueError(f"Cannot convert {describe(a.dims)} to {describe(b.dims)}")
+    return a.magnitude / b.magnitude
+
+
+def _affine(text: str) -> Optional[Tuple[Fraction, str]]:
+    """(value, unit) for a lone offset-temperature value such as '100 degC'"""
+    parts = text.split()
+    if len(parts) == 1:
+        parts = ["1", parts[0]]
+    if len(parts) == 2 and parts[1] in AFFINE_UNITS:
+        try:
+            return _number(parts[0]), parts[1]
+        except ValueError:
+            return None
+    return None
+
+
+def exact_string(value: Fraction, max_digits: int = 60) -> Optional[str]:
+    """Terminating decimal for value, or "p/q", or None if either would be too long"""
+    # more than 4 bits per allowed digit is always too long; skip the string conversion
+    if max(abs(value.numerator), value.denominator).bit_length() > 4 * max_digits:
+        return None
+    if value.denominator == 1:
+        text = str(value.numerator)
+        return text if len(text) <= max_digits else None
+    d, twos, fives = value.denominator, 0, 0
+    while d % 2 == 0:
+        d, twos = d // 2, twos + 1
+    while d % 5 == 0:
+        d, fives = d // 5, fives + 1
+    if d == 1:
+        places = max(twos, fives)
+        digits = str(abs(value.numerator) * 10 ** places // value.denominator).rjust(places + 1, "0")
+        text = ("-" if value < 0 else "") + digits[:-places] + "." + digits[-places:]
+        if len(text) <= max_digits + 2:
+            return text
+    text = f"{value.numerator}/{value.denominator}"
+    return text if len(text) <= max_digits else None
+
+
+_LEADING_NUMBER = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*(.*)$", re.S)
+
+
+def _split(expression: str) -> Optional[Tuple[Fraction, str]]:
+    """(number, unit expression) for the common "40 Gbit/s" form, else None"""
+    match = _LEADING_NUMBER.match(expression)
+    if not match:
+        return None
+    unit = match.group(2).strip()
+    # a sum needs the whole expression ("1 h + 30 min"), and "2 * 3 m" is not a unit
+    if not unit or unit[0] in "*/^)·" or re.search(r"[-+\d]", re.sub(r"\^\s*-?\s*\d+", "", unit)):
+        return None
+    return _number(match.group(1)), unit
+
+
+def _result(expression: str, magnitude: Fraction, unit: str, dims: Dims,
+            factor: Optional[Fraction] = None) -> Dict[str, Any]:
+    try:
+        value: Optional[float] = float(magnitude)
+    except OverflowError:
+        value = None
+    result = {"expression": expression, "value": value, "unit": unit, "dimension": describe(dims)}
+    exact = exact_string(magnitude)
+    if exact is not None:
+        result["exact"] = exact
+    if factor is not None:
+        result["factor"] = exact_string(factor) or float(factor)
+    return result
+
+
+def _convert_temperature(expression: str, to: str, affine: Optional[Tuple[Fraction, str]]) -> Dict[str, Any]:
+    if affine is not None:
+        value, unit = affine
+        offset, scale = AFFINE_UNITS[unit]
+        kelvin = Quantity((value + offset) * scale, UNITS["K"].dims)
+    else:
+        kelvin = parse(expression)
+    if kelvin.dims != UNITS["K"].dims:
+        raise ValueError(f"Cannot convert {describe(kelvin.dims)} to temperature")
+    if to in AFFINE_UNITS:
+        offset, scale = AFFINE_UNITS[to]
+        return _result(expression, kelvin.magnitude / scale - offset, to, kelvin.dims)
+    target = parse(to or "K")
+    if target.dims != kelvin.dims:
+        raise ValueError(f"Cannot convert temperature to {describe(target.dims)}")
+    return _result(expression, kelvin.magnitude / target.magnitude, to or "K", kelvin.dims)
+
+
+def convert(expression: str, to: Optional[str] = None) -> Dict[str, Any]:
+    """Evaluate a unit expression and express it in `to` (default: SI base units)"""
+    to = (to or "").strip()
+    affine = _affine(expression)
+    if affine is not None or to in AFFINE_UNITS:
+        return _convert_temperature(expression, to, affine)
+
+    split = _split(expression) if to else None
+    if split is not None:
+        # number x cached factor, so "40 Gbit/s" and "100 Gbit/s" share one entry
+        number, unit = split
+        factor = conversion_factor(unit, to)
+        return _result(expression, number * factor, to, parse(to).dims, factor)
+
+    quantity = parse(expression)
+    if not to:
+        return _result(expression, quantity.magnitude, base_formula(quantity.dims), quantity.dims)
+    target = parse(to)
+    if quantity.dims != target.dims:
+        raise ValueError(f"Cannot convert {describe(quantity.dims)} to {describe(target.dims)}")
+    return _result(expression, quantity.magnitude / target.magnitude, to, quantity.dims)
+
+
+def catalog() -> Dict[str, Any]:
+    """Units grouped by dimension, the prefixes they take, and cache counters"""
+    by_dimension: Dict[str, List[str]] = {}
+    for names, _, _ in DEFINITIONS:
+        by_dimension.setdefault(describe(UNITS[names[0]].dims), []).extend(names)
+    by_dimension.setdefault(describe(UNITS["K"].dims), []).extend(AFFINE_UNITS)
+    info = parse.cache_info(), conversion_factor.cache_info()
+    return {
+        "units": by_dimension,
+        "si_prefixes": list(SI_PREFIXES),
+        "iec_prefixes": list(IEC_PREFIXES),
+        "prefixable": {"si": [u for u, p in PREFIXABLE.items() if p == "si"],
+                       "si_and_iec": [u for u, p in PREFIXABLE.items() if p == "data"]},
+        "cache": {name: {"hits": i.hits, "misses": i.misses, "size": i.currsize}
+                  for name, i in zip(("expressions", "factors"), info)},
+    }
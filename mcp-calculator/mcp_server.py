@@ -1,6 +1,19 @@
 from mcp.server.fastmcp import FastMCP
+import os
 import sys
 import math
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import calc_batch
+import calc_cache
+import calc_calculus
+import calc_combinatorics
+import calc_expr
+import calc_linalg
+import calc_precision
+import calc_stats
+import calc_units
 
 # instantiate an MCP server client
 mcp = FastMCP(
@@ -9,36 +22,55 @@ mcp = FastMCP(
     version="1.0.0"
 )
 
+# opt-in memoization of the pure tools: CALC_CACHE_SIZE entries (0 disables)
+result_cache = calc_cache.ResultCache(int(os.environ.get("CALC_CACHE_SIZE", "0")))
+cached = result_cache.memoize
+
 #addition tool
 @mcp.tool()
-def add(a: float, b: float) -> float:
-    """Add two numbers"""
+@cached
+def add(a: float, b: float, precision: int = 0) -> Union[float, str]:
+    """Add two numbers (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("add", a, b, precision)
     return float(a + b)
 
 # subtraction tool
 @mcp.tool()
-def subtract(a: float, b: float) -> float:
-    """Subtract two numbers"""
+@cached
+def subtract(a: float, b: float, precision: int = 0) -> Union[float, str]:
+    """Subtract two numbers (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("subtract", a, b, precision)
     return float(a - b)
 
 # multiplication tool
 @mcp.tool()
-def multiply(a: float, b: float) -> float:
-    """Multiply two numbers"""
+@cached
+def multiply(a: float, b: float, precision: int = 0) -> Union[float, str]:
+    """Multiply two numbers (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("multiply", a, b, precision)
     return float(a * b)
 
 #  division tool
 @mcp.tool() 
-def divide(a: float, b: float) -> float:
-    """Divide two numbers"""
+@cached
+def divide(a: float, b: float, precision: int = 0) -> Union[float, str]:
+    """Divide two numbers (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("divide", a, b, precision)
     if b == 0:
         raise ValueError("Cannot divide by zero")
     return float(a / b)
 
 # power tool
 @mcp.tool()
-def power(a: float, b: float) -> float:
-    """Power of two numbers"""
+@cached
+def power(a: float, b: float, precision: int = 0) -> Union[float, str]:
+    """Power of two numbers (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("power", a, b, precision)
     try:
         return float(a ** b)
     except OverflowError:
@@ -46,63 +78,275 @@ def power(a: float, b: float) -> float:
 
 # square root tool
 @mcp.tool()
-def sqrt(a: float) -> float:
-    """Square root of a number"""
+@cached
+def sqrt(a: float, precision: int = 0) -> Union[float, str]:
+    """Square root of a number (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("sqrt", a, None, precision)
     if a < 0:
         raise ValueError("Cannot calculate square root of negative number")
     return float(a ** 0.5)
 
 # cube root tool
 @mcp.tool()
-def cbrt(a: float) -> float:
-    """Cube root of a number"""
+@cached
+def cbrt(a: float, precision: int = 0) -> Union[float, str]:
+    """Cube root of a number (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("cbrt", a, None, precision)
     return float(abs(a) ** (1/3)) * (-1 if a < 0 else 1)
 
 # factorial tool
 @mcp.tool()
+@cached
 def factorial(a: int) -> int:
     """factorial of a number"""
     if not isinstance(a, int) or a < 0:
         raise ValueError("Factorial requires a non-negative integer")
-    return int(math.factorial(a))
+    if math.lgamma(a + 1) / math.log(10) >= calc_combinatorics.MAX_EXACT_DIGITS:
+        raise ValueError(f"{a}! has more than {calc_combinatorics.MAX_EXACT_DIGITS} digits; "
+                         f"use the combinatorics tool for its digit count, leading/trailing digits or a modulus")
+    return calc_combinatorics.factorial(a)
 
 # log tool
 @mcp.tool()
-def log(a: float) -> float:
-    """log of a number"""
+@cached
+def log(a: float, precision: int = 0) -> Union[float, str]:
+    """log of a number (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("log", a, None, precision)
     if a <= 0:
         raise ValueError("Cannot calculate logarithm of non-positive number")
     return float(math.log(a))
 
 # remainder tool
 @mcp.tool()
-def remainder(a: float, b: float) -> float:
-    """remainder of two numbers division"""
+@cached
+def remainder(a: float, b: float, precision: int = 0) -> Union[float, str]:
+    """remainder of two numbers division (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("remainder", a, b, precision)
     if b == 0:
         raise ValueError("Cannot calculate remainder with zero divisor")
     return float(a % b)
 
 # sin tool
 @mcp.tool()
-def sin(a: float) -> float:
-    """sin of a number"""
+@cached
+def sin(a: float, precision: int = 0) -> Union[float, str]:
+    """sin of a number (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("sin", a, None, precision)
     return float(math.sin(math.radians(a)))
 
 # cos tool
 @mcp.tool()
-def cos(a: float) -> float:
-    """cos of a number"""
+@cached
+def cos(a: float, precision: int = 0) -> Union[float, str]:
+    """cos of a number (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("cos", a, None, precision)
     return float(math.cos(math.radians(a)))
 
 # tan tool
 @mcp.tool()
-def tan(a: float) -> float:
-    """tan of a number"""
+@cached
+def tan(a: float, precision: int = 0) -> Union[float, str]:
+    """tan of a number (precision > 0: decimal string with that many significant digits)"""
+    if precision:
+        return calc_precision.compute("tan", a, None, precision)
     angle = math.radians(a)
     if math.cos(angle) == 0:
         raise ValueError("Tangent undefined at this angle")
     return float(math.tan(angle))
 
+# batch evaluation tool
+@mcp.tool()
+@cached
+def batch_eval(operation: str, a: List[float], b: Optional[List[float]] = None) -> Dict[str, Any]:
+    """Apply one calculator operation element-wise to lists of numbers in a single call.
+
+    operation is one of add, subtract, multiply, divide, power, remainder, sqrt,
+    cbrt, factorial, log, sin, cos, tan (trig in degrees). Two-operand operations
+    take b; a one-element list is repeated for every element of the other list.
+    Elements with a domain error (e.g. log of a negative number, division by
+    zero) or overflow come back as null, are flagged in error_mask and listed
+    by index under errors; the rest of the batch is still computed.
+    """
+    return calc_batch.evaluate(operation, a, b)
+
+# expression evaluation tool
+@mcp.tool()
+@cached
+def evaluate(expression: str, variables: Optional[Dict[str, Union[float, List[float]]]] = None) -> Dict[str, Any]:
+    """Evaluate a whole expression in one call, e.g. sqrt(3^2+4^2)*sin(30)
+
+    Supports + - * / % ^ (or **), parentheses, the constants pi, e and tau, and the
+    functions add, subtract, multiply, divide, power, remainder, sqrt, cbrt,
+    factorial, log, sin, cos, tan (trig in degrees). Other names are variables
+    taken from `variables`, e.g. {"x": 2}. If any variable is a list, the
+    expression is evaluated for every element (single numbers are repeated) and
+    domain errors are masked per element as in batch_eval.
+    """
+    return calc_expr.evaluate(expression, variables)
+
+# combinatorics tool
+@mcp.tool()
+@cached
+def combinatorics(function: str, n: float, k: Optional[int] = None, output: str = "auto",
+                  modulus: Optional[int] = None, max_digits: int = 100, digits: int = 20) -> Dict[str, Any]:
+    """Factorial, nCr, nPr and the gamma function, with bounded output for huge results
+
+    Args:
+        function: factorial (n!), comb (n choose k), perm (n permute k), gamma or lgamma (real n)
+        n: Non-negative integer (any real number for gamma/lgamma)
+        k: Second argument for comb and perm
+        output: auto (exact if at most max_digits digits, otherwise a summary), exact
+            (up to 4000 digits), summary (digit count, log10, leading/trailing digits,
+            trailing zeros) or mod (result modulo `modulus`)
+        modulus: Modulus for output=mod
+        max_digits: Largest result returned in full by output=auto
+        digits: Number of leading/trailing digits in a summary (max 50)
+    """
+    return calc_combinatorics.compute(function, n, k, output, modulus, max_digits, digits)
+
+# statistics tools
+@mcp.tool()
+@cached
+def statistics(data: List[float], quantiles: Optional[List[float]] = None, bins: int = 0) -> Dict[str, Any]:
+    """Descriptive statistics of a list of numbers in one call
+
+    Returns count, sum, mean, variance, std, min, max, median and quantiles
+    (default 0.25, 0.5, 0.75). Set bins to also get a histogram.
+    """
+    return calc_stats.describe(data, quantiles, bins)
+
+@mcp.tool()
+@cached
+def linear_regression(x: List[float], y: List[float]) -> Dict[str, Any]:
+    """Least-squares line y = slope * x + intercept, with r, r squared and standard errors"""
+    return calc_stats.regression(x, y)
+
+@mcp.tool()
+@cached
+def correlation(x: List[float], y: List[float], method: str = "pearson") -> Dict[str, Any]:
+    """Correlation coefficient of two equal-length lists (method: pearson or spearman)"""
+    return calc_stats.correlation(x, y, method)
+
+# running statistics over data sent in chunks
+stat_streams = calc_stats.StreamRegistry()
+
+@mcp.tool()
+def stats_stream(stream_id: str, data: List[float], y: Optional[List[float]] = None,
+                 finish: bool = False, quantiles: Optional[List[float]] = None) -> Dict[str, Any]:
+    """Add a chunk of values to a named running statistic, for datasets too large for one call
+
+    Returns the running count, mean, variance, min and max (plus the regression
+    of y on data when y chunks are given). Pass finish=True with the last chunk
+    (data may be empty) to get the median and quantiles and close the stream.
+    """
+    if not data:
+        if not finish:
+            raise ValueError("No data given")
+        return stat_streams.finish(stream_id, quantiles)
+    result = stat_streams.add(stream_id, data, y)
+    if finish:
+        return stat_streams.finish(stream_id, quantiles)
+    return result
+
+# high-precision constants tool
+@mcp.tool()
+@cached
+def constant(name: str, precision: int = 50) -> str:
+    """Value of pi, e, ln2 or ln10 to the given number of significant digits (max 1000)"""
+    if name not in calc_precision.CONSTANTS:
+        raise ValueError(f"Unknown constant '{name}'. Choose from: {', '.join(calc_precision.CONSTANTS)}")
+    if precision < 1 or precision > calc_precision.MAX_PRECISION:
+        raise ValueError(f"precision must be between 1 and {calc_precision.MAX_PRECISION} digits")
+    return str(calc_precision.CONSTANTS[name](precision))
+
+# linear algebra tool
+@mcp.tool()
+@cached
+def linear_algebra(operation: str, a: List[float], a_shape: Optional[List[int]] = None,
+                   b: Optional[List[float]] = None, b_shape: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Matrix operations: matmul, solve, inverse, determinant, eigenvalues, lstsq (least squares)
+
+    Matrices are flat row-major lists with a shape, e.g. a=[1, 2, 3, 4], a_shape=[2, 2].
+    A square a may omit its shape; b without a shape is a vector.
+
+    Args:
+        operation: matmul (a @ b), solve (x in a x = b), inverse (of a), determinant (of a),
+            eigenvalues (of a) or lstsq (x minimising |a x - b|)
+        a: First matrix, row-major
+        a_shape: [rows, columns] of a
+        b: Second matrix or right-hand side, row-major
+        b_shape: [rows, columns] of b
+    Matrix results are returned as shape + row-major data, with parse and compute times.
+    """
+    return calc_linalg.compute(operation, a, a_shape, b, b_shape)
+
+# unit conversion tool
+@mcp.tool()
+@cached
+def convert_units(expression: str, to: Optional[str] = None) -> Dict[str, Any]:
+    """Evaluate a quantity with units and convert it, with exact conversion factors
+
+    Args:
+        expression: Numbers and units, e.g. "40 Gbit/s", "3 h * 40 Gbit/s",
+            "1 TiB / (100 MB/s)" or "100 degC". SI, IEC (KiB, MiB, GiB, ...) and
+            data units (bit, B, bps), time units and common non-SI units are known.
+        to: Target unit, e.g. "GiB/s"; defaults to SI base units
+    Returns the value, its exact decimal or fraction, the dimension, and the
+    conversion factor when the expression is "number unit". Converting between
+    different dimensions (e.g. m to s) is an error.
+    """
+    return calc_units.convert(expression, to)
+
+# calculus tools
+@mcp.tool()
+@cached
+def integrate(expression: str, lower: float, upper: float, variable: str = "x", tolerance: float = 1e-10,
+              parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Definite integral of an expression by adaptive Gauss-Kronrod quadrature
+
+    Args:
+        expression: Function of one variable in evaluate syntax, e.g. "x^2 * sqrt(x)".
+            Trig functions take degrees, as everywhere in this calculator.
+        lower: Lower bound ("-inf" allowed)
+        upper: Upper bound ("inf" allowed)
+        variable: Name of the integration variable
+        tolerance: Target absolute/relative error
+        parameters: Values for other names in the expression, e.g. {"k": 2}
+    Returns the integral, an error estimate, the number of function evaluations and
+    whether the tolerance was reached.
+    """
+    return calc_calculus.integrate(expression, lower, upper, variable, tolerance, parameters)
+
+@mcp.tool()
+@cached
+def find_root(expression: str, lower: float, upper: float, variable: str = "x", tolerance: float = 1e-12,
+              samples: int = 100, parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Solve f(x) = 0 on [lower, upper] with Brent's method
+
+    The interval is scanned at `samples` points for sign changes and each one is
+    refined, so all roots are returned, smallest first. "x^3 = 2*x + 5" style
+    equations are accepted. Returns the roots and the number of function evaluations.
+    """
+    return calc_calculus.find_root(expression, lower, upper, variable, tolerance, samples, parameters)
+
+@mcp.tool()
+@cached
+def minimize(expression: str, lower: float, upper: float, variable: str = "x", tolerance: float = 1e-10,
+             samples: int = 100, maximize: bool = False,
+             parameters: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Minimum (or maximum with maximize=True) of f on [lower, upper]
+
+    A scan at `samples` points picks the best region, then Brent's bounded
+    minimization refines it. Returns x, f(x) and the number of function evaluations.
+    """
+    return calc_calculus.minimize(expression, lower, upper, variable, tolerance, samples, maximize, parameters)
+
 # DEFINE RESOURCES
 
 # Add a dynamic greeting resource
@@ -110,10 +354,31 @@ def tan(a: float) -> float:
 def get_greeting(name: str) -> str:
     """Get a personalized greeting"""
     return f"Hello, {name}!"
+
+@mcp.resource("precision://constants")
+def get_precision_constants() -> str:
+    """Get the cached high-precision constants and their hit counts"""
+    return json.dumps(calc_precision.constants_status(), indent=2)
+
+@mcp.resource("stats://streams")
+def get_stat_streams() -> str:
+    """Get the open running-statistics streams"""
+    return json.dumps(stat_streams.status(), indent=2)
+
+@mcp.resource("units://catalog")
+def get_unit_catalog() -> str:
+    """Get the known units by dimension, the prefixes they accept and cache counters"""
+    return json.dumps(calc_units.catalog(), indent=2)
+
+@mcp.resource("cache://results")
+def get_result_cache() -> str:
+    """Get the result cache size and hit/miss counters per tool"""
+    return json.dumps(result_cache.status(), indent=2)
     
 # execute and return the output
 if __name__ == "__main__":
-    print("Scientific Calculator MCP Server is starting up...")
+    # Status messages go to stderr: with STDIO, stdout carries the MCP messages
+    print("Scientific Calculator MCP Server is starting up...", file=sys.stderr)
     
     # Check if we should run with STDIO (for MCP client) or SSE (for web)
     transport = "stdio"  # Default to STDIO for MCP client compatibility
@@ -121,16 +386,18 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == "--sse":
         transport = "sse"
-        port = 3001
-        print(f"Server will be available on port {port}")
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 3001
+        print(f"Server will be available on port {port}", file=sys.stderr)
     else:
-        print("Server will use STDIO transport for MCP client")
+        print("Server will use STDIO transport for MCP client", file=sys.stderr)
     
     try:
         if transport == "sse":
-            mcp.run(transport="sse", port=port)
+            # FastMCP takes the port from its settings, not from run()
+            mcp.settings.port = port
+            mcp.run(transport="sse")
         else:
             mcp.run(transport="stdio")
     except Exception as e:
-        print(f"Error starting server: {e}")
+        print(f"Error starting server: {e}", file=sys.stderr)
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Regression checks for calc_linalg. Run with: python -m pytest test_calc_linalg.py
+"""
+import pytest
+
+import calc_linalg
+
+
+def test_matmul():
+    result = calc_linalg.compute("matmul", [1, 2, 3, 4], [2, 2], [5, 6], [2])
+    assert result["shape"] == [2]
+    assert result["data"] == [17.0, 39.0]
+
+
+def test_outer_product_over_limit_is_rejected():
+    n = 20000   # each input is small, the 20000x20000 product is not
+    with pytest.raises(ValueError, match="product would have 400000000 elements"):
+        calc_linalg.compute("matmul", [1.0] * n, [n, 1], [1.0] * n, [1, n])
+
+
+def test_outer_product_at_limit_is_allowed():
+    result = calc_linalg.compute("matmul", [1.0] * 2000, [2000, 1], [2.0] * 2000, [1, 2000])
+    assert result["shape"] == [2000, 2000]
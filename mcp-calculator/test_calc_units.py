@@ -0,0 +1,34 @@
+"""
+Regression checks for calc_units. Run with: python -m pytest test_calc_units.py
+"""
+import time
+
+import pytest
+
+import calc_units
+
+
+def test_data_rate_is_exact():
+    result = calc_units.convert("40 Gbit/s", "GiB/s")
+    assert result["exact"] == "4.656612873077392578125"
+
+
+@pytest.mark.parametrize("expression", [
+    "1e100000000 m",
+    "1e100000000 degC",
+    "(((10^100)^100)^100)^100 m",
+    "(10^100)^100 m",
+    "(10^100)^7 * (10^100)^7 m",
+    "1 / (10^100)^20 m",
+])
+def test_huge_magnitudes_are_rejected_quickly(expression):
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match="out of range|too large"):
+        calc_units.convert(expression, "km")
+    assert time.perf_counter() - started < 1.0
+
+
+def test_large_but_allowed_magnitude():
+    result = calc_units.convert("(10^100)^10 m", "km")
+    assert result["value"] is None
+    assert "exact" not in result
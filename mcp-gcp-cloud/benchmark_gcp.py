@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark the GCP MCP server tools against the offline fake backend.
+
+Runs each tool function from gcp_server.py through its real code path against
+a synthetic project (see gcp_fake.py) and reports latency, API calls, peak
+memory and response size per tool call. Each fleet scale runs in a fresh
+process so memory figures don't carry over. No GCP project or network access
+is needed.
+
+A scale of N means N instances, N/10 buckets and N/10 Cloud Functions.
+
+Examples:
+    python3 benchmark_gcp.py
+    python3 benchmark_gcp.py --scales 1000 --latency-ms 20 --iterations 5
+    python3 benchmark_gcp.py --tools list_all_compute_instances,get_storage_bucket_stats
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+CPU_METRIC = "compute.googleapis.com/instance/cpu/utilization"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark GCP MCP tools against a synthetic project")
+    parser.add_argument("--scales", default="10,1000,50000", help="Comma-separated fleet sizes (instances)")
+    parser.add_argument("--objects-per-bucket", type=int, default=200, help="Objects in each bucket")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Injected latency per API call / page")
+    parser.add_argument("--operation-seconds", type=float, default=0.5, help="Time for start/stop operations to finish")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed calls per tool after the cold call")
+    parser.add_argument("--tools", default="", help="Comma-separated subset of tools to run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--scale", type=int, help=argparse.SUPPRESS)  # run one scale in this process
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scale(args, scale):
+    # The backend is chosen when gcp_server is imported
+    os.environ.update({
+        "GCP_BACKEND": "fake",
+        "GCP_FAKE_INSTANCES": str(scale),
+        "GCP_FAKE_BUCKETS": str(max(1, scale // 10)),
+        "GCP_FAKE_FUNCTIONS": str(max(1, scale // 10)),
+        "GCP_FAKE_OBJECTS_PER_BUCKET": str(args.objects_per_bucket),
+        "GCP_FAKE_LATENCY_MS": str(args.latency_ms),
+        "GCP_FAKE_OPERATION_SECONDS": str(args.operation_seconds),
+    })
+    import logging
+    logging.disable(logging.WARNING)
+    started = time.perf_counter()
+    import gcp_server
+    backend = gcp_server.fake_backend
+    fleet = backend.fleet
+    setup_ms = (time.perf_counter() - started) * 1000
+    gcp_server.operations.poll_interval = 0.25
+
+    # Pick arguments that exist in the generated fleet
+    busiest_zone = max(fleet.instances, key=lambda z: len(fleet.instances[z]))
+    names = [i.name for zone in fleet.zones for i in fleet.instances[zone]]
+    some_instances = ",".join(names[:10])
+    busiest_region = max(fleet.functions, key=lambda r: len(fleet.functions[r]))
+    first_bucket = fleet.buckets[0].name
+
+    tools = [
+        ("list_compute_instances", lambda: gcp_server.list_compute_instances(zone=busiest_zone)),
+        ("list_all_compute_instances", gcp_server.list_all_compute_instances),
+        ("list_all_compute_instances[running]", lambda: gcp_server.list_all_compute_instances(status="RUNNING")),
+        ("start_compute_instance[no zone]", lambda: gcp_server.start_compute_instance(names[-1])),
+        ("bulk_stop_compute_instances[10]", lambda: gcp_server.bulk_stop_compute_instances(some_instances, wait_seconds=30)),
+        ("list_storage_buckets", gcp_server.list_storage_buckets),
+        ("get_storage_bucket_stats", gcp_server.get_storage_bucket_stats),
+        ("get_storage_bucket_objects", lambda: gcp_server.get_storage_bucket_objects(first_bucket, max_results=100)),
+        ("list_cloud_functions", lambda: gcp_server.list_cloud_functions(location=busiest_region)),
+        ("get_monitoring_metrics", lambda: gcp_server.get_monitoring_metrics(CPU_METRIC)),
+        ("get_monitoring_metrics[zone mean]", lambda: gcp_server.get_monitoring_metrics(
+            CPU_METRIC, hours=24, alignment_period_minutes=60, reducer="mean", group_by="resource.labels.zone")),
+    ]
+    if args.tools:
+        wanted = set(args.tools.split(","))
+        tools = [t for t in tools if t[0] in wanted or t[0].split("[")[0] in wanted]
+
+    results = []
+    for name, call in tools:
+        backend.reset_counters()
+        started = time.perf_counter()
+        response = call()
+        cold_ms = (time.perf_counter() - started) * 1000
+        cold_calls = sum(backend.calls.values())
+
+        backend.reset_counters()
+        latencies = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            response = call()
+            latencies.append((time.perf_counter() - started) * 1000)
+        warm_calls = sum(backend.calls.values()) / max(1, args.iterations)
+
+        # Peak Python allocations of one more call; traced separately since tracing slows calls down
+        tracemalloc.start()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({
+            "tool": name,
+            "cold_ms": round(cold_ms, 1),
+            "cold_api_calls": cold_calls,
+            "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+            "api_calls_per_call": round(warm_calls, 1),
+            "peak_mib": round(peak / 2**20, 2),
+            "response_bytes": len(json.dumps(response, default=str)),
+            "error": response.get("error") if isinstance(response, dict) else None,
+        })
+
+    return {
+        "scale": scale,
+        "instances": sum(len(v) for v in fleet.instances.values()),
+        "buckets": len(fleet.buckets),
+        "functions": sum(len(v) for v in fleet.functions.values()),
+        "setup_ms": round(setup_ms, 1),
+        # ru_maxrss is KiB on Linux
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "results": results,
+    }
+
+
+def main():
+    args = parse_args()
+    if args.scale is not None:
+        print(json.dumps(run_scale(args, args.scale)))
+        return
+
+    runs = []
+    for scale in [int(s) for s in args.scales.split(",")]:
+        command = [sys.executable, os.path.abspath(__file__), "--scale", str(scale),
+                   "--objects-per-bucket", str(args.objects_per_bucket), "--latency-ms", str(args.latency_ms),
+                   "--operation-seconds", str(args.operation_seconds), "--iterations", str(args.iterations)]
+        if args.tools:
+            command += ["--tools", args.tools]
+        completed = subprocess.run(command, capture_output=True, text=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+        if completed.returncode != 0:
+            print(f"❌ Scale {scale} failed:\n{completed.stderr[-2000:]}")
+            sys.exit(1)
+        # Server logging may share stdout; the report is the last line
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps({"settings": vars(args), "runs": runs}, indent=2))
+        return
+
+    print(f"🧪 GCP MCP benchmark: latency {args.latency_ms} ms/call, {args.objects_per_bucket} objects/bucket, "
+          f"{args.iterations} iterations")
+    for run in runs:
+        print(f"\n📦 {run['instances']} instances, {run['buckets']} buckets, {run['functions']} functions "
+              f"(setup {run['setup_ms']} ms, max RSS {run['max_rss_mib']} MiB)")
+        header = (f"{'tool':<38}{'cold ms':>10}{'cold calls':>11}{'p50 ms':>10}{'p95 ms':>10}"
+                  f"{'calls':>8}{'peak MiB':>10}{'bytes':>11}")
+        print(header)
+        print("-" * len(header))
+        for r in run["results"]:
+            print(f"{r['tool']:<38}{r['cold_ms']:>10}{r['cold_api_calls']:>11}{str(r['p50_ms']):>10}"
+                  f"{str(r['p95_ms']):>10}{r['api_calls_per_call']:>8}{r['peak_mib']:>10}{r['response_bytes']:>11}")
+            if r["error"]:
+                print(f"  ⚠️ {r['error']}")
+
+
+if __name__ == "__main__":
+    main()
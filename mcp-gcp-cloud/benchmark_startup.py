@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the GCP MCP server.
+
+Each run starts a fresh interpreter, so nothing is shared between runs:
+
+- import:    time to import gcp_server (module-level setup, no credentials needed)
+- eager:     the same, with every google.cloud client library imported up front,
+             i.e. what startup cost before the libraries were imported lazily
+- handshake: spawn `gcp_server.py` over stdio and time until it answers the MCP
+             initialize request (needs GCP credentials, like the server itself)
+
+Examples:
+    python3 benchmark_startup.py
+    python3 benchmark_startup.py --runs 10 --modes import,eager,handshake
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+EAGER_MODULES = [
+    "google.cloud.compute_v1",
+    "google.cloud.storage",
+    "google.cloud.functions_v1",
+    "google.cloud.monitoring_v3",
+]
+
+IMPORT_SNIPPET = """
+import time, json
+started = time.perf_counter()
+for name in {eager!r}:
+    __import__(name)
+import gcp_server
+print(json.dumps({{"total_ms": (time.perf_counter() - started) * 1000, **gcp_server.startup_timings}}))
+"""
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "benchmark_startup", "version": "1.0.0"},
+    },
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure GCP MCP server cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--modes", default="import,eager", help="Comma-separated: import, eager, handshake")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for one run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def run_import(eager: bool, timeout: float) -> float:
+    snippet = IMPORT_SNIPPET.format(eager=EAGER_MODULES if eager else [])
+    output = subprocess.run([sys.executable, "-c", snippet], cwd=HERE, capture_output=True,
+                            text=True, timeout=timeout, check=True).stdout
+    # Server logging also goes to stdout; the report is the last line
+    return json.loads(output.strip().splitlines()[-1])["total_ms"]
+
+
+def run_handshake(timeout: float) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "gcp_server.py"], cwd=HERE, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        process.stdin.write(json.dumps(INITIALIZE) + "\n")
+        process.stdin.flush()
+        while time.perf_counter() - started < timeout:
+            line = process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"server exited with code {process.wait()} before answering initialize")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue  # log line
+            if message.get("id") == 1:
+                if "error" in message:
+                    raise RuntimeError(message["error"].get("message", "initialize failed"))
+                return (time.perf_counter() - started) * 1000
+        raise RuntimeError("timed out waiting for initialize response")
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main():
+    args = parse_args()
+    runners = {
+        "import": lambda: run_import(False, args.timeout),
+        "eager": lambda: run_import(True, args.timeout),
+        "handshake": lambda: run_handshake(args.timeout),
+    }
+
+    results = []
+    for mode in args.modes.split(","):
+        timings, error = [], None
+        try:
+            for _ in range(args.runs):
+                timings.append(runners[mode]())
+        except (RuntimeError, subprocess.SubprocessError) as e:
+            error = str(e).strip().splitlines()[-1] if str(e).strip() else type(e).__name__
+        results.append({
+            "mode": mode,
+            "runs": len(timings),
+            "min_ms": round(min(timings), 1) if timings else None,
+            "median_ms": round(statistics.median(timings), 1) if timings else None,
+            "max_ms": round(max(timings), 1) if timings else None,
+            "error": error,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"🚀 GCP MCP server cold start, {args.runs} fresh interpreters per mode\n")
+    header = f"{'mode':<12}{'runs':>6}{'min ms':>10}{'median ms':>12}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['mode']:<12}{r['runs']:>6}{str(r['min_ms']):>10}{str(r['median_ms']):>12}{str(r['max_ms']):>10}")
+        if r["error"]:
+            print(f"  ⚠️ {r['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Billing export analytics for the GCP MCP server.
+
+Reads a Cloud Billing export (the BigQuery export dumped to CSV or Parquet
+files) into a columnar table: day ordinals, cost and credit arrays, and
+dictionary-encoded service / SKU / project / region / labels columns. Each
+export file is parsed once and cached next to the other server caches as a
+compressed .npz keyed by path, size and mtime, so repeated questions and
+newly added daily shards only pay for files that changed. Group-by, top-N,
+trend and anomaly queries are NumPy reductions over those columns.
+"""
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp-gcp-cloud")
+CACHE_VERSION = 1
+
+# Export column names, first match wins: the BigQuery schema flattened with
+# dots (CSV export / pyarrow flatten) and common snake_case query aliases
+COLUMN_ALIASES = {
+    "day": ["usage_start_time", "usage_date", "day", "date"],
+    "cost": ["cost"],
+    "credits": ["credits", "credits_amount", "credits.amount"],
+    "currency": ["currency"],
+    "service": ["service.description", "service_description", "service"],
+    "sku": ["sku.description", "sku_description", "sku"],
+    "project": ["project.id", "project_id", "project"],
+    "region": ["location.region", "location_region", "region"],
+    "labels": ["labels"],
+}
+DIMENSIONS = ("service", "sku", "project", "region", "labels")
+GROUP_BY_CHOICES = ("service", "sku", "project", "region", "day", "label:<key>")
+
+
+def _find_columns(names: List[str]) -> Dict[str, str]:
+    found = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in names:
+                found[column] = alias
+                break
+    missing = [c for c in ("day", "cost") if c not in found]
+    if missing:
+        raise ValueError(f"Billing export has no {' or '.join(missing)} column (columns: {', '.join(names[:20])})")
+    return found
+
+
+def _credit_total(raw, memo: Dict[str, float]) -> float:
+    """Credits are a number, or the exported JSON list of {name, amount}"""
+    if raw is None or raw == "":
+        return 0.0
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    if isinstance(raw, list):
+        return float(sum(c.get("amount", 0) or 0 for c in raw))
+    value = memo.get(raw)
+    if value is None:
+        try:
+            value = float(raw)
+        except ValueError:
+            try:
+                value = float(sum(c.get("amount", 0) or 0 for c in json.loads(raw)))
+            except (ValueError, TypeError, AttributeError):
+                value = 0.0
+        memo[raw] = value
+    return value
+
+
+def _labels_key(raw) -> str:
+    """Canonical labels string: exported JSON list of {key, value} pairs or a dict"""
+    if raw is None or raw == "" or raw == "[]":
+        return ""
+    if isinstance(raw, str):
+        return raw
+    return json.dumps(raw, sort_keys=True, default=str)
+
+
+class BillingTable:
+    """Columnar billing line items; dimensions are dictionary-encoded"""
+
+    def __init__(self, day: np.ndarray, cost: np.ndarray, credits: np.ndarray,
+                 dims: Dict[str, Tuple[np.ndarray, List[str]]], currency: str = ""):
+        self.day = day            # int32 date ordinals
+        self.cost = cost          # float64
+        self.credits = credits    # float64 (negative)
+        self.dims = dims          # name -> (int32 codes, values)
+        self.currency = currency
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    # -- building -----------------------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows, names: List[str]) -> "BillingTable":
+        """Build from an iterable of row sequences whose fields are named by names"""
+        columns = {column: names.index(alias) for column, alias in _find_columns(names).items()}
+        days, costs, credits = [], [], []
+        codes = {dim: [] for dim in DIMENSIONS}
+        dictionaries = {dim: {} for dim in DIMENSIONS}
+        day_memo: Dict[str, int] = {}
+        credit_memo: Dict[str, float] = {}
+        currency = ""
+        for row in rows:
+            raw_day = row[columns["day"]]
+            stamp = raw_day if isinstance(raw_day, str) else raw_day.isoformat()
+            ordinal = day_memo.get(stamp[:10])
+            if ordinal is None:
+                ordinal = day_memo[stamp[:10]] = date.fromisoformat(stamp[:10]).toordinal()
+            days.append(ordinal)
+            costs.append(float(row[columns["cost"]] or 0))
+            credits.append(_credit_total(row[columns["credits"]], credit_memo) if "credits" in columns else 0.0)
+            if not currency and "currency" in columns:
+                currency = row[columns["currency"]] or ""
+            for dim in DIMENSIONS:
+                if dim not in columns:
+                    continue
+                value = row[columns[dim]]
+                value = _labels_key(value) if dim == "labels" else ("" if value is None else str(value))
+                mapping = dictionaries[dim]
+                code = mapping.get(value)
+                if code is None:
+                    code = mapping[value] = len(mapping)
+                codes[dim].append(code)
+
+        dims = {
+            dim: (np.asarray(codes[dim], dtype=np.int32), list(dictionaries[dim]))
+            for dim in DIMENSIONS if dim in columns
+        }
+        return cls(np.asarray(days, dtype=np.int32), np.asarray(costs, dtype=np.float64),
+                   np.asarray(credits, dtype=np.float64), dims, currency)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "BillingTable":
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            return cls.from_rows(reader, next(reader, []))
+
+    @classmethod
+    def from_parquet(cls, path: str) -> "BillingTable":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet billing exports needs pyarrow. Run: pip install pyarrow")
+        table = pq.read_table(path).flatten()
+        # Only the columns we use are converted to Python objects
+        names = list(dict.fromkeys(_find_columns(table.column_names).values()))
+        return cls.from_rows(zip(*(table.column(name).to_pylist() for name in names)), names)
+
+    @classmethod
+    def concat(cls, tables: List["BillingTable"]) -> "BillingTable":
+        if len(tables) == 1:
+            return tables[0]
+        dims = {}
+        for dim in DIMENSIONS:
+            if not all(dim in t.dims for t in tables):
+                continue
+            # Re-encode every table's codes against a merged dictionary
+            merged: Dict[str, int] = {}
+            parts = []
+            for t in tables:
+                codes, values = t.dims[dim]
+                remap = np.asarray([merged.setdefault(v, len(merged)) for v in values], dtype=np.int32)
+                parts.append(remap[codes] if len(codes) else codes)
+            dims[dim] = (np.concatenate(parts), list(merged))
+        return cls(np.concatenate([t.day for t in tables]), np.concatenate([t.cost for t in tables]),
+                   np.concatenate([t.credits for t in tables]), dims,
+                   next((t.currency for t in tables if t.currency), ""))
+
+    # -- binary cache -------------------------------------------------------
+
+    def save(self, path: str):
+        arrays = {"day": self.day, "cost": self.cost, "credits": self.credits,
+                  "meta": np.asarray([json.dumps({"version": CACHE_VERSION, "currency": self.currency})])}
+        for dim, (codes, values) in self.dims.items():
+            arrays[f"{dim}_codes"] = codes
+            arrays[f"{dim}_values"] = np.asarray(values, dtype=str)
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BillingTable":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"][0]))
+            if meta.get("version") != CACHE_VERSION:
+                raise ValueError("cache version mismatch")
+            dims = {
+                dim: (data[f"{dim}_codes"], data[f"{dim}_values"].tolist())
+                for dim in DIMENSIONS if f"{dim}_codes" in data
+            }
+            return cls(data["day"], data["cost"], data["credits"], dims, meta.get("currency", ""))
+
+
+class BillingExport:
+    """Parses billing export files once and keeps them as cached columnar tables"""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        # abs path -> (size, mtime_ns, table)
+        self._tables: Dict[str, Tuple[int, int, BillingTable]] = {}
+        self.stats = {"parsed_files": 0, "cache_hits": 0, "parsed_rows": 0}
+
+    @staticmethod
+    def files(path: str) -> List[str]:
+        """Export files for a file, directory or glob pattern"""
+        if os.path.isdir(path):
+            patterns = [os.path.join(path, "*.csv"), os.path.join(path, "*.parquet")]
+        else:
+            patterns = [path]
+        return sorted({os.path.abspath(f) for pattern in patterns for f in glob.glob(os.path.expanduser(pattern))
+                       if os.path.isfile(f)})
+
+    def _cache_path(self, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha1(f"{path}:{size}:{mtime_ns}".encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, "billing", f"{os.path.basename(path)}-{digest}.npz")
+
+    def _table(self, path: str) -> BillingTable:
+        st = os.stat(path)
+        entry = self._tables.get(path)
+        if entry and entry[:2] == (st.st_size, st.st_mtime_ns):
+            return entry[2]
+
+        cache_path = self._cache_path(path, st.st_size, st.st_mtime_ns)
+        table = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                table = BillingTable.load(cache_path)
+                self.stats["cache_hits"] += 1
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable billing cache {cache_path}: {e}")
+        if table is None:
+            if path.endswith(".parquet"):
+                table = BillingTable.from_parquet(path)
+            else:
+                table = BillingTable.from_csv(path)
+            self.stats["parsed_files"] += 1
+            self.stats["parsed_rows"] += len(table)
+            logger.info(f"Parsed billing export {path}: {len(table)} line items")
+            if cache_path:
+                try:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    table.save(cache_path)
+                except OSError as e:
+                    logger.warning(f"Could not write billing cache {cache_path}: {e}")
+        self._tables[path] = (st.st_size, st.st_mtime_ns, table)
+        return table
+
+    def load(self, path: str) -> BillingTable:
+        """Columnar table for every export file under path"""
+        files = self.files(path)
+        if not files:
+            raise FileNotFoundError(f"No billing export files found at {path}")
+        with self._lock:
+            return BillingTable.concat([self._table(f) for f in files])
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "cache_dir": self.cache_dir,
+            "files": {path: {"line_items": len(table)} for path, (_, _, table) in self._tables.items()},
+            **self.stats,
+        }
+
+
+# -- analysis ---------------------------------------------------------------
+
+def _group_codes(table: BillingTable, group_by: str, mask: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """Per-row group codes (restricted to mask) and the group names"""
+    key = group_by.strip()
+    if key.lower() == "day":
+        days = table.day[mask]
+        first = int(days.min()) if len(days) else 0
+        count = int(days.max()) - first + 1 if len(days) else 0
+        return days - first, [date.fromordinal(first + i).isoformat() for i in range(count)]
+    if key.lower().startswith("label:"):
+        label = key[6:]
+        if "labels" not in table.dims:
+            raise ValueError("Billing export has no labels column")
+        codes, values = table.dims["labels"]
+        # Parse each distinct labels string once, not once per row
+        names: Dict[str, int] = {}
+        remap = np.empty(len(values), dtype=np.int32)
+        for i, raw in enumerate(values):
+            value = ""
+            if raw:
+                try:
+                    parsed = json.loads(raw)
+                    pairs = parsed.items() if isinstance(parsed, dict) else ((p.get("key"), p.get("value")) for p in parsed)
+                    value = next((str(v) for k, v in pairs if k == label), "")
+                except (ValueError, AttributeError):
+                    value = ""
+            remap[i] = names.setdefault(value or f"(no {label} label)", len(names))
+        return remap[codes[mask]], list(names)
+    dim = key.lower()
+    if dim not in table.dims:
+        raise ValueError(f"Cannot group by '{group_by}'. Choose from: {', '.join(GROUP_BY_CHOICES)}")
+    codes, values = table.dims[dim]
+    return codes[mask], [v or "(none)" for v in values]
+
+
+def _robust_anomalies(matrix: np.ndarray, window: int, threshold: float) -> List[Tuple[int, int, float, float]]:
+    """(row, day, value, baseline) where value departs from the trailing median by > threshold robust z"""
+    if matrix.shape[1] <= window:
+        return []
+    windows = np.lib.stride_tricks.sliding_window_view(matrix, window, axis=1)[:, :-1]
+    baseline = np.median(windows, axis=2)
+    mad = np.median(np.abs(windows - baseline[..., None]), axis=2) * 1.4826
+    current = matrix[:, window:]
+    # A flat baseline (MAD 0) still flags jumps of more than 10% of it
+    scale = np.maximum(mad, np.maximum(np.abs(baseline) * 0.1, 0.01))
+    z = (current - baseline) / scale
+    rows, cols = np.nonzero(np.abs(z) > threshold)
+    return [(int(r), int(c) + window, float(current[r, c]), float(baseline[r, c])) for r, c in zip(rows, cols)]
+
+
+def analyze(table: BillingTable, days: int = 30, group_by: str = "service", top_n: int = 10,
+            project: str = "", anomaly_window: int = 7, anomaly_threshold: float = 3.5) -> Dict[str, Any]:
+    """Totals, top-N groups, daily trend and anomalies over the last `days` days of the export
+    (at most the span of the export)"""
+    if not len(table):
+        raise ValueError("Billing export is empty")
+    if days < 1:
+        raise ValueError("days must be at least 1")
+    end = int(table.day.max())
+    # a window longer than the export only adds empty days
+    days = min(days, end - int(table.day.min()) + 1)
+    start = end - days + 1
+    mask = table.day >= start
+    if project:
+        if "project" not in table.dims:
+            raise ValueError("Billing export has no project column")
+        codes, values = table.dims["project"]
+        if project not in values:
+            raise ValueError(f"Project {project} does not appear in the billing export")
+        mask &= codes == values.index(project)
+
+    net = table.cost[mask] + table.credits[mask]
+    day_index = table.day[mask] - start
+    group_codes, group_names = _group_codes(table, group_by, mask)
+
+    # Totals per group and per (group, day) in one pass each
+    n_groups = len(group_names)
+    by_group = np.bincount(group_codes, weights=net, minlength=n_groups)
+    by_group_day = np.bincount(group_codes.astype(np.int64) * days + day_index, weights=net,
+                               minlength=n_groups * days).reshape(n_groups, days)
+    daily = by_group_day.sum(axis=0)
+
+    order = np.argsort(by_group)[::-1][:top_n]
+    total = float(net.sum())
+    top = [{
+        "name": group_names[i],
+        "cost": round(float(by_group[i]), 2),
+        "share_pct": round(float(by_group[i]) / total * 100, 1) if total else 0.0,
+    } for i in order if by_group[i] != 0]
+
+    # Trend: least-squares slope of daily cost and first vs second half of the window
+    x = np.arange(days)
+    slope = float(np.polyfit(x, daily, 1)[0]) if days > 1 else 0.0
+    half = days // 2
+    first, second = float(daily[:half].sum()), float(daily[days - half:].sum())
+
+    # Anomalies on the daily total and on each top group
+    series = np.vstack([daily, by_group_day[order]])
+    labels = ["(total)"] + [group_names[i] for i in order]
+    anomalies = [{
+        "day": date.fromordinal(start + d).isoformat(),
+        "group": labels[r],
+        "cost": round(value, 2),
+        "expected": round(baseline, 2),
+        "change_pct": round((value - baseline) / baseline * 100, 1) if baseline else None,
+    } for r, d, value, baseline in _robust_anomalies(series, anomaly_window, anomaly_threshold)]
+    anomalies.sort(key=lambda a: abs(a["cost"] - a["expected"]), reverse=True)
+
+    return {
+        "period": {"start": date.fromordinal(start).isoformat(), "end": date.fromordinal(end).isoformat(),
+                   "days": days},
+        "currency": table.currency,
+        "line_items": int(mask.sum()),
+        "total_cost": round(float(table.cost[mask].sum()), 2),
+        "total_credits": round(float(table.credits[mask].sum()), 2),
+        "net_cost": round(total, 2),
+        "group_by": group_by,
+        "top": top,
+        "trend": {
+            "daily": [round(float(v), 2) for v in daily],
+            "slope_per_day": round(slope, 2),
+            "second_half_vs_first_pct": round((second - first) / first * 100, 1) if first else None,
+        },
+        "anomalies": anomalies[:10],
+    }
@@ -0,0 +1,233 @@
+"""
+Credential cache and client registry for the GCP MCP server.
+
+`google.auth.default()` runs once per process and the resulting access token
+is refreshed in the background before it expires. API clients are created
+once per (service, project) and reused, so tool calls keep their gRPC channels
+and HTTP connection pools instead of paying discovery and TLS setup each time.
+The google.cloud client libraries themselves are imported on first use.
+"""
+import importlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# module name -> import time in ms, for the startup report
+import_timings: Dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    The google.cloud packages load large protobuf descriptor sets; deferring
+    them keeps server startup to the MCP framework itself.
+    """
+
+    def __init__(self, name: str, install_hint: str = ""):
+        self._name = name
+        self._install_hint = install_hint
+        self._module = None
+
+    def _load(self):
+        with _import_lock:
+            if self._module is None:
+                started = time.perf_counter()
+                try:
+                    self._module = importlib.import_module(self._name)
+                except ImportError as e:
+                    hint = f". Run: pip install {self._install_hint}" if self._install_hint else ""
+                    raise ImportError(f"{self._name} is not installed{hint}") from e
+                import_timings[self._name] = round((time.perf_counter() - started) * 1000, 1)
+                logger.info(f"Imported {self._name} in {import_timings[self._name]} ms")
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._module or self._load(), attr)
+
+
+class CredentialCache:
+    """Process-wide cache of google.auth.default() with background token refresh"""
+
+    def __init__(self,
+                 loader: Optional[Callable[[], Tuple[Any, Optional[str]]]] = None,
+                 refresh_margin: float = 300.0,
+                 failure_ttl: float = 30.0):
+        self._loader = loader
+        self.refresh_margin = refresh_margin
+        self.failure_ttl = failure_ttl
+
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._project_id: Optional[str] = None
+        self._error: Optional[str] = None
+        self._failed_at = 0.0
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.timings: Dict[str, Any] = {
+            "discovery_ms": None,
+            "discovered_at": None,
+            "refreshes": 0,
+            "last_refresh_ms": None,
+            "last_refresh": None,
+        }
+
+    def _load(self) -> Tuple[Any, Optional[str]]:
+        if self._loader is not None:
+            return self._loader()
+        import google.auth
+        return google.auth.default()
+
+    def get(self) -> Tuple[Any, Optional[str]]:
+        """Return (credentials, project_id), or (None, None) if unavailable"""
+        if self._credentials is not None:
+            return self._credentials, self._project_id
+
+        with self._lock:
+            if self._credentials is not None:
+                return self._credentials, self._project_id
+            # Don't rerun discovery on every call while credentials are missing
+            if self._error and time.monotonic() - self._failed_at < self.failure_ttl:
+                return None, None
+
+            started = time.perf_counter()
+            try:
+                credentials, project_id = self._load()
+            except Exception as e:
+                self._error = str(e)
+                self._failed_at = time.monotonic()
+                logger.error(f"Failed to establish GCP credentials: {e}")
+                return None, None
+
+            self.timings["discovery_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self.timings["discovered_at"] = _utcnow().isoformat()
+            self._credentials, self._project_id, self._error = credentials, project_id, None
+            logger.info(f"GCP credentials established for project: {project_id}")
+
+        self._start_refresher()
+        return self._credentials, self._project_id
+
+    # -- background refresh -----------------------------------------------
+
+    def refresh(self):
+        """Refresh the access token now"""
+        from google.auth.transport.requests import Request
+
+        started = time.perf_counter()
+        self._credentials.refresh(Request())
+        self.timings["refreshes"] += 1
+        self.timings["last_refresh_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.timings["last_refresh"] = _utcnow().isoformat()
+
+    def _seconds_until_refresh(self) -> float:
+        expiry = getattr(self._credentials, "expiry", None)
+        if expiry is None:
+            # No token fetched yet (or it never expires); fetch one up front
+            return 0.0 if not getattr(self._credentials, "token", None) else float("inf")
+        if expiry.tzinfo is None:
+            # google-auth stores naive UTC datetimes
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return (expiry - _utcnow()).total_seconds() - self.refresh_margin
+
+    def _start_refresher(self):
+        if not hasattr(self._credentials, "refresh"):
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="gcp-credentials-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            wait = self._seconds_until_refresh()
+            if wait == float("inf"):
+                return
+            if wait > 0 and self._stop.wait(wait):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background GCP token refresh failed: {e}")
+                # The transport still refreshes on demand; try again shortly
+                if self._stop.wait(30):
+                    return
+                continue
+            # Tokens shorter-lived than the margin would otherwise spin
+            if self._seconds_until_refresh() <= 0 and self._stop.wait(60):
+                return
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        expiry = getattr(self._credentials, "expiry", None)
+        return {
+            "available": self._credentials is not None,
+            "project_id": self._project_id,
+            "credentials_type": type(self._credentials).__name__ if self._credentials is not None else None,
+            "token_expiry": expiry.isoformat() if expiry else None,
+            "error": self._error,
+            "timings": dict(self.timings),
+        }
+
+
+class ClientRegistry:
+    """Lazily created, shared API clients keyed by (service, project)"""
+
+    def __init__(self, credential_cache: CredentialCache):
+        self._credential_cache = credential_cache
+        self._factories: Dict[str, Callable[[Any, Optional[str]], Any]] = {}
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._created_ms: Dict[Tuple[str, Optional[str]], float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, service: str, factory: Callable[[Any, Optional[str]], Any]):
+        """Register factory(credentials, project) used to build clients for service"""
+        self._factories[service] = factory
+
+    def get(self, service: str, project: Optional[str] = None):
+        """Return the shared client for (service, project), creating it on first use
+
+        Raises RuntimeError when credentials are not available.
+        """
+        key = (service, project)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        credentials, _ = self._credential_cache.get()
+        if credentials is None:
+            raise RuntimeError("Failed to establish GCP credentials")
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                started = time.perf_counter()
+                client = self._factories[service](credentials, project)
+                self._clients[key] = client
+                self._created_ms[key] = round((time.perf_counter() - started) * 1000, 1)
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._created_ms.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            f"{service}:{project or '*'}": {"created_ms": ms}
+            for (service, project), ms in sorted(self._created_ms.items(), key=lambda item: str(item[0]))
+        }
@@ -0,0 +1,557 @@
+"""
+Offline stand-in for the Google Cloud APIs used by gcp_server.py.
+
+FakeBackend hands out fake Compute, Storage, Cloud Functions and Monitoring
+clients with the methods, pagers and response attributes the server reads.
+They serve a synthetic, deterministic fleet with injectable per-call
+latency. Every API call, including each page of a paged listing, is counted.
+Select it with GCP_BACKEND=fake. The fleet is sized with the GCP_FAKE_*
+environment variables (see FakeFleet.from_env).
+"""
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+DEFAULT_ZONES = [
+    "us-central1-a", "us-central1-b", "us-central1-c", "us-east1-b", "us-east1-c",
+    "us-west1-a", "us-west1-b", "europe-west1-b", "europe-west1-c", "europe-west4-a",
+    "asia-east1-a", "asia-southeast1-b",
+]
+MACHINE_TYPES = ["e2-micro", "e2-small", "e2-medium", "n2-standard-2", "n2-standard-4", "c2-standard-8"]
+STATUSES = ["RUNNING"] * 6 + ["TERMINATED"] * 3 + ["STAGING", "STOPPING", "SUSPENDED"]
+RUNTIMES = ["python312", "python311", "nodejs20", "go122", "java21"]
+OBJECT_PREFIXES = ["backups", "data", "exports", "images", "logs", "raw", "tmp", "uploads"]
+ENVIRONMENTS = ["prod", "staging", "dev"]
+
+PAGE_SIZE = 500
+SERIES_PER_PAGE = 100
+
+
+def _not_found(message: str):
+    from google.api_core import exceptions
+    return exceptions.NotFound(message)
+
+
+def _region(zone: str) -> str:
+    return zone.rsplit("-", 1)[0]
+
+
+class FakeFleet:
+    """Synthetic, deterministic GCP project inventory plus latency settings"""
+
+    def __init__(self,
+                 instances: int = 200,
+                 buckets: int = 20,
+                 functions: int = 60,
+                 objects_per_bucket: int = 1000,
+                 zones: Optional[List[str]] = None,
+                 latency_ms: float = 0.0,
+                 operation_seconds: float = 1.0,
+                 project: str = "fake-project",
+                 projects: int = 1,
+                 seed: int = 42):
+        self.zones = zones or list(DEFAULT_ZONES)
+        self.regions = sorted({_region(z) for z in self.zones})
+        self.latency_ms = latency_ms
+        self.operation_seconds = operation_seconds
+        self.objects_per_bucket = objects_per_bucket
+        self.project = project
+        # Extra projects share the same synthetic inventory
+        self.projects = [project] + [f"{project}-{i:03d}" for i in range(1, projects)]
+        self.seed = seed
+
+        rng = random.Random(seed)
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        self.instances: Dict[str, List[SimpleNamespace]] = {z: [] for z in self.zones}
+        self.instance_zone: Dict[str, str] = {}
+        for i in range(instances):
+            zone = self.zones[rng.randrange(len(self.zones))]
+            status = rng.choice(STATUSES)
+            access = [SimpleNamespace(nat_i_p=f"34.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}")] \
+                if status == "RUNNING" and rng.random() < 0.5 else []
+            instance = SimpleNamespace(
+                name=f"fake-vm-{i:06d}",
+                id=zlib.crc32(f"{seed}-{i}".encode()),
+                zone=f"https://www.googleapis.com/compute/v1/projects/{project}/zones/{zone}",
+                status=status,
+                machine_type=f"zones/{zone}/machineTypes/{rng.choice(MACHINE_TYPES)}",
+                creation_timestamp=(created + timedelta(minutes=i)).isoformat(),
+                network_interfaces=[SimpleNamespace(
+                    network_i_p=f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                    access_configs=access,
+                )],
+                tags=SimpleNamespace(items=["http-server"] if rng.random() < 0.3 else []),
+                labels={"env": rng.choice(ENVIRONMENTS)},
+            )
+            self.instances[zone].append(instance)
+            self.instance_zone[instance.name] = zone
+
+        self.buckets = [
+            SimpleNamespace(
+                name=f"fake-bucket-{i:05d}",
+                location=rng.choice(self.regions).upper(),
+                storage_class=rng.choice(["STANDARD", "NEARLINE", "COLDLINE"]),
+                time_created=created + timedelta(hours=i),
+                updated=created + timedelta(hours=i, minutes=5),
+                versioning_enabled=rng.random() < 0.2,
+                labels={"env": rng.choice(ENVIRONMENTS)},
+                # Every tenth bucket is "new": no storage metrics reported yet
+                has_metrics=i % 10 != 0,
+            )
+            for i in range(buckets)
+        ]
+        self.bucket_index = {b.name: b for b in self.buckets}
+
+        self.functions: Dict[str, List[SimpleNamespace]] = {r: [] for r in self.regions}
+        for i in range(functions):
+            region = self.regions[rng.randrange(len(self.regions))]
+            self.functions[region].append(SimpleNamespace(
+                name=f"projects/{project}/locations/{region}/functions/fake-function-{i:05d}",
+                runtime=rng.choice(RUNTIMES),
+                entry_point="main",
+                available_memory_mb=rng.choice([128, 256, 512, 1024]),
+                timeout=timedelta(seconds=rng.choice([60, 120, 540])),
+                status=SimpleNamespace(name="ACTIVE"),
+                update_time=created + timedelta(days=i % 365),
+                labels={"env": rng.choice(ENVIRONMENTS)},
+            ))
+
+    @classmethod
+    def from_env(cls) -> "FakeFleet":
+        """Build a fleet from GCP_FAKE_* environment variables"""
+        zones = os.getenv("GCP_FAKE_ZONES")
+        return cls(
+            instances=int(os.getenv("GCP_FAKE_INSTANCES", "200")),
+            buckets=int(os.getenv("GCP_FAKE_BUCKETS", "20")),
+            functions=int(os.getenv("GCP_FAKE_FUNCTIONS", "60")),
+            objects_per_bucket=int(os.getenv("GCP_FAKE_OBJECTS_PER_BUCKET", "1000")),
+            zones=zones.split(",") if zones else None,
+            latency_ms=float(os.getenv("GCP_FAKE_LATENCY_MS", "0")),
+            operation_seconds=float(os.getenv("GCP_FAKE_OPERATION_SECONDS", "1")),
+            project=os.getenv("GCP_FAKE_PROJECT", "fake-project"),
+            projects=int(os.getenv("GCP_FAKE_PROJECTS", "1")),
+            seed=int(os.getenv("GCP_FAKE_SEED", "42")),
+        )
+
+    def object_names(self, bucket: str) -> List[str]:
+        """Sorted object names of a bucket, generated on demand"""
+        return sorted(f"{OBJECT_PREFIXES[i % len(OBJECT_PREFIXES)]}/{i // 100:04d}/object-{i:07d}.json"
+                      for i in range(self.objects_per_bucket))
+
+    @staticmethod
+    def object_size(name: str) -> int:
+        return 1024 + zlib.crc32(name.encode()) % 65536
+
+
+class FakePager:
+    """Lazily fetched pages; iterating yields items, `.pages` yields pages"""
+
+    def __init__(self, fetch_page: Callable[[int], Any], page_count: int, items: Callable[[Any], Iterator]):
+        self._fetch_page = fetch_page
+        self._page_count = page_count
+        self._items = items
+
+    @property
+    def pages(self):
+        for index in range(self._page_count):
+            yield self._fetch_page(index)
+
+    def __iter__(self):
+        for page in self.pages:
+            yield from self._items(page)
+
+
+class FakePage(list):
+    """A page of storage listing results"""
+
+    @property
+    def num_items(self) -> int:
+        return len(self)
+
+
+class FakeCredentials:
+    """Credentials stand-in; no refresh method, so no refresh thread is started"""
+
+    token = "fake-token"
+    expiry = None
+    scopes = ["https://www.googleapis.com/auth/cloud-platform"]
+
+
+class FakeBackend:
+    """Creates fake API clients sharing one fleet and one set of call counters"""
+
+    SERVICES = ("compute.instances", "compute.zones", "compute.regions", "compute.zone_operations",
+                "storage", "functions", "monitoring", "resourcemanager.projects")
+
+    def __init__(self, fleet: Optional[FakeFleet] = None):
+        self.fleet = fleet or FakeFleet()
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._operations: Dict[str, SimpleNamespace] = {}
+        self._operation_seq = 0
+
+    def credentials(self):
+        return FakeCredentials(), self.fleet.project
+
+    def client(self, service: str, project: Optional[str] = None):
+        return {
+            "compute.instances": FakeInstancesClient,
+            "compute.zones": FakeZonesClient,
+            "compute.regions": FakeRegionsClient,
+            "compute.zone_operations": FakeZoneOperationsClient,
+            "storage": FakeStorageClient,
+            "functions": FakeFunctionsClient,
+            "monitoring": FakeMonitoringClient,
+            "resourcemanager.projects": FakeProjectsClient,
+        }[service](self)
+
+    # -- instrumentation --------------------------------------------------
+
+    def before_call(self, method: str):
+        with self._lock:
+            self.calls[method] += 1
+        if self.fleet.latency_ms:
+            time.sleep(self.fleet.latency_ms / 1000)
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+
+    def pager(self, method: str, items: List[Any], page_size: int, wrap: Callable[[List[Any]], Any],
+              unwrap: Callable[[Any], Iterator] = iter) -> FakePager:
+        """Pager over items; each page fetched counts as one call to method"""
+        def fetch(index):
+            self.before_call(method)
+            return wrap(items[index * page_size:(index + 1) * page_size])
+        return FakePager(fetch, max(1, math.ceil(len(items) / page_size)), unwrap)
+
+    # -- operations ---------------------------------------------------------
+
+    def new_operation(self, zone: str, instance: SimpleNamespace, target_status: str, action: str) -> SimpleNamespace:
+        with self._lock:
+            self._operation_seq += 1
+            name = f"operation-{self._operation_seq:08d}-{action}"
+            operation = SimpleNamespace(
+                name=name, zone=zone, status="RUNNING", progress=0,
+                error=SimpleNamespace(errors=[]),
+                _done_at=time.monotonic() + self.fleet.operation_seconds,
+                _instance=instance, _target=target_status,
+            )
+            self._operations[name] = operation
+        return operation
+
+    def operation(self, name: str) -> SimpleNamespace:
+        operation = self._operations.get(name)
+        if operation is None:
+            raise _not_found(f"The resource 'operations/{name}' was not found")
+        if operation.status != "DONE" and time.monotonic() >= operation._done_at:
+            operation.status, operation.progress = "DONE", 100
+            operation._instance.status = operation._target
+        return operation
+
+
+# -- Compute Engine -----------------------------------------------------------
+
+def _compute_filter(expression: str) -> Callable[[SimpleNamespace], bool]:
+    """Evaluate the (field eq regex) clauses gcp_server sends; others match everything"""
+    clauses = re.findall(r'\(?\s*(\w+)\s+(eq|ne)\s+"?([^")]+)"?\s*\)?', expression or "")
+    if not clauses:
+        clauses = [(f, "eq", re.escape(v)) for f, v in re.findall(r'(\w+)\s*=\s*"?([^")\s]+)"?', expression or "")]
+
+    def match(instance):
+        for field, op, pattern in clauses:
+            value = getattr(instance, field, None)
+            if value is None:
+                continue
+            hit = re.fullmatch(pattern, str(value)) is not None
+            if hit != (op == "eq"):
+                return False
+        return True
+    return match
+
+
+class FakeInstancesClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def list(self, request=None, **kwargs):
+        match = _compute_filter(request.filter)
+        instances = [i for i in self._backend.fleet.instances.get(request.zone, []) if match(i)]
+        return self._backend.pager("compute.instances.list", instances, request.max_results or PAGE_SIZE,
+                                   wrap=lambda items: SimpleNamespace(items=items), unwrap=lambda page: iter(page.items))
+
+    def aggregated_list(self, request=None, metadata=(), **kwargs):
+        fleet = self._backend.fleet
+        match = _compute_filter(request.filter)
+        # Pages cut across zones, like the real API
+        rows = [(zone, i) for zone in fleet.zones for i in fleet.instances[zone] if match(i)]
+
+        def wrap(items):
+            scoped: Dict[str, SimpleNamespace] = {f"zones/{z}": SimpleNamespace(instances=[]) for z in fleet.zones}
+            for zone, instance in items:
+                scoped[f"zones/{zone}"].instances.append(instance)
+            return SimpleNamespace(items=scoped)
+
+        def unwrap(page):
+            for scoped in page.items.values():
+                yield from scoped.instances
+
+        return self._backend.pager("compute.instances.aggregated_list", rows, request.max_results or PAGE_SIZE,
+                                   wrap=wrap, unwrap=unwrap)
+
+    def _change(self, request, target: str, action: str):
+        self._backend.before_call(f"compute.instances.{action}")
+        zone = self._backend.fleet.instance_zone.get(request.instance)
+        if zone != request.zone:
+            raise _not_found(f"The resource 'projects/{request.project}/zones/{request.zone}/instances/"
+                             f"{request.instance}' was not found")
+        instance = next(i for i in self._backend.fleet.instances[zone] if i.name == request.instance)
+        instance.status = "STAGING" if action == "start" else "STOPPING"
+        return self._backend.new_operation(zone, instance, target, action)
+
+    def start(self, request=None, **kwargs):
+        return self._change(request, "RUNNING", "start")
+
+    def stop(self, request=None, **kwargs):
+        return self._change(request, "TERMINATED", "stop")
+
+
+class FakeZoneOperationsClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def get(self, request=None, **kwargs):
+        self._backend.before_call("compute.zone_operations.get")
+        return self._backend.operation(request.operation)
+
+    def list(self, request=None, **kwargs):
+        self._backend.before_call("compute.zone_operations.list")
+        names = re.findall(r'name\s*=\s*"([^"]+)"', request.filter or "")
+        return [self._backend.operation(n) for n in names if n in self._backend._operations]
+
+    def wait(self, request=None, **kwargs):
+        self._backend.before_call("compute.zone_operations.wait")
+        operation = self._backend.operation(request.operation)
+        remaining = operation._done_at - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(remaining, 120))
+        return self._backend.operation(request.operation)
+
+
+class FakeZonesClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def list(self, request=None, **kwargs):
+        fleet = self._backend.fleet
+        zones = [SimpleNamespace(name=z, status="UP",
+                                 region=f"https://www.googleapis.com/compute/v1/projects/{fleet.project}/regions/{_region(z)}")
+                 for z in fleet.zones]
+        return self._backend.pager("compute.zones.list", zones, PAGE_SIZE,
+                                   wrap=lambda items: SimpleNamespace(items=items), unwrap=lambda page: iter(page.items))
+
+
+class FakeRegionsClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def list(self, request=None, **kwargs):
+        fleet = self._backend.fleet
+        regions = [SimpleNamespace(name=r, status="UP",
+                                   zones=[f"https://www.googleapis.com/compute/v1/projects/{fleet.project}/zones/{z}"
+                                          for z in fleet.zones if _region(z) == r])
+                   for r in fleet.regions]
+        return self._backend.pager("compute.regions.list", regions, PAGE_SIZE,
+                                   wrap=lambda items: SimpleNamespace(items=items), unwrap=lambda page: iter(page.items))
+
+
+# -- Cloud Storage ------------------------------------------------------------
+
+class FakeBucket:
+    def __init__(self, client: "FakeStorageClient", name: str):
+        self._client = client
+        self.name = name
+
+    def list_blobs(self, **kwargs):
+        return self._client.list_blobs(self.name, **kwargs)
+
+
+class FakeStorageClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def list_buckets(self, max_results=None, page_size=None, fields=None, **kwargs):
+        buckets = self._backend.fleet.buckets[:max_results] if max_results else self._backend.fleet.buckets
+        return self._backend.pager("storage.buckets.list", buckets, page_size or 1000, wrap=FakePage)
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self, name)
+
+    def list_blobs(self, bucket_or_name, prefix=None, max_results=None, start_offset=None, end_offset=None,
+                   page_size=None, fields=None, **kwargs):
+        fleet = self._backend.fleet
+        name = getattr(bucket_or_name, "name", bucket_or_name)
+        bucket = fleet.bucket_index.get(name)
+        if bucket is None:
+            self._backend.before_call("storage.objects.list")
+            raise _not_found(f"GET https://storage.googleapis.com/storage/v1/b/{name}/o: The specified bucket does not exist.")
+        names = [n for n in fleet.object_names(name)
+                 if (not prefix or n.startswith(prefix))
+                 and (not start_offset or n >= start_offset)
+                 and (not end_offset or n < end_offset)]
+        if max_results:
+            names = names[:max_results]
+        blobs = [SimpleNamespace(
+            name=n, size=fleet.object_size(n), content_type="application/json", updated=bucket.updated,
+            storage_class=bucket.storage_class, generation=1700000000000000 + i,
+            etag=hashlib.md5(n.encode()).hexdigest()[:12],
+        ) for i, n in enumerate(names)]
+        return self._backend.pager("storage.objects.list", blobs, min(page_size or 1000, 1000), wrap=FakePage)
+
+
+# -- Cloud Functions ------------------------------------------------------------
+
+class FakeFunctionsClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def list_functions(self, request=None, parent=None, **kwargs):
+        parent = parent or request.parent
+        region = parent.rstrip("/").split("/")[-1]
+        functions = self._backend.fleet.functions.get(region, [])
+        return self._backend.pager("functions.list_functions", functions, 100,
+                                   wrap=lambda items: SimpleNamespace(functions=items),
+                                   unwrap=lambda page: iter(page.functions))
+
+    def call_function(self, request=None, **kwargs):
+        self._backend.before_call("functions.call_function")
+        region = request.name.split("/")[3]
+        if not any(f.name == request.name for f in self._backend.fleet.functions.get(region, [])):
+            raise _not_found(f"Function {request.name} does not exist")
+        return SimpleNamespace(result=f'{{"echo": {request.data}}}', error="",
+                               execution_id=hashlib.md5(f"{request.name}{time.time()}".encode()).hexdigest()[:12])
+
+
+# -- Cloud Monitoring -------------------------------------------------------------
+
+REDUCERS = {
+    "REDUCE_SUM": sum,
+    "REDUCE_MAX": max,
+    "REDUCE_MIN": min,
+    "REDUCE_COUNT": len,
+}
+
+
+class FakeMonitoringClient:
+    """Serves real monitoring_v3 protos so the server's parsing is exercised"""
+
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def _resources(self, metric_type: str, label_filters: Dict[str, str]):
+        """(resource type, resource labels, metric labels, value(t)) per monitored resource"""
+        fleet = self._backend.fleet
+        if metric_type.startswith("storage.googleapis.com/storage/"):
+            count = metric_type.endswith("object_count")
+            for b in fleet.buckets:
+                if not b.has_metrics:
+                    continue
+                labels = {"bucket_name": b.name, "location": b.location.lower(), "project_id": fleet.project}
+                total = fleet.objects_per_bucket if count else fleet.objects_per_bucket * 33792
+                yield "gcs_bucket", labels, {"storage_class": b.storage_class}, (lambda t, total=total: total)
+            return
+        for zone in fleet.zones:
+            for instance in fleet.instances[zone]:
+                labels = {"instance_id": str(instance.id), "zone": zone, "project_id": fleet.project}
+                if any(labels.get(k) != v for k, v in label_filters.items()):
+                    continue
+                phase = instance.id % 360
+
+                def value(t, phase=phase):
+                    return 0.3 + 0.25 * math.sin(t / 3600 + phase)
+                yield "gce_instance", labels, {"instance_name": instance.name}, value
+
+    def list_time_series(self, request=None, **kwargs):
+        from google.cloud import monitoring_v3
+
+        metric_type = re.search(r'metric\.type\s*=\s*"([^"]+)"', request.filter).group(1)
+        label_filters = dict(re.findall(r'resource\.labels?\.(\w+)\s*=\s*"([^"]+)"', request.filter))
+        end = request.interval.end_time.timestamp()
+        start = request.interval.start_time.timestamp()
+        value_type = 2 if metric_type.endswith("object_count") else 3
+        value_field = "int64_value" if value_type == 2 else "double_value"
+
+        aggregation = request.aggregation if "aggregation" in request else None
+        period = aggregation.alignment_period.total_seconds() if aggregation else 60
+        timestamps = [end - k * period for k in range(max(1, int((end - start) // period)))]
+
+        resources = list(self._resources(metric_type, label_filters))
+        reducer = aggregation.cross_series_reducer.name if aggregation else "REDUCE_NONE"
+        if reducer != "REDUCE_NONE":
+            groups: Dict[tuple, list] = {}
+            for resource in resources:
+                key = tuple(self._field(resource, f) for f in aggregation.group_by_fields)
+                groups.setdefault(key, []).append(resource)
+            reduce = REDUCERS.get(reducer, lambda values: sum(values) / len(values))
+            series_specs = []
+            for key, members in groups.items():
+                kept = dict(zip(aggregation.group_by_fields, key))
+                resource_labels = {f.split(".")[-1]: v for f, v in kept.items() if f.startswith("resource.")}
+                metric_labels = {f.split(".")[-1]: v for f, v in kept.items() if f.startswith("metric.")}
+                values = [m[3] for m in members]
+                series_specs.append((members[0][0], resource_labels, metric_labels,
+                                     lambda t, values=values: reduce([v(t) for v in values])))
+        else:
+            series_specs = resources
+
+        def build(spec):
+            resource_type, resource_labels, metric_labels, value = spec
+            return monitoring_v3.TimeSeries(
+                metric={"type": metric_type, "labels": metric_labels},
+                resource={"type": resource_type, "labels": resource_labels},
+                value_type=value_type,
+                points=[{"interval": {"end_time": {"seconds": int(t)}},
+                         "value": {value_field: int(value(t)) if value_type == 2 else value(t)}}
+                        for t in timestamps],
+            )
+
+        return self._backend.pager(
+            "monitoring.list_time_series", series_specs, SERIES_PER_PAGE,
+            wrap=lambda specs: monitoring_v3.ListTimeSeriesResponse(time_series=[build(s) for s in specs]),
+            unwrap=lambda page: iter(page.time_series),
+        )
+
+    @staticmethod
+    def _field(resource, field: str) -> str:
+        resource_type, resource_labels, metric_labels, _ = resource
+        name = field.split(".")[-1]
+        if field.startswith("resource.label"):
+            return resource_labels.get(name, "")
+        if field.startswith("metric.label"):
+            return metric_labels.get(name, "")
+        return resource_type
+
+
+# -- Resource Manager -------------------------------------------------------------
+
+class FakeProjectsClient:
+    def __init__(self, backend: FakeBackend):
+        self._backend = backend
+
+    def search_projects(self, request=None, query=None, **kwargs):
+        projects = [SimpleNamespace(project_id=p, display_name=p.replace("-", " ").title(),
+                                    parent="organizations/000000000000", labels={}, state="ACTIVE")
+                    for p in self._backend.fleet.projects]
+        return self._backend.pager("resourcemanager.search_projects", projects, 500,
+                                   wrap=lambda items: SimpleNamespace(projects=items),
+                                   unwrap=lambda page: iter(page.projects))
@@ -0,0 +1,143 @@
+"""
+Project-wide Compute Engine inventory for the GCP MCP server.
+
+Uses `InstancesClient.aggregated_list` (one paged call per project covering
+every zone) with server-side filters and a field mask, consumes pages as they
+stream in, fans out over several projects concurrently, and keeps a TTL index
+of instance name -> zone so start/stop tools can resolve a zone without the
+caller knowing it.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Only the fields format_instance() reads; sent as X-Goog-FieldMask so the
+# API doesn't serialize disks, metadata, service accounts etc. for every VM
+INSTANCE_FIELD_MASK = (
+    "items.*.instances(name,zone,status,machineType,creationTimestamp,"
+    "networkInterfaces(networkIP,accessConfigs(natIP)),tags(items),labels),"
+    "nextPageToken"
+)
+PAGE_SIZE = 500
+
+
+def format_instance(instance, zone: str) -> Dict[str, Any]:
+    """Instance summary in the same shape as list_compute_instances"""
+    interfaces = instance.network_interfaces
+    return {
+        "name": instance.name,
+        "machine_type": instance.machine_type.split('/')[-1],
+        "status": instance.status,
+        "zone": zone,
+        "creation_timestamp": instance.creation_timestamp,
+        "internal_ip": interfaces[0].network_i_p if interfaces else None,
+        "external_ip": interfaces[0].access_configs[0].nat_i_p if interfaces and interfaces[0].access_configs else None,
+        "tags": list(instance.tags.items) if instance.tags else [],
+        "labels": dict(instance.labels) if instance.labels else {}
+    }
+
+
+class InstanceInventory:
+    """Aggregated-list inventory with a TTL name -> zone index per project"""
+
+    def __init__(self,
+                 client_getter: Callable[[], Any],
+                 ttl: float = 300.0,
+                 max_workers: int = 8):
+        self._client_getter = client_getter
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        # project -> (indexed_at, {instance name -> [zones]})
+        self._index: Dict[str, Tuple[float, Dict[str, List[str]]]] = {}
+        self.api_pages = 0
+
+    def list_project(self, project: str, filter: str = "", field_mask: str = INSTANCE_FIELD_MASK) -> List[Dict[str, Any]]:
+        """All instances in a project across every zone, streamed page by page"""
+        from google.cloud import compute_v1
+
+        client = self._client_getter()
+        request = compute_v1.AggregatedListInstancesRequest(
+            project=project,
+            filter=filter,
+            max_results=PAGE_SIZE
+        )
+        metadata = [("x-goog-fieldmask", field_mask)] if field_mask else []
+
+        instances = []
+        zones: Dict[str, List[str]] = {}
+        pager = client.aggregated_list(request=request, metadata=metadata)
+        for page in pager.pages:
+            self.api_pages += 1
+            for scope, scoped_list in page.items.items():
+                if not scoped_list.instances:
+                    continue
+                zone = scope.split('/')[-1]
+                for instance in scoped_list.instances:
+                    instances.append(format_instance(instance, zone))
+                    zones.setdefault(instance.name, []).append(zone)
+
+        # Only an unfiltered listing sees every instance, so only it may
+        # replace the index; filtered results are merged in
+        with self._lock:
+            if not filter:
+                self._index[project] = (time.monotonic(), zones)
+            elif project in self._index:
+                indexed_at, known = self._index[project]
+                for name, found in zones.items():
+                    known[name] = sorted(set(known.get(name, [])) | set(found))
+        return instances
+
+    def list_projects(self, projects: List[str], filter: str = "") -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, str]]:
+        """List several projects concurrently; returns (instances, errors) by project"""
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        if not projects:
+            return results, errors
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(projects))) as pool:
+            futures = {pool.submit(self.list_project, project, filter): project for project in projects}
+            for future in as_completed(futures):
+                project = futures[future]
+                try:
+                    results[project] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to list instances in project {project}: {e}")
+                    errors[project] = str(e)
+        return results, errors
+
+    def resolve_zone(self, project: str, name: str) -> Tuple[Optional[str], List[str]]:
+        """Zone of instance `name`: (zone, []) if unique, (None, zones) otherwise.
+
+        Answers from the index while it is fresh; a miss or stale index costs
+        one aggregated_list call.
+        """
+        entry = self._index.get(project)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl or name not in entry[1]:
+            self.list_project(project, field_mask="items.*.instances(name,zone),nextPageToken")
+            entry = self._index.get(project)
+        zones = entry[1].get(name, []) if entry else []
+        return (zones[0], zones) if len(zones) == 1 else (None, zones)
+
+    def remember(self, project: str, name: str, zone: str):
+        """Record a zone learned from a zonal call"""
+        with self._lock:
+            entry = self._index.get(project)
+            if entry is not None:
+                known = entry[1].setdefault(name, [])
+                if zone not in known:
+                    known.append(zone)
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "ttl_seconds": self.ttl,
+            "api_pages": self.api_pages,
+            "projects": {
+                project: {"instances": len(zones), "age_seconds": round(now - indexed_at, 1)}
+                for project, (indexed_at, zones) in self._index.items()
+            },
+        }
@@ -0,0 +1,195 @@
+"""
+Zone and region catalog for the GCP MCP server.
+
+The Compute Engine zone and region lists change a few times a year, so they
+are fetched once per project, kept in memory and persisted as JSON next to
+the other server caches. A catalog older than its TTL is still served while
+a background thread refreshes it. The same catalog validates zone and region
+arguments locally: an unknown zone fails at once with close matches instead
+of after an API round trip, and a unique prefix (e.g. "europe-west4-") is
+completed to the full zone name.
+"""
+import difflib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp-gcp-cloud")
+CACHE_VERSION = 1
+
+
+class LocationCatalog:
+    """Persisted zone/region lists per project with stale-while-refresh"""
+
+    def __init__(self,
+                 zones_getter: Callable[[], Any],
+                 regions_getter: Callable[[], Any],
+                 ttl: float = 7 * 86400.0,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self._zones_getter = zones_getter
+        self._regions_getter = regions_getter
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        # project -> catalog dict with fetched_at (epoch seconds), zones, regions
+        self._catalogs: Dict[str, Dict[str, Any]] = {}
+        self._refreshing: set = set()
+        self.stats = {"api_fetches": 0, "disk_loads": 0, "background_refreshes": 0, "validations": 0}
+
+    # -- loading ------------------------------------------------------------
+
+    def _cache_path(self, project: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, "locations", f"{project}.json")
+
+    def _read_disk(self, project: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(project)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                catalog = json.load(f)
+            if catalog.get("version") != CACHE_VERSION:
+                return None
+            self.stats["disk_loads"] += 1
+            return catalog
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable location cache {path}: {e}")
+            return None
+
+    def _write_disk(self, project: str, catalog: Dict[str, Any]):
+        path = self._cache_path(project)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so a concurrent reader never sees half a file
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(catalog, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write location cache {path}: {e}")
+
+    def _list_zones(self, project: str) -> List[Dict[str, Any]]:
+        from google.cloud import compute_v1
+
+        request = compute_v1.ListZonesRequest(project=project)
+        return [{"name": zone.name, "region": zone.region.split('/')[-1], "status": zone.status}
+                for zone in self._zones_getter().list(request=request)]
+
+    def _list_regions(self, project: str) -> List[Dict[str, Any]]:
+        from google.cloud import compute_v1
+
+        request = compute_v1.ListRegionsRequest(project=project)
+        return [{"name": region.name, "status": region.status,
+                 "zones": [zone.split('/')[-1] for zone in region.zones]}
+                for region in self._regions_getter().list(request=request)]
+
+    def fetch(self, project: str) -> Dict[str, Any]:
+        """Fetch zones and regions from the Compute API and persist them"""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            zones = pool.submit(self._list_zones, project)
+            regions = pool.submit(self._list_regions, project)
+            zones, regions = zones.result(), regions.result()
+        catalog = {
+            "version": CACHE_VERSION,
+            "project": project,
+            "fetched_at": time.time(),
+            "zones": sorted(zones, key=lambda z: z["name"]),
+            "regions": sorted(regions, key=lambda r: r["name"]),
+        }
+        self.stats["api_fetches"] += 1
+        with self._lock:
+            self._catalogs[project] = catalog
+        self._write_disk(project, catalog)
+        logger.info(f"Fetched {len(zones)} zones and {len(regions)} regions for {project}")
+        return catalog
+
+    def _refresh_in_background(self, project: str):
+        with self._lock:
+            if project in self._refreshing:
+                return
+            self._refreshing.add(project)
+
+        def refresh():
+            try:
+                self.fetch(project)
+                self.stats["background_refreshes"] += 1
+            except Exception as e:
+                logger.warning(f"Background refresh of zones/regions for {project} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(project)
+
+        threading.Thread(target=refresh, name="gcp-locations-refresh", daemon=True).start()
+
+    def get(self, project: str, refresh: bool = False) -> Dict[str, Any]:
+        """Catalog for a project: memory, then disk, then the API.
+
+        A stale catalog is returned as is and refreshed in the background.
+        """
+        if refresh:
+            return self.fetch(project)
+        with self._lock:
+            catalog = self._catalogs.get(project)
+        if catalog is None:
+            catalog = self._read_disk(project)
+            if catalog is None:
+                return self.fetch(project)
+            with self._lock:
+                catalog = self._catalogs.setdefault(project, catalog)
+        if time.time() - catalog["fetched_at"] >= self.ttl:
+            self._refresh_in_background(project)
+        return catalog
+
+    # -- validation ---------------------------------------------------------
+
+    def _resolve(self, kind: str, value: str, names: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        self.stats["validations"] += 1
+        value = value.strip().lower()
+        if value in names:
+            return value, None
+        matches = [n for n in names if n.startswith(value)] if value else []
+        if len(matches) == 1:
+            return matches[0], None
+        if len(matches) > 1:
+            return None, f"{kind.capitalize()} '{value}' is ambiguous: {', '.join(matches[:10])}"
+        close = difflib.get_close_matches(value, names, n=3, cutoff=0.6)
+        hint = f"; did you mean {', '.join(close)}?" if close else ""
+        return None, f"Unknown {kind} '{value}'{hint}"
+
+    def resolve_zone(self, project: str, zone: str) -> Tuple[Optional[str], Optional[str]]:
+        """(zone, error): exact name, or the one zone starting with `zone`"""
+        catalog = self.get(project)
+        return self._resolve("zone", zone, [z["name"] for z in catalog["zones"]])
+
+    def resolve_region(self, project: str, region: str) -> Tuple[Optional[str], Optional[str]]:
+        """(region, error): exact name, or the one region starting with `region`"""
+        catalog = self.get(project)
+        return self._resolve("region", region, [r["name"] for r in catalog["regions"]])
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "cache_dir": self.cache_dir,
+                "projects": {
+                    project: {
+                        "zones": len(catalog["zones"]),
+                        "regions": len(catalog["regions"]),
+                        "age_seconds": round(now - catalog["fetched_at"], 1),
+                        "refreshing": project in self._refreshing,
+                    }
+                    for project, catalog in self._catalogs.items()
+                },
+                **self.stats,
+            }
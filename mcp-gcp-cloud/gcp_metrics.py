@@ -0,0 +1,132 @@
+"""
+Cloud Monitoring time series queries for the GCP MCP server.
+
+Alignment (per-series aligner over a fixed period), cross-series reduction
+and group-by labels are sent to the API, so Monitoring returns a handful of
+aggregated series instead of every raw point from every resource. Pages are
+consumed as they arrive and converted to a columnar result: labels are
+stored once per series and values are plain lists; when the series are
+aligned they share a single timestamp column.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _enum_value(enum, prefix: str, name: str, kind: str):
+    """Accept 'mean', 'ALIGN_MEAN' or 'align_mean' for enum members"""
+    key = name.strip().upper()
+    if not key.startswith(prefix):
+        key = prefix + key
+    try:
+        return enum[key]
+    except KeyError:
+        choices = ", ".join(m.name[len(prefix):].lower() for m in enum if m.name.startswith(prefix) and m.value)
+        raise ValueError(f"Unknown {kind} '{name}'. Choose from: {choices}")
+
+
+def build_request(monitoring_v3, project: str, metric_type: str, hours: float,
+                  alignment_period_minutes: int = 5, aligner: str = "mean", reducer: str = "",
+                  group_by: Optional[List[str]] = None, filter: str = "", page_size: int = 0):
+    """ListTimeSeriesRequest with aggregation pushed to the API"""
+    now = datetime.now(timezone.utc)
+    interval = monitoring_v3.TimeInterval({
+        "end_time": {"seconds": int(now.timestamp())},
+        "start_time": {"seconds": int((now - timedelta(hours=hours)).timestamp())}
+    })
+
+    metric_filter = f'metric.type="{metric_type}"'
+    if filter:
+        metric_filter += f" AND {filter}"
+
+    request = {
+        "name": f"projects/{project}",
+        "filter": metric_filter,
+        "interval": interval,
+        "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
+    }
+    if page_size:
+        request["page_size"] = page_size
+
+    Aggregation = monitoring_v3.Aggregation
+    if aligner and aligner.lower() != "none" and alignment_period_minutes > 0:
+        aggregation = {
+            "alignment_period": {"seconds": alignment_period_minutes * 60},
+            "per_series_aligner": _enum_value(Aggregation.Aligner, "ALIGN_", aligner, "aligner"),
+        }
+        if reducer and reducer.lower() != "none":
+            aggregation["cross_series_reducer"] = _enum_value(Aggregation.Reducer, "REDUCE_", reducer, "reducer")
+            aggregation["group_by_fields"] = list(group_by or [])
+        request["aggregation"] = Aggregation(aggregation)
+    elif reducer and reducer.lower() != "none":
+        raise ValueError("A cross-series reducer needs an aligner and alignment period")
+
+    return monitoring_v3.ListTimeSeriesRequest(request)
+
+
+def _point_value(value) -> Any:
+    kind = type(value).pb(value).WhichOneof("value")
+    if kind == "distribution_value":
+        return value.distribution_value.mean
+    return getattr(value, kind) if kind else None
+
+
+def collect_series(pager, aligned: bool, max_series: int = 0) -> Dict[str, Any]:
+    """Consume a list_time_series pager page by page into columnar series
+
+    Stops reading pages once max_series series have been collected (0 = all).
+    """
+    from google.api import metric_pb2
+
+    series: List[Dict[str, Any]] = []
+    columns: List[List[Tuple[float, Any]]] = []
+    truncated = False
+    pages = 0
+
+    for page in pager.pages:
+        pages += 1
+        for ts in page.time_series:
+            if max_series and len(series) >= max_series:
+                truncated = True
+                break
+            series.append({
+                "metric_labels": dict(ts.metric.labels),
+                "resource_type": ts.resource.type,
+                "resource": dict(ts.resource.labels),
+                "value_type": metric_pb2.MetricDescriptor.ValueType.Name(ts.value_type),
+            })
+            # Points arrive newest first
+            columns.append([(point.interval.end_time.timestamp(), _point_value(point.value))
+                            for point in reversed(ts.points)])
+        if truncated:
+            break
+
+    result: Dict[str, Any] = {
+        "series_count": len(series),
+        "data_points": sum(len(points) for points in columns),
+        "pages": pages,
+        "truncated": truncated,
+    }
+
+    def iso(seconds: float) -> str:
+        return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+    if aligned:
+        # Aligned series share one timestamp grid; gaps become None
+        grid = sorted({t for points in columns for t, _ in points})
+        position = {t: i for i, t in enumerate(grid)}
+        for entry, points in zip(series, columns):
+            values = [None] * len(grid)
+            for t, v in points:
+                values[position[t]] = v
+            entry["values"] = values
+        result["timestamps"] = [iso(t) for t in grid]
+    else:
+        for entry, points in zip(series, columns):
+            entry["timestamps"] = [iso(t) for t, _ in points]
+            entry["values"] = [v for _, v in points]
+
+    result["series"] = series
+    return result
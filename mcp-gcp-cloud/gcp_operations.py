@@ -0,0 +1,170 @@
+"""
+Compute Engine zone operation tracking for the GCP MCP server.
+
+start/stop calls return a zone operation; the tracker registers it and one
+background loop polls every pending operation until it is DONE. Polls are
+batched per (project, zone): a single pending operation is fetched with
+`ZoneOperationsClient.get`, several are fetched together with one
+`ZoneOperationsClient.list` call filtered on their names. Callers that need
+completion block on `wait()` instead of polling the API themselves.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DONE = "DONE"
+
+
+def _status_name(status) -> str:
+    return getattr(status, "name", None) or str(status)
+
+
+class OperationTracker:
+    """Registry of in-flight zone operations polled by a single background loop"""
+
+    def __init__(self,
+                 client_getter: Callable[[], Any],
+                 poll_interval: float = 2.0,
+                 retention: float = 3600.0):
+        self._client_getter = client_getter
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._operations: Dict[str, Dict[str, Any]] = {}
+        self._changed = threading.Condition()
+        self._poller: Optional[threading.Thread] = None
+        self.api_calls = 0
+
+    def track(self, project: str, zone: str, operation_name: str, action: str, instance: str) -> Dict[str, Any]:
+        """Register an operation returned by a zonal call and start polling it"""
+        record = {
+            "operation": operation_name,
+            "project": project,
+            "zone": zone,
+            "action": action,
+            "instance": instance,
+            "status": "PENDING",
+            "progress": 0,
+            "error": None,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": None,
+            "duration_seconds": None,
+            "_submitted": time.monotonic(),
+        }
+        with self._changed:
+            self._operations[operation_name] = record
+            if self._poller is None or not self._poller.is_alive():
+                self._poller = threading.Thread(target=self._poll_loop, name="gcp-operations", daemon=True)
+                self._poller.start()
+        return self._public(record)
+
+    def get(self, operation_name: str) -> Optional[Dict[str, Any]]:
+        with self._changed:
+            record = self._operations.get(operation_name)
+            return self._public(record) if record else None
+
+    def wait(self, operation_names: Iterable[str], timeout: float) -> List[Dict[str, Any]]:
+        """Block until every named operation is DONE or timeout elapses; returns their records"""
+        names = list(operation_names)
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                pending = [n for n in names if n in self._operations and self._operations[n]["status"] != DONE]
+                remaining = deadline - time.monotonic()
+                if not pending or remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return [self._public(self._operations[n]) for n in names if n in self._operations]
+
+    # -- polling ------------------------------------------------------------
+
+    def _pending_by_zone(self) -> Dict[Tuple[str, str], List[str]]:
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        with self._changed:
+            for name, record in self._operations.items():
+                if record["status"] != DONE:
+                    groups.setdefault((record["project"], record["zone"]), []).append(name)
+        return groups
+
+    def poll_once(self) -> int:
+        """Refresh every pending operation; returns how many are still pending"""
+        from google.cloud import compute_v1
+
+        client = self._client_getter()
+        for (project, zone), names in self._pending_by_zone().items():
+            try:
+                if len(names) == 1:
+                    self.api_calls += 1
+                    operations = [client.get(request=compute_v1.GetZoneOperationRequest(
+                        project=project, zone=zone, operation=names[0]))]
+                else:
+                    # One list call answers for every pending operation in the zone
+                    self.api_calls += 1
+                    name_filter = " OR ".join(f'(name = "{name}")' for name in names)
+                    operations = list(client.list(request=compute_v1.ListZoneOperationsRequest(
+                        project=project, zone=zone, filter=name_filter)))
+            except Exception as e:
+                logger.warning(f"Failed to poll operations in {project}/{zone}: {e}")
+                continue
+            self._update(operations)
+        self._prune()
+        return sum(len(names) for names in self._pending_by_zone().values())
+
+    def _update(self, operations):
+        with self._changed:
+            for operation in operations:
+                record = self._operations.get(operation.name)
+                if record is None:
+                    continue
+                record["status"] = _status_name(operation.status)
+                record["progress"] = operation.progress
+                if operation.error and operation.error.errors:
+                    record["error"] = "; ".join(e.message for e in operation.error.errors)
+                if record["status"] == DONE and record["completed_at"] is None:
+                    record["completed_at"] = datetime.now(timezone.utc).isoformat()
+                    record["duration_seconds"] = round(time.monotonic() - record["_submitted"], 1)
+                    logger.info(f"Operation {operation.name} ({record['action']} {record['instance']}) "
+                                f"finished in {record['duration_seconds']}s"
+                                f"{' with error: ' + record['error'] if record['error'] else ''}")
+            self._changed.notify_all()
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.retention
+        with self._changed:
+            for name in [n for n, r in self._operations.items() if r["status"] == DONE and r["_submitted"] < cutoff]:
+                del self._operations[name]
+
+    def _poll_loop(self):
+        while True:
+            try:
+                pending = self.poll_once()
+            except Exception as e:
+                logger.warning(f"Operation poll failed: {e}")
+                pending = -1
+            if pending == 0:
+                with self._changed:
+                    # Exit only if nothing was tracked since the poll; track() restarts the loop
+                    if not any(r["status"] != DONE for r in self._operations.values()):
+                        self._poller = None
+                        return
+            time.sleep(self.poll_interval)
+
+    # -- reporting ----------------------------------------------------------
+
+    @staticmethod
+    def _public(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in record.items() if not k.startswith("_")}
+
+    def status(self) -> Dict[str, Any]:
+        with self._changed:
+            records = [self._public(r) for r in self._operations.values()]
+        return {
+            "poll_interval_seconds": self.poll_interval,
+            "polling": self._poller is not None,
+            "api_calls": self.api_calls,
+            "pending": sum(1 for r in records if r["status"] != DONE),
+            "operations": sorted(records, key=lambda r: r["submitted_at"], reverse=True),
+        }
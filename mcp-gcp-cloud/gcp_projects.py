@@ -0,0 +1,121 @@
+"""
+Organization-wide project fan-out for the GCP MCP server.
+
+ProjectCatalog lists the projects the caller can see through Resource
+Manager `search_projects` and caches them. fan_out() then runs one function
+per project on a bounded thread pool. A project that runs longer than its
+timeout is reported as timed out and the pool stops waiting for it. Results
+are handed to a callback as each project finishes, so callers merge them
+incrementally instead of after the slowest project.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectCatalog:
+    """Cached Resource Manager project search"""
+
+    def __init__(self, client_getter: Callable[[], Any], ttl: float = 3600.0):
+        self._client_getter = client_getter
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # query -> (fetched_at, [project dicts])
+        self._cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self.api_calls = 0
+
+    def projects(self, query: str = "", refresh: bool = False) -> List[Dict[str, Any]]:
+        """Active projects matching a search_projects query (e.g. parent:organizations/123, labels.env:prod)"""
+        query = " ".join(part for part in ("state:ACTIVE", query.strip()) if part)
+        with self._lock:
+            entry = self._cache.get(query)
+            if entry and not refresh and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+
+        projects = []
+        pager = self._client_getter().search_projects(query=query)
+        for page in pager.pages:
+            self.api_calls += 1
+            for project in page.projects:
+                projects.append({
+                    "project_id": project.project_id,
+                    "display_name": project.display_name,
+                    "parent": project.parent,
+                    "labels": dict(project.labels),
+                })
+        projects.sort(key=lambda p: p["project_id"])
+        with self._lock:
+            self._cache[query] = (time.monotonic(), projects)
+        return projects
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "api_calls": self.api_calls,
+                "queries": {q: {"projects": len(p), "age_seconds": round(now - t, 1)}
+                            for q, (t, p) in self._cache.items()},
+            }
+
+
+def fan_out(projects: List[str],
+            fn: Callable[[str], Any],
+            max_workers: int = 16,
+            timeout: float = 60.0,
+            on_result: Optional[Callable[[str, Any, float], None]] = None) -> Dict[str, Any]:
+    """Run fn(project) for every project with bounded parallelism.
+
+    on_result(project, result, seconds) is called from the caller's thread as
+    each project finishes. A project whose call raises is recorded in
+    "errors"; one still running `timeout` seconds after it started is
+    recorded in "timed_out" and abandoned (its thread finishes in the
+    background).
+    """
+    errors: Dict[str, str] = {}
+    timed_out: List[str] = []
+    durations: Dict[str, float] = {}
+    if not projects:
+        return {"errors": errors, "timed_out": timed_out, "durations": durations}
+
+    started: Dict[str, float] = {}
+
+    def run(project):
+        started[project] = time.monotonic()
+        return fn(project)
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(projects)), thread_name_prefix="gcp-fanout")
+    futures = {pool.submit(run, project): project for project in projects}
+    pending = set(futures)
+    try:
+        while pending:
+            running = [started[futures[f]] for f in pending if futures[f] in started]
+            next_deadline = min(running) + timeout - time.monotonic() if running else timeout
+            done, pending = wait(pending, timeout=max(0.05, next_deadline), return_when=FIRST_COMPLETED)
+            for future in done:
+                project = futures[future]
+                durations[project] = round(time.monotonic() - started.get(project, time.monotonic()), 2)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Fan-out call failed for project {project}: {e}")
+                    errors[project] = str(e)
+                    continue
+                if on_result:
+                    on_result(project, result, durations[project])
+
+            now = time.monotonic()
+            for future in list(pending):
+                project = futures[future]
+                if project in started and now - started[project] >= timeout:
+                    logger.warning(f"Fan-out call for project {project} timed out after {timeout}s")
+                    timed_out.append(project)
+                    durations[project] = round(now - started[project], 2)
+                    pending.discard(future)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return {"errors": errors, "timed_out": sorted(timed_out), "durations": durations}
@@ -1,20 +1,32 @@
+import time
+_process_started = time.perf_counter()
+
 from mcp.server.fastmcp import FastMCP
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import os
 import logging
 from typing import Dict, Any, List
-from datetime import datetime, timedelta
+
+from gcp_clients import ClientRegistry, CredentialCache, LazyModule, import_timings
+from gcp_inventory import InstanceInventory, format_instance
+from gcp_locations import DEFAULT_CACHE_DIR as LOCATION_CACHE_DIR, LocationCatalog
+from gcp_metrics import build_request as build_metrics_request, collect_series
+from gcp_operations import OperationTracker
+from gcp_projects import ProjectCatalog, fan_out
+from gcp_storage_stats import BucketStats
 
 # GCP imports
-try:
-    from google.cloud import compute_v1, storage, functions_v1, monitoring_v3
-    from google.cloud import billing_v1, resourcemanager_v3
-    from google.oauth2 import service_account
-    import google.auth
-except ImportError:
-    print("Google Cloud libraries not installed. Run: pip install google-cloud-compute google-cloud-storage google-cloud-functions google-cloud-monitoring google-cloud-billing google-cloud-resource-manager")
-    sys.exit(1)
+# The client libraries carry large protobuf descriptor sets (compute_v1 alone
+# takes ~2s to import), so each one is imported the first time a tool uses it
+compute_v1 = LazyModule("google.cloud.compute_v1", "google-cloud-compute")
+storage = LazyModule("google.cloud.storage", "google-cloud-storage")
+functions_v1 = LazyModule("google.cloud.functions_v1", "google-cloud-functions")
+monitoring_v3 = LazyModule("google.cloud.monitoring_v3", "google-cloud-monitoring")
+resourcemanager_v3 = LazyModule("google.cloud.resourcemanager_v3", "google-cloud-resource-manager")
+# Billing analytics pull in NumPy; only needed once a billing question is asked
+gcp_billing = LazyModule("gcp_billing", "numpy")
 
 # Setup logging
 logging.basicConfig(
@@ -24,6 +36,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Startup phases in ms, reported once the server is ready
+startup_timings: Dict[str, Any] = {"imports_ms": round((time.perf_counter() - _process_started) * 1000, 1)}
+
 # Initialize FastMCP server
 mcp = FastMCP(
     "GCP Cloud Management Agent",
@@ -32,16 +47,159 @@ mcp = FastMCP(
 )
 
 # GCP Configuration
+# GCP_BACKEND=fake serves a synthetic project from gcp_fake instead of real GCP
+GCP_BACKEND = os.getenv("GCP_BACKEND", "google").lower()
+fake_backend = None
+if GCP_BACKEND == "fake":
+    from gcp_fake import FakeBackend, FakeFleet
+    fake_backend = FakeBackend(FakeFleet.from_env())
+    logger.info("Using offline fake GCP backend")
+
+# Credentials are discovered once and refreshed in the background; API clients
+# (and their gRPC channels / HTTP pools) are shared across tool calls
+credential_cache = CredentialCache(loader=fake_backend.credentials if fake_backend else None)
+clients = ClientRegistry(credential_cache)
+clients.register("compute.instances", lambda credentials, project: compute_v1.InstancesClient(credentials=credentials))
+clients.register("compute.zones", lambda credentials, project: compute_v1.ZonesClient(credentials=credentials))
+clients.register("compute.zone_operations", lambda credentials, project: compute_v1.ZoneOperationsClient(credentials=credentials))
+clients.register("compute.regions", lambda credentials, project: compute_v1.RegionsClient(credentials=credentials))
+clients.register("storage", lambda credentials, project: storage.Client(credentials=credentials, project=project))
+clients.register("functions", lambda credentials, project: functions_v1.CloudFunctionsServiceClient(credentials=credentials))
+clients.register("monitoring", lambda credentials, project: monitoring_v3.MetricServiceClient(credentials=credentials))
+clients.register("resourcemanager.projects", lambda credentials, project: resourcemanager_v3.ProjectsClient(credentials=credentials))
+if fake_backend:
+    for service in fake_backend.SERVICES:
+        clients.register(service, lambda credentials, project, service=service: fake_backend.client(service, project))
+
 def get_gcp_credentials():
     """Get GCP credentials and project info"""
+    return credential_cache.get()
+
+# Zone/region lists, persisted for a week and refreshed in the background;
+# the synthetic fake catalog is kept in memory only
+locations = LocationCatalog(
+    zones_getter=lambda: clients.get("compute.zones"),
+    regions_getter=lambda: clients.get("compute.regions"),
+    cache_dir=None if fake_backend else LOCATION_CACHE_DIR
+)
+
+def validate_location(kind: str, project: str, value: str):
+    """Return (name, error) for a zone or region argument, checked against the catalog.
+
+    Unique prefixes are completed; if the catalog can't be loaded the value is
+    passed through and the API has the last word.
+    """
     try:
-        # Try to get default credentials
-        credentials, project_id = google.auth.default()
-        logger.info(f"GCP credentials established for project: {project_id}")
-        return credentials, project_id
+        if kind == "zone":
+            return locations.resolve_zone(project, value)
+        return locations.resolve_region(project, value)
     except Exception as e:
-        logger.error(f"Failed to establish GCP credentials: {e}")
-        return None, None
+        logger.warning(f"Zone/region catalog unavailable, not validating {kind} {value}: {e}")
+        return value, None
+
+# Project-wide instance inventory with a 5 minute name -> zone index
+inventory = InstanceInventory(lambda: clients.get("compute.instances"))
+
+def resolve_instance_zone(instance_name: str, project: str, zone: str):
+    """Return (zone, error); looks the zone up in the inventory when omitted"""
+    if zone:
+        return validate_location("zone", project, zone)
+    found, candidates = inventory.resolve_zone(project, instance_name)
+    if found:
+        return found, None
+    if candidates:
+        return None, f"Instance {instance_name} exists in several zones ({', '.join(candidates)}); specify zone"
+    return None, f"Instance {instance_name} not found in project {project}"
+
+# Billing export files are parsed once and cached as columnar .npz files
+BILLING_EXPORT_PATH = os.getenv("GCP_BILLING_EXPORT", "")
+_billing_export = None
+
+def get_billing_export():
+    global _billing_export
+    if _billing_export is None:
+        _billing_export = gcp_billing.BillingExport()
+    return _billing_export
+
+# Bucket sizes from Cloud Monitoring (listing fallback), cached for an hour
+bucket_stats = BucketStats(
+    storage_getter=lambda project: clients.get("storage", project),
+    monitoring_getter=lambda: clients.get("monitoring"),
+    monitoring_v3=monitoring_v3
+)
+
+# Projects visible to the credentials, for organization-wide fan-out
+project_catalog = ProjectCatalog(lambda: clients.get("resourcemanager.projects"))
+
+# Start/stop operations are polled by one background loop until DONE
+operations = OperationTracker(lambda: clients.get("compute.zone_operations"))
+
+def submit_instance_action(action: str, instance_name: str, project: str, zone: str) -> Dict[str, Any]:
+    """Issue start/stop for one instance and track the returned operation"""
+    zone, error = resolve_instance_zone(instance_name, project, zone)
+    if error:
+        return {"instance_name": instance_name, "error": error}
+    
+    instances_client = clients.get("compute.instances")
+    if action == "start":
+        request = compute_v1.StartInstanceRequest(project=project, zone=zone, instance=instance_name)
+        operation = instances_client.start(request=request)
+    else:
+        request = compute_v1.StopInstanceRequest(project=project, zone=zone, instance=instance_name)
+        operation = instances_client.stop(request=request)
+    
+    tracked = operations.track(project, zone, operation.name, action, instance_name)
+    return {
+        "instance_name": instance_name,
+        "project": project,
+        "zone": zone,
+        "action": action,
+        "operation_id": operation.name,
+        "status": tracked["status"]
+    }
+
+def bulk_instance_action(action: str, instance_names: str, project_id: str, zone: str, wait_seconds: int) -> Dict[str, Any]:
+    """Start/stop many instances concurrently, then wait once for all operations"""
+    credentials, default_project = get_gcp_credentials()
+    if not credentials:
+        return {"error": "Failed to establish GCP credentials"}
+    
+    project = project_id or default_project
+    names = [n.strip() for n in instance_names.split(",") if n.strip()]
+    if not names:
+        return {"error": "No instance names given"}
+    
+    def submit(name):
+        try:
+            return submit_instance_action(action, name, project, zone)
+        except Exception as e:
+            return {"instance_name": name, "error": str(e)}
+    
+    with ThreadPoolExecutor(max_workers=min(16, len(names))) as pool:
+        submitted = list(pool.map(submit, names))
+    
+    started = time.perf_counter()
+    op_ids = [r["operation_id"] for r in submitted if "operation_id" in r]
+    finished = {op["operation"]: op for op in operations.wait(op_ids, wait_seconds)} if wait_seconds > 0 else {}
+    for result in submitted:
+        op = finished.get(result.get("operation_id"))
+        if op:
+            result["status"] = op["status"]
+            if op["error"]:
+                result["error"] = op["error"]
+    
+    return {
+        "project": project,
+        "action": action,
+        "requested": len(names),
+        "submitted": len(op_ids),
+        "done": sum(1 for r in submitted if r.get("status") == "DONE" and not r.get("error")),
+        "failed": sum(1 for r in submitted if r.get("error")),
+        "pending": sum(1 for r in submitted if "operation_id" in r and r.get("status") != "DONE"),
+        "waited_seconds": round(time.perf_counter() - started, 1),
+        "instances": submitted,
+        "tracking": "gcp://compute/operations"
+    }
 
 # Compute Engine Management Tools
 @mcp.tool()
@@ -50,7 +208,7 @@ def list_compute_instances(project_id: str = "", zone: str = "us-central1-a") ->
     
     Args:
         project_id: GCP project ID (uses default if empty)
-        zone: GCP zone (default: us-central1-a)
+        zone: GCP zone or a unique prefix of one (default: us-central1-a)
     """
     try:
         credentials, default_project = get_gcp_credentials()
@@ -61,7 +219,11 @@ def list_compute_instances(project_id: str = "", zone: str = "us-central1-a") ->
         if not project:
             return {"error": "No project ID specified and no default project found"}
         
-        instances_client = compute_v1.InstancesClient(credentials=credentials)
+        zone, error = validate_location("zone", project, zone)
+        if error:
+            return {"error": error}
+        
+        instances_client = clients.get("compute.instances")
         request = compute_v1.ListInstancesRequest(
             project=project,
             zone=zone
@@ -71,18 +233,8 @@ def list_compute_instances(project_id: str = "", zone: str = "us-central1-a") ->
         page_result = instances_client.list(request=request)
         
         for instance in page_result:
-            instance_info = {
-                "name": instance.name,
-                "machine_type": instance.machine_type.split('/')[-1],
-                "status": instance.status,
-                "zone": zone,
-                "creation_timestamp": instance.creation_timestamp,
-                "internal_ip": instance.network_interfaces[0].network_i_p if instance.network_interfaces else None,
-                "external_ip": instance.network_interfaces[0].access_configs[0].nat_i_p if instance.network_interfaces and instance.network_interfaces[0].access_configs else None,
-                "tags": list(instance.tags.items) if instance.tags else [],
-                "labels": dict(instance.labels) if instance.labels else {}
-            }
-            instances.append(instance_info)
+            instances.append(format_instance(instance, zone))
+            inventory.remember(project, instance.name, zone)
         
         return {
             "project": project,
@@ -94,77 +246,141 @@ def list_compute_instances(project_id: str = "", zone: str = "us-central1-a") ->
         return {"error": f"Failed to list Compute instances: {str(e)}"}
 
 @mcp.tool()
-def start_compute_instance(instance_name: str, project_id: str = "", zone: str = "us-central1-a") -> Dict[str, Any]:
-    """Start a Compute Engine instance
+def list_all_compute_instances(project_ids: str = "", status: str = "", name_filter: str = "", filter: str = "") -> Dict[str, Any]:
+    """List Compute Engine instances across all zones of one or more projects
     
     Args:
-        instance_name: Instance name
-        project_id: GCP project ID
-        zone: GCP zone
+        project_ids: Comma-separated GCP project IDs (uses default if empty)
+        status: Only instances in this status (e.g. RUNNING, TERMINATED)
+        name_filter: Only instances whose whole name matches this regular expression (e.g. web-.*)
+        filter: Raw Compute API filter; when combined with status/name_filter it must use
+            the same eq/ne syntax, e.g. (labels.env eq prod)
     """
     try:
         credentials, default_project = get_gcp_credentials()
         if not credentials:
             return {"error": "Failed to establish GCP credentials"}
         
-        project = project_id or default_project
+        projects = [p.strip() for p in project_ids.split(',') if p.strip()] or [default_project]
+        if not projects[0]:
+            return {"error": "No project ID specified and no default project found"}
         
-        instances_client = compute_v1.InstancesClient(credentials=credentials)
-        request = compute_v1.StartInstanceRequest(
-            project=project,
-            zone=zone,
-            instance=instance_name
-        )
+        # Filters are applied server-side so non-matching VMs never leave GCP;
+        # parenthesized eq expressions are ANDed and match as RE2 regexes
+        clauses = []
+        if status:
+            clauses.append(f'(status eq {status.upper()})')
+        if name_filter:
+            clauses.append(f'(name eq "{name_filter}")')
+        if filter:
+            clauses.append(filter if not clauses or filter.startswith('(') else f'({filter})')
+        server_filter = " ".join(clauses)
         
-        operation = instances_client.start(request=request)
+        results, errors = inventory.list_projects(projects, server_filter)
+        
+        instances = []
+        zone_summary = {}
+        for project in projects:
+            for instance in results.get(project, []):
+                instance["project"] = project
+                instances.append(instance)
+                zone_summary[instance["zone"]] = zone_summary.get(instance["zone"], 0) + 1
         
         return {
-            "instance_name": instance_name,
-            "project": project,
-            "zone": zone,
-            "action": "start",
-            "operation_id": operation.name,
-            "status": "starting"
+            "projects": projects,
+            "filter": server_filter or None,
+            "instance_count": len(instances),
+            "zone_summary": zone_summary,
+            "instances": instances,
+            "errors": errors
         }
+    except Exception as e:
+        return {"error": f"Failed to list Compute instances: {str(e)}"}
+
+@mcp.tool()
+def start_compute_instance(instance_name: str, project_id: str = "", zone: str = "", wait_seconds: int = 0) -> Dict[str, Any]:
+    """Start a Compute Engine instance
+    
+    Args:
+        instance_name: Instance name
+        project_id: GCP project ID
+        zone: GCP zone or unique prefix (looked up from the project inventory if empty)
+        wait_seconds: Wait up to this long for the operation to finish (0 returns immediately)
+    """
+    try:
+        credentials, default_project = get_gcp_credentials()
+        if not credentials:
+            return {"error": "Failed to establish GCP credentials"}
+        
+        result = submit_instance_action("start", instance_name, project_id or default_project, zone)
+        if "error" in result:
+            return {"error": result["error"]}
+        if wait_seconds > 0:
+            op = operations.wait([result["operation_id"]], wait_seconds)[0]
+            result["status"] = op["status"]
+            if op["error"]:
+                result["error"] = op["error"]
+        return result
     except Exception as e:
         return {"error": f"Failed to start instance {instance_name}: {str(e)}"}
 
 @mcp.tool()
-def stop_compute_instance(instance_name: str, project_id: str = "", zone: str = "us-central1-a") -> Dict[str, Any]:
+def stop_compute_instance(instance_name: str, project_id: str = "", zone: str = "", wait_seconds: int = 0) -> Dict[str, Any]:
     """Stop a Compute Engine instance
     
     Args:
         instance_name: Instance name
         project_id: GCP project ID
-        zone: GCP zone
+        zone: GCP zone or unique prefix (looked up from the project inventory if empty)
+        wait_seconds: Wait up to this long for the operation to finish (0 returns immediately)
     """
     try:
         credentials, default_project = get_gcp_credentials()
         if not credentials:
             return {"error": "Failed to establish GCP credentials"}
         
-        project = project_id or default_project
-        
-        instances_client = compute_v1.InstancesClient(credentials=credentials)
-        request = compute_v1.StopInstanceRequest(
-            project=project,
-            zone=zone,
-            instance=instance_name
-        )
-        
-        operation = instances_client.stop(request=request)
-        
-        return {
-            "instance_name": instance_name,
-            "project": project,
-            "zone": zone,
-            "action": "stop",
-            "operation_id": operation.name,
-            "status": "stopping"
-        }
+        result = submit_instance_action("stop", instance_name, project_id or default_project, zone)
+        if "error" in result:
+            return {"error": result["error"]}
+        if wait_seconds > 0:
+            op = operations.wait([result["operation_id"]], wait_seconds)[0]
+            result["status"] = op["status"]
+            if op["error"]:
+                result["error"] = op["error"]
+        return result
     except Exception as e:
         return {"error": f"Failed to stop instance {instance_name}: {str(e)}"}
 
+@mcp.tool()
+def bulk_start_compute_instances(instance_names: str, project_id: str = "", zone: str = "", wait_seconds: int = 120) -> Dict[str, Any]:
+    """Start several Compute Engine instances and wait for all of them
+    
+    Args:
+        instance_names: Comma-separated instance names
+        project_id: GCP project ID
+        zone: GCP zone or unique prefix for all instances (looked up per instance if empty)
+        wait_seconds: Wait up to this long for all operations to finish (0 returns immediately)
+    """
+    try:
+        return bulk_instance_action("start", instance_names, project_id, zone, wait_seconds)
+    except Exception as e:
+        return {"error": f"Failed to start instances: {str(e)}"}
+
+@mcp.tool()
+def bulk_stop_compute_instances(instance_names: str, project_id: str = "", zone: str = "", wait_seconds: int = 120) -> Dict[str, Any]:
+    """Stop several Compute Engine instances and wait for all of them
+    
+    Args:
+        instance_names: Comma-separated instance names
+        project_id: GCP project ID
+        zone: GCP zone or unique prefix for all instances (looked up per instance if empty)
+        wait_seconds: Wait up to this long for all operations to finish (0 returns immediately)
+    """
+    try:
+        return bulk_instance_action("stop", instance_names, project_id, zone, wait_seconds)
+    except Exception as e:
+        return {"error": f"Failed to stop instances: {str(e)}"}
+
 # Cloud Storage Management Tools
 @mcp.tool()
 def list_storage_buckets(project_id: str = "") -> Dict[str, Any]:
@@ -180,7 +396,7 @@ def list_storage_buckets(project_id: str = "") -> Dict[str, Any]:
         
         project = project_id or default_project
         
-        storage_client = storage.Client(credentials=credentials, project=project)
+        storage_client = clients.get("storage", project)
         buckets = storage_client.list_buckets()
         
         bucket_list = []
@@ -204,6 +420,53 @@ def list_storage_buckets(project_id: str = "") -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Failed to list Storage buckets: {str(e)}"}
 
+@mcp.tool()
+def get_storage_bucket_stats(project_id: str = "", bucket_names: str = "", refresh: bool = False,
+                             list_fallback: bool = True) -> Dict[str, Any]:
+    """Get total size and object count of Cloud Storage buckets
+    
+    Args:
+        project_id: GCP project ID
+        bucket_names: Comma-separated bucket names (all buckets in the project if empty)
+        refresh: Ignore cached statistics
+        list_fallback: List objects for buckets without Monitoring metrics (slow for large buckets)
+    """
+    try:
+        credentials, default_project = get_gcp_credentials()
+        if not credentials:
+            return {"error": "Failed to establish GCP credentials"}
+        
+        project = project_id or default_project
+        names = [b.strip() for b in bucket_names.split(",") if b.strip()]
+        if not names:
+            storage_client = clients.get("storage", project)
+            names = [b.name for b in storage_client.list_buckets(fields="items(name),nextPageToken")]
+        
+        result = bucket_stats.get(project, names, refresh=refresh, list_fallback=list_fallback)
+        buckets = sorted(
+            ({"name": name, **stats} for name, stats in result["buckets"].items()),
+            key=lambda b: b["total_bytes"],
+            reverse=True
+        )
+        total_bytes = sum(b["total_bytes"] for b in buckets)
+        
+        return {
+            "project": project,
+            "bucket_count": len(buckets),
+            "total_bytes": total_bytes,
+            "total_gib": round(total_bytes / 2**30, 2),
+            "total_objects": sum(b["object_count"] or 0 for b in buckets),
+            "sources": {
+                source: sum(1 for b in buckets if b["source"] == source) for source in ("monitoring", "listing")
+            },
+            "from_cache": result["from_cache"],
+            "unmeasured": [n for n in names if n not in result["buckets"]],
+            "errors": result["errors"],
+            "buckets": buckets
+        }
+    except Exception as e:
+        return {"error": f"Failed to get bucket statistics: {str(e)}"}
+
 @mcp.tool()
 def get_storage_bucket_objects(bucket_name: str, prefix: str = "", max_results: int = 10) -> Dict[str, Any]:
     """List objects in a Cloud Storage bucket
@@ -214,11 +477,11 @@ def get_storage_bucket_objects(bucket_name: str, prefix: str = "", max_results:
         max_results: Maximum number of objects to return
     """
     try:
-        credentials, _ = get_gcp_credentials()
+        credentials, default_project = get_gcp_credentials()
         if not credentials:
             return {"error": "Failed to establish GCP credentials"}
         
-        storage_client = storage.Client(credentials=credentials)
+        storage_client = clients.get("storage", default_project)
         bucket = storage_client.bucket(bucket_name)
         
         blobs = bucket.list_blobs(prefix=prefix, max_results=max_results)
@@ -252,7 +515,7 @@ def list_cloud_functions(project_id: str = "", location: str = "us-central1") ->
     
     Args:
         project_id: GCP project ID
-        location: GCP location
+        location: GCP region (or "-" for all regions)
     """
     try:
         credentials, default_project = get_gcp_credentials()
@@ -261,7 +524,13 @@ def list_cloud_functions(project_id: str = "", location: str = "us-central1") ->
         
         project = project_id or default_project
         
-        functions_client = functions_v1.CloudFunctionsServiceClient(credentials=credentials)
+        # "-" lists functions in every location
+        if location != "-":
+            location, error = validate_location("region", project, location)
+            if error:
+                return {"error": error}
+        
+        functions_client = clients.get("functions")
         parent = f"projects/{project}/locations/{location}"
         
         functions = functions_client.list_functions(parent=parent)
@@ -296,7 +565,7 @@ def invoke_cloud_function(function_name: str, project_id: str = "", location: st
     Args:
         function_name: Function name
         project_id: GCP project ID
-        location: GCP location
+        location: GCP region
         data: JSON data to send to the function
     """
     try:
@@ -306,7 +575,11 @@ def invoke_cloud_function(function_name: str, project_id: str = "", location: st
         
         project = project_id or default_project
         
-        functions_client = functions_v1.CloudFunctionsServiceClient(credentials=credentials)
+        location, error = validate_location("region", project, location)
+        if error:
+            return {"error": error}
+        
+        functions_client = clients.get("functions")
         name = f"projects/{project}/locations/{location}/functions/{function_name}"
         
         request = functions_v1.CallFunctionRequest(
@@ -329,13 +602,22 @@ def invoke_cloud_function(function_name: str, project_id: str = "", location: st
 
 # Cloud Monitoring Tools
 @mcp.tool()
-def get_monitoring_metrics(metric_type: str, project_id: str = "", hours: int = 1) -> Dict[str, Any]:
-    """Get Cloud Monitoring metrics
+def get_monitoring_metrics(metric_type: str, project_id: str = "", hours: int = 1,
+                           alignment_period_minutes: int = 5, aligner: str = "mean",
+                           reducer: str = "", group_by: str = "", filter: str = "",
+                           max_series: int = 500) -> Dict[str, Any]:
+    """Get Cloud Monitoring metrics, aggregated by the Monitoring API
     
     Args:
         metric_type: Metric type (e.g., compute.googleapis.com/instance/cpu/utilization)
         project_id: GCP project ID
         hours: Number of hours to look back
+        alignment_period_minutes: Width of each aligned point (0 returns raw points)
+        aligner: Per-series aligner: mean, max, min, sum, rate, delta, percentile_99, ... or none
+        reducer: Cross-series reducer: mean, max, min, sum, count, percentile_95, ... (empty keeps every series)
+        group_by: Comma-separated labels to keep when reducing (e.g. resource.labels.zone)
+        filter: Extra Monitoring filter ANDed with the metric type (e.g. resource.labels.zone="us-central1-a")
+        max_series: Stop after this many series (0 = no limit)
     """
     try:
         credentials, default_project = get_gcp_credentials()
@@ -343,75 +625,182 @@ def get_monitoring_metrics(metric_type: str, project_id: str = "", hours: int =
             return {"error": "Failed to establish GCP credentials"}
         
         project = project_id or default_project
-        
-        monitoring_client = monitoring_v3.MetricServiceClient(credentials=credentials)
-        project_name = f"projects/{project}"
-        
-        # Create time interval
-        now = datetime.utcnow()
-        interval = monitoring_v3.TimeInterval({
-            "end_time": {"seconds": int(now.timestamp())},
-            "start_time": {"seconds": int((now - timedelta(hours=hours)).timestamp())}
-        })
-        
-        # Create the request
-        request = monitoring_v3.ListTimeSeriesRequest({
-            "name": project_name,
-            "filter": f'metric.type="{metric_type}"',
-            "interval": interval,
-            "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL
-        })
-        
-        # Get the time series data
-        time_series = monitoring_client.list_time_series(request=request)
-        
-        metrics_data = []
-        for ts in time_series:
-            for point in ts.points:
-                point_data = {
-                    "timestamp": point.interval.end_time.isoformat(),
-                    "value": point.value.double_value or point.value.int64_value,
-                    "resource": dict(ts.resource.labels) if ts.resource.labels else {},
-                    "metric_labels": dict(ts.metric.labels) if ts.metric.labels else {}
-                }
-                metrics_data.append(point_data)
+        group_by_fields = [g.strip() for g in group_by.split(",") if g.strip()]
+        try:
+            request = build_metrics_request(
+                monitoring_v3, project, metric_type, hours,
+                alignment_period_minutes=alignment_period_minutes,
+                aligner=aligner,
+                reducer=reducer,
+                group_by=group_by_fields,
+                filter=filter
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+        
+        monitoring_client = clients.get("monitoring")
+        pager = monitoring_client.list_time_series(request=request)
+        aggregation = request.aggregation if "aggregation" in request else None
+        result = collect_series(pager, aligned=aggregation is not None, max_series=max_series)
         
         return {
             "project": project,
             "metric_type": metric_type,
             "period_hours": hours,
-            "data_points": len(metrics_data),
-            "metrics": metrics_data
+            "aggregation": {
+                "alignment_period_seconds": aggregation.alignment_period.total_seconds(),
+                "aligner": aggregation.per_series_aligner.name,
+                "reducer": aggregation.cross_series_reducer.name,
+                "group_by": list(aggregation.group_by_fields)
+            } if aggregation is not None else None,
+            **result
         }
     except Exception as e:
         return {"error": f"Failed to get monitoring metrics: {str(e)}"}
 
 # Billing and Cost Tools
 @mcp.tool()
-def get_gcp_billing_info(project_id: str = "", days: int = 30) -> Dict[str, Any]:
-    """Get GCP billing and cost information
+def get_gcp_billing_info(project_id: str = "", days: int = 30, group_by: str = "service",
+                         top_n: int = 10, export_path: str = "") -> Dict[str, Any]:
+    """Analyze GCP costs from a Cloud Billing export (CSV or Parquet files)
     
     Args:
-        project_id: GCP project ID
-        days: Number of days to look back
+        project_id: Only costs of this project (all projects in the export if empty)
+        days: Number of days to look back from the latest day in the export (at most its span)
+        group_by: service, sku, project, region, day or label:<key> (e.g. label:team)
+        top_n: Number of top groups to return
+        export_path: Export file, directory or glob (default: GCP_BILLING_EXPORT env var)
     """
     try:
-        credentials, default_project = get_gcp_credentials()
+        path = export_path or BILLING_EXPORT_PATH
+        if not path:
+            return {
+                "error": "No billing export configured",
+                "recommendation": "Export Cloud Billing data to BigQuery, dump it to CSV or Parquet files "
+                                  "and set GCP_BILLING_EXPORT (or pass export_path) to the file or directory"
+            }
+        
+        started = time.perf_counter()
+        table = get_billing_export().load(path)
+        result = gcp_billing.analyze(table, days=days, group_by=group_by, top_n=top_n, project=project_id)
+        result["export_path"] = path
+        result["query_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+    except (ValueError, FileNotFoundError, ImportError) as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"Failed to get billing info: {str(e)}"}
+
+# Organization-wide Tools
+# Tools that can run across projects: tool -> (project argument, list of items in its result)
+FANOUT_TOOLS = {
+    "list_all_compute_instances": ("project_ids", "instances"),
+    "list_compute_instances": ("project_id", "instances"),
+    "list_storage_buckets": ("project_id", "buckets"),
+    "get_storage_bucket_stats": ("project_id", "buckets"),
+    "list_cloud_functions": ("project_id", "functions"),
+}
+
+@mcp.tool()
+def list_gcp_projects(query: str = "", refresh: bool = False) -> Dict[str, Any]:
+    """List active GCP projects visible to the current credentials
+    
+    Args:
+        query: Resource Manager search query (e.g. parent:organizations/123456, labels.env:prod)
+        refresh: Ignore the cached project list
+    """
+    try:
+        credentials, _ = get_gcp_credentials()
         if not credentials:
             return {"error": "Failed to establish GCP credentials"}
         
-        project = project_id or default_project
+        projects = project_catalog.projects(query, refresh=refresh)
+        return {
+            "query": query,
+            "project_count": len(projects),
+            "projects": projects
+        }
+    except Exception as e:
+        return {"error": f"Failed to list projects: {str(e)}"}
+
+@mcp.tool()
+def run_across_projects(tool: str, projects: str = "", query: str = "", arguments: str = "{}",
+                        max_parallel: int = 16, timeout_seconds: int = 60, max_items: int = 5000) -> Dict[str, Any]:
+    """Run an inventory tool in many projects at once and merge the results
+    
+    Args:
+        tool: list_all_compute_instances, list_compute_instances, list_storage_buckets,
+            get_storage_bucket_stats or list_cloud_functions
+        projects: Comma-separated project IDs (all active projects matching query if empty)
+        query: Resource Manager search query used when projects is empty (e.g. parent:folders/123)
+        arguments: JSON object of extra arguments for the tool (e.g. {"status": "RUNNING"})
+        max_parallel: Projects queried concurrently
+        timeout_seconds: Give up on a project after this many seconds
+        max_items: Stop merging items after this many (counts stay complete)
+    """
+    try:
+        if tool not in FANOUT_TOOLS:
+            return {"error": f"Tool {tool} cannot run across projects. Choose from: {', '.join(FANOUT_TOOLS)}"}
+        try:
+            extra = json.loads(arguments or "{}")
+        except ValueError as e:
+            return {"error": f"arguments must be a JSON object: {e}"}
+        if not isinstance(extra, dict):
+            return {"error": f"arguments must be a JSON object, got {type(extra).__name__}"}
+        
+        credentials, _ = get_gcp_credentials()
+        if not credentials:
+            return {"error": "Failed to establish GCP credentials"}
+        
+        project_ids = [p.strip() for p in projects.split(",") if p.strip()]
+        if not project_ids:
+            project_ids = [p["project_id"] for p in project_catalog.projects(query)]
+        
+        project_arg, items_key = FANOUT_TOOLS[tool]
+        tool_fn = globals()[tool]
+        items: List[Dict[str, Any]] = []
+        per_project: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        
+        def merge(project, result, seconds):
+            # Called as each project finishes, so early projects are merged
+            # while slow ones are still running
+            if "error" in result:
+                errors[project] = result["error"]
+                return
+            found = result.get(items_key, [])
+            per_project[project] = {"count": len(found), "seconds": seconds}
+            for item in found[:max(0, max_items - len(items))]:
+                items.append(item if "project" in item else {"project": project, **item})
+        
+        started = time.perf_counter()
+        outcome = fan_out(
+            project_ids,
+            lambda project: tool_fn(**{**extra, project_arg: project}),
+            max_workers=max_parallel,
+            timeout=timeout_seconds,
+            on_result=merge
+        )
+        errors.update(outcome["errors"])
+        total = sum(p["count"] for p in per_project.values())
         
-        # Note: This requires billing account access
-        # For now, return placeholder data
         return {
-            "project": project,
-            "period_days": days,
-            "message": "Billing data requires Cloud Billing API access and billing account permissions",
-            "recommendation": "Use Cloud Console Billing section or configure Cloud Billing API"
+            "tool": tool,
+            "arguments": extra,
+            "projects_requested": len(project_ids),
+            "projects_succeeded": len(per_project),
+            "projects_failed": len(errors),
+            "projects_timed_out": outcome["timed_out"],
+            "total_count": total,
+            "returned_count": len(items),
+            "truncated": total > len(items),
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+            "per_project": per_project,
+            "errors": errors,
+            items_key: items
         }
     except Exception as e:
-        return {"error": f"Failed to get billing info: {str(e)}"}
+        return {"error": f"Failed to run {tool} across projects: {str(e)}"}
 
 # Help and Information Tools
 @mcp.tool()
@@ -424,14 +813,23 @@ def get_gcp_help() -> str:
 
 🖥️ COMPUTE ENGINE:
 • "List compute instances in us-central1-a"
+• "List all running instances in every zone"
+• "Find instances named web-.* in projects proj-a,proj-b"
 • "Start instance my-vm"
 • "Stop instance my-vm"
+• "Stop instances web-1,web-2,web-3 and wait until they are down"
 • "Show instances in us-west1-b"
 
+🏢 ORGANIZATION:
+• "List all projects in the organization"
+• "Which VMs are running in any project?"
+• "Bucket sizes across all projects labelled env:prod"
+
 🪣 CLOUD STORAGE:
 • "List all storage buckets"
 • "Show objects in bucket my-bucket"
 • "List files in bucket my-bucket with prefix logs/"
+• "Which buckets use the most storage?"
 
 ⚡ CLOUD FUNCTIONS:
 • "List Cloud Functions in us-central1"
@@ -442,10 +840,13 @@ def get_gcp_help() -> str:
 • "Get CPU metrics for the last 2 hours"
 • "Show memory metrics for compute instances"
 • "Monitor disk utilization"
+• "Average CPU per zone over the last day in 1 hour buckets"
 
 💰 BILLING:
 • "Get billing information"
 • "Show costs for the last week"
+• "Top 5 SKUs by cost over the last 90 days"
+• "Costs by label:team and any unusual days this month"
 
 🎯 EXAMPLE QUERIES:
 • "What Compute instances are running in us-west1-a?"
@@ -489,11 +890,45 @@ def get_project_info() -> str:
         return json.dumps({
             "project_id": project_id,
             "credentials_type": type(credentials).__name__,
-            "scopes": getattr(credentials, 'scopes', 'Not available')
-        }, indent=2)
+            "scopes": getattr(credentials, 'scopes', 'Not available'),
+            "credentials": credential_cache.status(),
+            "clients": clients.status()
+        }, indent=2, default=str)
     except Exception as e:
         return f"Failed to get project info: {str(e)}"
 
+@mcp.resource("gcp://server/startup")
+def get_startup_report() -> str:
+    """Get server startup timings and lazily imported client libraries"""
+    return json.dumps({**startup_timings, "lazy_imports_ms": dict(import_timings)}, indent=2)
+
+@mcp.resource("gcp://projects")
+def get_project_catalog() -> str:
+    """Get the cached project list status"""
+    return json.dumps(project_catalog.status(), indent=2)
+
+@mcp.resource("gcp://compute/operations")
+def get_compute_operations() -> str:
+    """Get status of tracked start/stop operations"""
+    return json.dumps(operations.status(), indent=2)
+
+@mcp.resource("gcp://storage/stats")
+def get_bucket_stats_cache() -> str:
+    """Get the bucket statistics cache status"""
+    return json.dumps(bucket_stats.status(), indent=2)
+
+@mcp.resource("gcp://billing/cache")
+def get_billing_cache() -> str:
+    """Get parsed billing export files and cache statistics"""
+    if _billing_export is None:
+        return json.dumps({"loaded": False, "export_path": BILLING_EXPORT_PATH or None}, indent=2)
+    return json.dumps(_billing_export.status(), indent=2)
+
+@mcp.resource("gcp://compute/inventory")
+def get_inventory_status() -> str:
+    """Get the instance name -> zone index status"""
+    return json.dumps(inventory.status(), indent=2)
+
 @mcp.resource("gcp://zones")
 def get_gcp_zones() -> str:
     """Get list of GCP zones"""
@@ -502,18 +937,7 @@ def get_gcp_zones() -> str:
         if not credentials:
             return "GCP credentials not available"
         
-        zones_client = compute_v1.ZonesClient(credentials=credentials)
-        request = compute_v1.ListZonesRequest(project=project_id)
-        
-        zones = []
-        for zone in zones_client.list(request=request):
-            zones.append({
-                "name": zone.name,
-                "region": zone.region.split('/')[-1],
-                "status": zone.status
-            })
-        
-        return json.dumps(zones, indent=2)
+        return json.dumps(locations.get(project_id)["zones"], indent=2)
     except Exception as e:
         return f"Failed to get zones: {str(e)}"
 
@@ -525,32 +949,34 @@ def get_gcp_regions() -> str:
         if not credentials:
             return "GCP credentials not available"
         
-        regions_client = compute_v1.RegionsClient(credentials=credentials)
-        request = compute_v1.ListRegionsRequest(project=project_id)
-        
-        regions = []
-        for region in regions_client.list(request=request):
-            regions.append({
-                "name": region.name,
-                "status": region.status,
-                "zones": [zone.split('/')[-1] for zone in region.zones]
-            })
-        
-        return json.dumps(regions, indent=2)
+        return json.dumps(locations.get(project_id)["regions"], indent=2)
     except Exception as e:
         return f"Failed to get regions: {str(e)}"
 
+@mcp.resource("gcp://locations/cache")
+def get_location_cache() -> str:
+    """Get the zone/region catalog cache status"""
+    return json.dumps(locations.status(), indent=2)
+
+startup_timings["server_init_ms"] = round((time.perf_counter() - _process_started) * 1000 - startup_timings["imports_ms"], 1)
+
 if __name__ == "__main__":
     logger.info("Starting GCP Cloud Management MCP Server...")
     
     # Check GCP credentials
+    started = time.perf_counter()
     credentials, project_id = get_gcp_credentials()
-    if not credentials:
-        logger.error("GCP credentials not configured. Please set up gcloud CLI or service account.")
-        logger.error("Run: gcloud auth application-default login")
-        sys.exit(1)
-    
-    logger.info(f"Using GCP project: {project_id}")
+    startup_timings["credentials_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if credentials:
+        logger.info(f"Using GCP project: {project_id}")
+    else:
+        # Keep serving: tools report the missing credentials and discovery is
+        # retried on later calls, e.g. after `gcloud auth application-default login`
+        logger.warning("GCP credentials not configured. Please set up gcloud CLI or service account.")
+        logger.warning("Run: gcloud auth application-default login")
+    startup_timings["ready_ms"] = round((time.perf_counter() - _process_started) * 1000, 1)
+    logger.info(f"Server ready in {startup_timings['ready_ms']} ms "
+                f"(imports {startup_timings['imports_ms']} ms, credentials {startup_timings['credentials_ms']} ms)")
     
     # Run the server
     transport = "stdio"
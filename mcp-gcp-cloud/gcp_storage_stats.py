@@ -0,0 +1,187 @@
+"""
+Per-bucket size statistics for the GCP MCP server.
+
+Cloud Storage reports `storage/total_bytes` and `storage/object_count` to
+Cloud Monitoring once a day for every bucket, so one reduced query per metric
+answers for all buckets in a project. Buckets the metrics don't cover yet
+(created in the last day, or Monitoring unavailable) are measured by listing
+their objects: the key space is split into name ranges listed in parallel,
+and each page is restricted to the `size` field. Results are cached per
+bucket.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gcp_metrics import build_request, collect_series
+
+logger = logging.getLogger(__name__)
+
+TOTAL_BYTES_METRIC = "storage.googleapis.com/storage/total_bytes"
+OBJECT_COUNT_METRIC = "storage.googleapis.com/storage/object_count"
+
+# Object name ranges listed in parallel: [boundary[i], boundary[i+1]).
+# Roughly even over the characters object names usually start with.
+SHARD_BOUNDARIES = ["", "0", "5", "A", "H", "O", "V", "a", "e", "i", "m", "q", "u", "y", None]
+LIST_PAGE_SIZE = 1000
+
+
+class BucketStats:
+    """Bucket total_bytes / object_count from Monitoring, with a listing fallback"""
+
+    def __init__(self,
+                 storage_getter: Callable[[str], Any],
+                 monitoring_getter: Callable[[], Any],
+                 monitoring_v3,
+                 ttl: float = 3600.0,
+                 max_workers: int = 16,
+                 max_list_objects: int = 1_000_000):
+        self._storage_getter = storage_getter
+        self._monitoring_getter = monitoring_getter
+        self._monitoring_v3 = monitoring_v3
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.max_list_objects = max_list_objects
+        self._lock = threading.Lock()
+        # project -> {bucket -> (fetched_at, stats)}
+        self._cache: Dict[str, Dict[str, Tuple[float, Dict[str, Any]]]] = {}
+
+    # -- Monitoring ---------------------------------------------------------
+
+    def _metric_by_bucket(self, project: str, metric_type: str) -> Dict[str, float]:
+        # Both metrics are sampled daily; a 2-day window with 1-day alignment
+        # always includes the latest sample, summed over storage classes
+        request = build_request(self._monitoring_v3, project, metric_type, hours=48,
+                                alignment_period_minutes=1440, aligner="max", reducer="sum",
+                                group_by=["resource.label.bucket_name"])
+        result = collect_series(self._monitoring_getter().list_time_series(request=request), aligned=True)
+        latest = {}
+        for series in result["series"]:
+            values = [v for v in series["values"] if v is not None]
+            if values:
+                latest[series["resource"].get("bucket_name")] = values[-1]
+        return latest
+
+    def from_monitoring(self, project: str) -> Dict[str, Dict[str, Any]]:
+        """Stats for every bucket with metrics, from two project-wide queries"""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            total_bytes = pool.submit(self._metric_by_bucket, project, TOTAL_BYTES_METRIC)
+            object_count = pool.submit(self._metric_by_bucket, project, OBJECT_COUNT_METRIC)
+            total_bytes, object_count = total_bytes.result(), object_count.result()
+        as_of = datetime.now(timezone.utc).isoformat()
+        return {
+            name: {
+                "total_bytes": int(total_bytes[name]),
+                "object_count": int(object_count[name]) if name in object_count else None,
+                "source": "monitoring",
+                "as_of": as_of,
+            }
+            for name in total_bytes
+        }
+
+    # -- listing fallback ---------------------------------------------------
+
+    def _list_shard(self, project: str, bucket: str, start: str, end: Optional[str],
+                    listed: List[int]) -> Tuple[int, int, bool]:
+        """(objects, bytes, complete) for names in [start, end)"""
+        client = self._storage_getter(project)
+        blobs = client.list_blobs(bucket, start_offset=start or None, end_offset=end,
+                                  fields="items(size),nextPageToken", page_size=LIST_PAGE_SIZE)
+        count = size = 0
+        for page in blobs.pages:
+            for blob in page:
+                count += 1
+                size += blob.size or 0
+            with self._lock:
+                listed[0] += page.num_items
+                if listed[0] >= self.max_list_objects:
+                    return count, size, False
+        return count, size, True
+
+    def from_listing(self, project: str, buckets: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Stats by listing objects, every bucket split into name-range shards"""
+        totals = {bucket: {"total_bytes": 0, "object_count": 0, "source": "listing", "complete": True}
+                  for bucket in buckets}
+        errors: Dict[str, str] = {}
+        listed = {bucket: [0] for bucket in buckets}
+        shards = list(zip(SHARD_BOUNDARIES, SHARD_BOUNDARIES[1:]))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(self._list_shard, project, bucket, start, end, listed[bucket]): bucket
+                for bucket in buckets for start, end in shards
+            }
+            for future in as_completed(futures):
+                bucket = futures[future]
+                try:
+                    count, size, complete = future.result()
+                except Exception as e:
+                    errors[bucket] = str(e)
+                    continue
+                totals[bucket]["object_count"] += count
+                totals[bucket]["total_bytes"] += size
+                totals[bucket]["complete"] &= complete
+
+        as_of = datetime.now(timezone.utc).isoformat()
+        for bucket in errors:
+            totals.pop(bucket, None)
+        for stats in totals.values():
+            stats["as_of"] = as_of
+        return totals, errors
+
+    # -- cached entry point -------------------------------------------------
+
+    def get(self, project: str, buckets: List[str], refresh: bool = False,
+            list_fallback: bool = True) -> Dict[str, Any]:
+        """Stats for the given buckets, served from the cache while fresh"""
+        now = time.monotonic()
+        with self._lock:
+            entries = dict(self._cache.get(project, {}))
+        cached = {} if refresh else {
+            bucket: stats for bucket, (fetched_at, stats) in entries.items() if now - fetched_at < self.ttl
+        }
+
+        missing = [b for b in buckets if b not in cached]
+        errors: Dict[str, str] = {}
+        fetched: Dict[str, Dict[str, Any]] = {}
+        if missing:
+            try:
+                fetched.update(self.from_monitoring(project))
+            except Exception as e:
+                logger.warning(f"Bucket metrics unavailable for {project}, listing objects instead: {e}")
+                errors["monitoring"] = str(e)
+            unmeasured = [b for b in missing if b not in fetched]
+            if unmeasured and list_fallback:
+                listed, list_errors = self.from_listing(project, unmeasured)
+                fetched.update(listed)
+                errors.update(list_errors)
+
+            fetched_at = time.monotonic()
+            with self._lock:
+                self._cache.setdefault(project, {}).update(
+                    (bucket, (fetched_at, stats)) for bucket, stats in fetched.items())
+
+        stats = {**cached, **fetched}
+        return {
+            "buckets": {b: stats[b] for b in buckets if b in stats},
+            "from_cache": len([b for b in buckets if b in cached]),
+            "errors": errors,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "projects": {
+                    project: {
+                        "buckets": len(entries),
+                        "fresh": sum(1 for fetched_at, _ in entries.values() if now - fetched_at < self.ttl),
+                        "oldest_seconds": round(now - min(fetched_at for fetched_at, _ in entries.values()), 1),
+                    }
+                    for project, entries in self._cache.items() if entries
+                },
+            }